@@ -2,20 +2,38 @@
 KOTE 감정 분석 모델 로딩 모듈
 """
 import os
+import json
+import numpy as np
 import torch
 import traceback
 import torch.nn as nn
 import pytorch_lightning as pl
-from transformers import ElectraModel, AutoTokenizer
+import transformers
+from transformers import ElectraModel, ElectraConfig, AutoTokenizer, PreTrainedTokenizerFast
 import tkinter as tk
 from tkinter import messagebox
 
 from ssl_patch import no_ssl_verification_requests, no_ssl_verification_httpx
 from configure import resource_path, ensure_output_dir, log_work, LABELS
+from inference_cache import InferenceCache, model_fingerprint, normalize_text
+from instrumentation import span
+
+# 배포용 단일 모델 파일 (설정, 토크나이저, 최종 가중치 포함)
+DEPLOY_ARTIFACT_NAME = "kote_deploy.safetensors"
+DEPLOY_ARTIFACT_FORMAT = "kote-deploy-v1"
+
+def _build_electra_without_init(config):
+    """가중치 초기화 없이 ELECTRA 모델 골격 생성 (가중치는 이후 한 번에 로드)"""
+    try:
+        from transformers.modeling_utils import no_init_weights
+        with no_init_weights():
+            return ElectraModel(config)
+    except ImportError:
+        return ElectraModel(config)
 
 class KOTEtagger(pl.LightningModule):
     """KOTE 감정 분석 모델 클래스"""
-    def __init__(self, offline_mode=False, device=None):
+    def __init__(self, offline_mode=False, device=None, config=None, tokenizer=None):
         super().__init__()
         
         # device를 클래스 변수로 설정하는 대신 별도의 인스턴스 변수로 관리
@@ -23,8 +41,12 @@ class KOTEtagger(pl.LightningModule):
         
         # SSL 검증 비활성화 컨텍스트 내에서 모델 로드
         with no_ssl_verification_requests(), no_ssl_verification_httpx():
+            # 배포용 모델 파일에서 읽은 설정과 토크나이저가 있으면 사전학습 가중치를 읽지 않음
+            if config is not None and tokenizer is not None:
+                self.electra = _build_electra_without_init(config)
+                self.tokenizer = tokenizer
             # 오프라인 모드일 경우 로컬 모델 파일 사용
-            if offline_mode:
+            elif offline_mode:
                 try:
                     # 먼저 실행 파일과 동일한 위치에 모델 폴더가 있는지 확인
                     model_dir = os.path.dirname(os.path.abspath(__file__))
@@ -52,12 +74,75 @@ class KOTEtagger(pl.LightningModule):
                     self.electra = ElectraModel.from_pretrained("beomi/KcELECTRA-base", revision='v2021')
                     self.tokenizer = AutoTokenizer.from_pretrained("beomi/KcELECTRA-base", revision='v2021')
                 except Exception as e:
+                    # 작업 스레드에서도 불릴 수 있으므로 대화상자 표시는 호출한 쪽(메인 스레드)에 맡김
                     print(f"온라인 모델 로드 실패: {e}")
-                    messagebox.showerror("모델 로드 오류", f"ELECTRA 모델을 로드하는데 실패했습니다.\n{str(e)}")
-                    exit(1)
+                    raise RuntimeError(f"ELECTRA 모델을 로드하는데 실패했습니다.\n{str(e)}") from e
                 
         self.classifier = nn.Linear(self.electra.config.hidden_size, 44)
         self.to(self._device)
+        
+        # 추론 결과 캐시 (load_model/load_custom_model에서 연결)
+        self.result_cache = None
+        
+        # INT8 동적 양자화 적용 여부
+        self.quantized = False
+        
+        # 가중치를 불러온 모델 파일 경로 (다중 프로세스 추론 시 복제본 로드에 사용)
+        self.source_path = None
+
+    def _encode_batch(self, texts):
+        """텍스트 목록을 한 번에 토큰화 (배치 내 가장 긴 문장 길이까지만 패딩)"""
+        return self.tokenizer(
+            texts,
+            add_special_tokens=True,
+            max_length=512,
+            return_token_type_ids=False,
+            padding="longest",
+            return_attention_mask=True,
+            return_tensors='pt',
+            truncation=True
+        ).to(self._device)
+
+    def forward_batch(self, texts):
+        """텍스트 목록에 대한 감정 분석을 한 번의 순전파로 수행
+        
+        Args:
+            texts (list): 분석할 텍스트 목록
+            
+        Returns:
+            torch.Tensor: (n, 44) 크기의 감정 점수 행렬
+        """
+        # 입력 텍스트 정리 (None 및 비문자열 처리)
+        texts = ["" if text is None else (text if isinstance(text, str) else str(text)) for text in texts]
+        scores = torch.zeros((len(texts), len(LABELS)), device=self._device)
+        
+        # 빈 문자열은 0점으로 두고 나머지만 모델에 전달
+        valid_idx = [i for i, text in enumerate(texts) if text.strip()]
+        if not valid_idx:
+            return scores
+        
+        with span("토큰화", len(valid_idx)):
+            encoding = self._encode_batch([texts[i] for i in valid_idx])
+        
+        with span("인코더_순전파", len(valid_idx)):
+            output = self.electra(encoding["input_ids"], attention_mask=encoding["attention_mask"])
+            output = output.last_hidden_state[:, 0, :]
+            self._synchronize()
+        
+        with span("분류기_시그모이드", len(valid_idx)):
+            output = self.classifier(output)
+            output = torch.sigmoid(output)
+            self._synchronize()
+        
+        if len(valid_idx) == len(texts):
+            return output
+        scores[torch.tensor(valid_idx, device=self._device)] = output
+        return scores
+
+    def _synchronize(self):
+        """GPU 연산 완료 대기 (단계별 소요 시간 측정이 비동기 실행에 가려지지 않도록)"""
+        if getattr(self._device, 'type', None) == 'cuda':
+            torch.cuda.synchronize(self._device)
 
     def forward(self, text):
         """텍스트에 대한 감정 분석 수행"""
@@ -74,21 +159,8 @@ class KOTEtagger(pl.LightningModule):
             if not text.strip():
                 return torch.zeros((1, 44), device=self._device)
             
-            encoding = self.tokenizer.encode_plus(
-                text,
-                add_special_tokens=True,
-                max_length=512,
-                return_token_type_ids=False,
-                padding="max_length",
-                return_attention_mask=True,
-                return_tensors='pt',
-                truncation=True
-            ).to(self._device)
-            output = self.electra(encoding["input_ids"], attention_mask=encoding["attention_mask"])
-            output = output.last_hidden_state[:, 0, :]
-            output = self.classifier(output)
-            output = torch.sigmoid(output)
-            return output
+            # 단일 문장도 배치 경로를 사용하여 실제 길이만큼만 패딩
+            return self.forward_batch([text])
         except Exception as e:
             print(f"추론 중 오류 발생: {e}")
             print(traceback.format_exc())
@@ -114,9 +186,20 @@ class KOTEtagger(pl.LightningModule):
                 # 빈 텍스트인 경우 빈 결과 반환
                 return {}, 0.0
             
-            # forward 메서드 사용하여 추론 실행
-            with torch.no_grad():
-                output = self(text).cpu().numpy()[0]
+            # 캐시에 있으면 인코더를 거치지 않음
+            text = normalize_text(text)
+            output = None
+            if self.result_cache is not None:
+                cached, found = self.result_cache.get_many([text])
+                if found[0]:
+                    output = cached[0]
+            
+            if output is None:
+                # forward 메서드 사용하여 추론 실행
+                with torch.no_grad():
+                    output = self(text).cpu().numpy()[0]
+                if self.result_cache is not None:
+                    self.result_cache.put_many([text], output[None, :])
             
             # 감정 점수 추출 및 사전 생성
             emotions_dict = dict(zip(LABELS, output))
@@ -131,11 +214,183 @@ class KOTEtagger(pl.LightningModule):
             print(traceback.format_exc())
             return {}, 0.0
 
-def load_model(device=None):
+    def infer_batch(self, texts, batch_size=32):
+        """텍스트 목록에 대한 감정 점수 행렬 반환
+        
+        Args:
+            texts (list): 분석할 텍스트 목록
+            batch_size (int): 한 번의 순전파에 넣을 최대 텍스트 수
+            
+        Returns:
+            np.ndarray: (n, 44) 크기의 float32 감정 점수 행렬
+        """
+        texts = list(texts)
+        scores = np.zeros((len(texts), len(LABELS)), dtype=np.float32)
+        
+        with torch.no_grad():
+            for start in range(0, len(texts), batch_size):
+                batch = texts[start:start + batch_size]
+                with span("KOTEtagger.forward", len(batch)):
+                    scores[start:start + len(batch)] = self.forward_batch(batch).cpu().numpy()
+        
+        return scores
+
+def quantize_model(model):
+    """ELECTRA 인코더와 44개 감정 분류기의 Linear 계층을 INT8 동적 양자화 (CPU 전용)
+    
+    Args:
+        model: 가중치가 로드된 감정 분석 모델 인스턴스
+        
+    Returns:
+        model: 양자화된 모델 인스턴스 (제자리 변환)
+    """
+    print("INT8 동적 양자화를 적용하는 중입니다...")
+    model.eval()
+    torch.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8, inplace=True)
+    model.quantized = True
+    return model
+
+def attach_result_cache(model, model_path, fingerprint=None):
+    """모델 파일 지문을 키로 사용하는 추론 결과 캐시 연결
+    
+    Args:
+        model: 감정 분석 모델 인스턴스
+        model_path: 로드한 모델 파일 경로
+        fingerprint: 모델 지문 (None이면 모델 파일에서 계산)
+        
+    Returns:
+        model: 캐시가 연결된 모델 인스턴스
+    """
+    try:
+        # 양자화 모델은 점수가 달라지므로 별도의 캐시 항목 사용
+        fingerprint = fingerprint or model_fingerprint(model_path)
+        if getattr(model, 'quantized', False):
+            fingerprint += ":int8"
+        model.result_cache = InferenceCache(fingerprint)
+        print(f"추론 결과 캐시를 사용합니다: {model.result_cache.db_path}")
+    except Exception as e:
+        print(f"추론 결과 캐시를 사용할 수 없습니다: {e}")
+        model.result_cache = None
+    return model
+
+def save_deploy_artifact(model, output_path, source_path=None):
+    """설정, 토크나이저, 최종 가중치를 담은 배포용 단일 모델 파일 저장
+    
+    Args:
+        model: 가중치가 로드된 감정 분석 모델 인스턴스 (양자화되지 않은 모델)
+        output_path: 저장할 파일 경로 (.safetensors)
+        source_path: 원본 모델 파일 경로 (추론 결과 캐시 지문 유지용)
+        
+    Returns:
+        str: 저장된 파일 경로
+    """
+    from safetensors.torch import save_file
+    
+    if getattr(model, 'quantized', False):
+        raise ValueError("INT8 양자화된 모델은 배포용 파일로 저장할 수 없습니다. FP32 모델을 사용하세요.")
+    
+    tokenizer = model.tokenizer
+    if not hasattr(tokenizer, 'backend_tokenizer'):
+        raise ValueError("빠른 토크나이저(tokenizers 기반)만 배포용 파일에 포함할 수 있습니다.")
+    
+    # 토크나이저 재생성에 필요한 단순 설정값만 보관
+    tokenizer_config = {
+        key: value for key, value in tokenizer.init_kwargs.items()
+        if isinstance(value, (str, int, float, bool))
+        and key not in ('name_or_path', 'tokenizer_file', 'vocab_file', 'special_tokens_map_file')
+    }
+    tokenizer_config.update(tokenizer.special_tokens_map)
+    tokenizer_config['model_max_length'] = min(tokenizer.model_max_length, 512)
+    
+    metadata = {
+        'format': DEPLOY_ARTIFACT_FORMAT,
+        'electra_config': model.electra.config.to_json_string(),
+        'tokenizer_class': type(tokenizer).__name__,
+        'tokenizer_json': tokenizer.backend_tokenizer.to_str(),
+        'tokenizer_config': json.dumps(tokenizer_config, ensure_ascii=False),
+        'source_fingerprint': model_fingerprint(source_path) if source_path else ''
+    }
+    
+    state_dict = {name: tensor.detach().cpu().contiguous() for name, tensor in model.state_dict().items()}
+    
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    save_file(state_dict, output_path, metadata=metadata)
+    print(f"배포용 모델 파일이 저장되었습니다: {output_path}")
+    return output_path
+
+def load_deploy_artifact(artifact_path, device=None, use_cache=True, quantize=False, record_work=True):
+    """배포용 단일 모델 파일을 메모리 매핑으로 한 번에 로드
+    
+    Args:
+        artifact_path: 배포용 모델 파일 경로 (.safetensors)
+        device: 장치 (CPU/GPU)
+        use_cache: 추론 결과 캐시 사용 여부
+        quantize: INT8 동적 양자화 적용 여부 (CPU 추론용)
+        record_work: 작업 기록 저장 여부 (추론 작업 프로세스는 False)
+        
+    Returns:
+        trained_model: 학습된 모델 인스턴스
+    """
+    import time
+    from tokenizers import Tokenizer
+    from safetensors import safe_open
+    from safetensors.torch import load_file
+    
+    start_time = time.time()
+    print(f"배포용 모델 파일을 불러오는 중입니다: {artifact_path}")
+    
+    if not os.path.isfile(artifact_path):
+        raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {artifact_path}")
+    
+    with safe_open(artifact_path, framework="pt") as f:
+        metadata = f.metadata() or {}
+    if metadata.get('format') != DEPLOY_ARTIFACT_FORMAT:
+        raise ValueError(f"배포용 모델 파일 형식이 아닙니다: {artifact_path}")
+    
+    # 설정과 토크나이저를 파일 안의 메타데이터에서 복원 (네트워크/추가 파일 불필요)
+    config = ElectraConfig.from_dict(json.loads(metadata['electra_config']))
+    tokenizer_class = getattr(transformers, metadata['tokenizer_class'], PreTrainedTokenizerFast)
+    tokenizer = tokenizer_class(
+        tokenizer_object=Tokenizer.from_str(metadata['tokenizer_json']),
+        **json.loads(metadata['tokenizer_config'])
+    )
+    
+    trained_model = KOTEtagger(device=device, config=config, tokenizer=tokenizer)
+    
+    # 메모리 매핑된 가중치를 한 번에 적용
+    state_dict = load_file(artifact_path, device=str(device) if device is not None else "cpu")
+    try:
+        # PyTorch 2.1.0 이상은 복사 없이 매핑된 텐서를 그대로 사용 (프로세스 간 페이지 공유)
+        trained_model.load_state_dict(state_dict, strict=True, assign=True)
+    except TypeError:
+        trained_model.load_state_dict(state_dict, strict=True)
+    trained_model.eval()
+    trained_model.source_path = artifact_path
+    
+    if quantize:
+        quantize_model(trained_model)
+    
+    if use_cache:
+        attach_result_cache(trained_model, artifact_path, fingerprint=metadata.get('source_fingerprint') or None)
+    
+    end_time = time.time()
+    print(f"감정분석에 필요한 모델이 모두 로딩되었습니다.\n소요된 시간은 {round(end_time - start_time, 2)}초 입니다.")
+    if record_work:
+        log_work("배포용 감정분석 모델로딩", start_time, end_time, 파일명=os.path.basename(artifact_path))
+    
+    return trained_model
+
+def load_model(device=None, use_cache=True, quantize=False):
     """감정 분석 모델 로드 함수"""
     import time
     start_time = time.time()
     
+    # 배포용 모델 파일이 있으면 우선 사용 (빠른 시작)
+    artifact_path = resource_path(DEPLOY_ARTIFACT_NAME)
+    if os.path.isfile(artifact_path):
+        return load_deploy_artifact(artifact_path, device, use_cache=use_cache, quantize=quantize)
+    
     print("감정분석 모델을 불러오는 중입니다...")
     
     # 모델 인스턴스 생성
@@ -173,6 +428,7 @@ def load_model(device=None):
                     state_dict = torch.load(model_path, map_location=device)
                 
                 trained_model.load_state_dict(state_dict, strict=False)
+                trained_model.source_path = model_path
                 print("<All keys matched successfully>")
             except Exception as e:
                 print(f"모델 로딩 중 예외 발생: {e}")
@@ -211,18 +467,30 @@ def load_model(device=None):
     # 작업 완료 메시지 출력
     print(f"감정분석에 필요한 모델이 모두 로딩되었습니다.\n소요된 시간은 {elapsed_time}초 입니다.")
     
+    # INT8 동적 양자화 (선택)
+    if quantize:
+        quantize_model(trained_model)
+    
+    # 추론 결과 캐시 연결
+    if use_cache:
+        attach_result_cache(trained_model, model_path)
+    
     # 작업 기록 저장
     log_work("감정분석 모델로딩", start_time, end_time)
     
     return trained_model
 
-def load_custom_model(model_path, device=None):
+def load_custom_model(model_path, device=None, use_cache=True, quantize=False, offline_mode=False, record_work=True):
     """
     사용자가 선택한 모델 파일을 로드하는 함수
     
     Args:
         model_path: 모델 파일 경로
         device: 장치 (CPU/GPU)
+        use_cache: 추론 결과 캐시 사용 여부
+        quantize: INT8 동적 양자화 적용 여부 (CPU 추론용)
+        offline_mode: 사전학습 모델 구성을 로컬 파일에서 읽을지 여부
+        record_work: 작업 기록 저장 여부 (추론 작업 프로세스는 False)
         
     Returns:
         trained_model: 학습된 모델 인스턴스
@@ -230,10 +498,14 @@ def load_custom_model(model_path, device=None):
     import time
     start_time = time.time()
     
+    # 배포용 모델 파일은 메모리 매핑 방식으로 로드
+    if model_path.lower().endswith('.safetensors'):
+        return load_deploy_artifact(model_path, device, use_cache=use_cache, quantize=quantize, record_work=record_work)
+    
     print(f"사용자 지정 모델을 불러오는 중입니다: {model_path}")
     
     # 모델 인스턴스 생성
-    trained_model = KOTEtagger(offline_mode=False, device=device)
+    trained_model = KOTEtagger(offline_mode=offline_mode, device=device)
     
     # 경로 및 파일 존재 여부 확인
     if not os.path.isfile(model_path):
@@ -257,6 +529,7 @@ def load_custom_model(model_path, device=None):
             state_dict = torch.load(model_path, map_location=device)
         
         trained_model.load_state_dict(state_dict, strict=False)
+        trained_model.source_path = model_path
         print("<All keys matched successfully>")
     except Exception as e:
         print(f"모델 로딩 중 예외 발생: {e}")
@@ -270,8 +543,17 @@ def load_custom_model(model_path, device=None):
     # 작업 완료 메시지 출력
     print(f"감정분석에 필요한 모델이 모두 로딩되었습니다.\n소요된 시간은 {elapsed_time}초 입니다.")
     
+    # INT8 동적 양자화 (선택)
+    if quantize:
+        quantize_model(trained_model)
+    
+    # 추론 결과 캐시 연결
+    if use_cache:
+        attach_result_cache(trained_model, model_path)
+    
     # 작업 기록 저장
-    log_work("사용자지정 감정분석 모델로딩", start_time, end_time)
+    if record_work:
+        log_work("사용자지정 감정분석 모델로딩", start_time, end_time)
     
     return trained_model
 
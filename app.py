@@ -79,6 +79,10 @@ class EmotionAnalysisApp(tk.Tk):
         """표준 출력 리디렉션 복원"""
         if hasattr(self, 'original_stdout'):
             sys.stdout = self.original_stdout
+            # 버퍼에 남은 로그 반영 후 주기적 갱신 중단
+            if getattr(self, 'redirector', None) is not None:
+                self.redirector.close()
+                self.redirector = None
             print("표준 출력이 복원되었습니다.")
         
     def load_model_and_start(self):
@@ -87,6 +91,9 @@ class EmotionAnalysisApp(tk.Tk):
         self.app = EmotionAnalysisGUI(self)
         print("애플리케이션이 준비되었습니다. 상단의 '감정 분석 모델 로드' 버튼을 클릭하여 분석을 시작하세요.")
         
+        # 마지막으로 사용한 모델을 백그라운드에서 미리 로드 (창이 표시된 뒤 시작)
+        self.after(200, self.app.preload_last_model)
+        
         try:
             # GUI 루프 시작
             self.mainloop()
@@ -0,0 +1,187 @@
+"""
+배치 추론 스케줄러 모듈
+
+텍스트를 토큰 길이순으로 묶어 모델에 배치 단위로 전달하고,
+결과를 원래 행 순서로 되돌려 놓습니다. 중복 텍스트와 캐시에 있는
+텍스트는 모델을 거치지 않습니다.
+"""
+import traceback
+import numpy as np
+
+from configure import LABELS, POLARITY_MAP
+from inference_cache import normalize_text
+from instrumentation import span
+
+# 한 번의 순전파에 넣을 기본 텍스트 수
+DEFAULT_BATCH_SIZE = 32
+
+# 라벨 인덱스 -> 감정 이름 / 감정 분류(극성) 조회 배열
+LABEL_NAMES = np.array(LABELS, dtype=object)
+LABEL_POLARITY = np.array([POLARITY_MAP.get(label, '중립') for label in LABELS], dtype=object)
+
+
+def label_names(replace_none=False):
+    """라벨 인덱스 -> 감정 이름 조회 배열 반환
+
+    Args:
+        replace_none (bool): '없음'을 '무감정'으로 대체할지 여부
+
+    Returns:
+        np.ndarray: 감정 이름 배열
+    """
+    if not replace_none:
+        return LABEL_NAMES
+    names = LABEL_NAMES.copy()
+    names[LABELS.index('없음')] = '무감정'
+    return names
+
+
+def summarize_scores(scores):
+    """감정 점수 행렬에서 행별 주요 감정, 강도, 감정 분류 계산
+
+    Args:
+        scores (np.ndarray): (n, 44) 감정 점수 행렬
+
+    Returns:
+        tuple: (주요 감정 인덱스 배열, 감정 강도 배열, 감정 분류 배열)
+    """
+    top_idx = scores.argmax(axis=1)
+    intensity = scores[np.arange(len(scores)), top_idx]
+    return top_idx, intensity, LABEL_POLARITY[top_idx]
+
+
+def measure_lengths(model, texts):
+    """텍스트별 토큰 길이 측정
+
+    Args:
+        model: 감정 분석 모델 인스턴스 (tokenizer 속성 사용)
+        texts (list): 텍스트 목록
+
+    Returns:
+        np.ndarray: 텍스트별 토큰 길이 (토크나이저가 없으면 문자 길이)
+    """
+    tokenizer = getattr(model, 'tokenizer', None)
+    if tokenizer is None:
+        return np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+
+    with span("토큰_길이_측정", len(texts)):
+        encoded = tokenizer(
+            texts,
+            add_special_tokens=True,
+            max_length=512,
+            truncation=True,
+            return_attention_mask=False,
+            return_token_type_ids=False
+        )
+    return np.fromiter((len(ids) for ids in encoded["input_ids"]), dtype=np.int64, count=len(texts))
+
+
+def schedule_batches(lengths, batch_size=DEFAULT_BATCH_SIZE):
+    """길이가 비슷한 텍스트끼리 묶은 배치 인덱스 목록 생성
+
+    Args:
+        lengths (np.ndarray): 텍스트별 토큰 길이
+        batch_size (int): 배치 크기
+
+    Returns:
+        list: 원래 위치 인덱스 배열의 목록 (짧은 배치부터)
+    """
+    order = np.argsort(lengths, kind="stable")
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+
+def _infer_rows(model, texts):
+    """배치 추론 실패 시 행 단위로 다시 추론하여 문제 행만 골라냄"""
+    scores = np.zeros((len(texts), len(LABELS)), dtype=np.float32)
+    failed = np.zeros(len(texts), dtype=bool)
+    for i, text in enumerate(texts):
+        try:
+            scores[i] = model.infer_batch([text], batch_size=1)[0]
+        except Exception as e:
+            print(f"텍스트 분석 중 오류: {str(e)}")
+            failed[i] = True
+    return scores, failed
+
+
+def prepare_inference(model, texts):
+    """중복 제거 및 캐시 조회로 실제 추론이 필요한 텍스트 선별
+    
+    Args:
+        model: 감정 분석 모델 인스턴스 (result_cache 속성 사용)
+        texts (list): 분석할 텍스트 목록
+        
+    Returns:
+        tuple: (고유 텍스트 목록, 원래 행 -> 고유 텍스트 인덱스 배열, 고유 텍스트별 등장 횟수,
+                고유 텍스트 점수 행렬, 추론이 필요한 고유 텍스트 인덱스 배열)
+    """
+    # 정규화 후 중복 텍스트는 한 번만 추론
+    with span("텍스트_정규화", len(texts)):
+        unique_index = {}
+        inverse = np.empty(len(texts), dtype=np.int64)
+        for i, text in enumerate(texts):
+            inverse[i] = unique_index.setdefault(normalize_text(text), len(unique_index))
+        unique_texts = list(unique_index)
+        multiplicity = np.bincount(inverse, minlength=len(unique_texts))
+    
+    # 캐시에 있는 텍스트는 인코더를 거치지 않음
+    cache = getattr(model, 'result_cache', None)
+    if cache is not None:
+        with span("캐시_조회", len(unique_texts)):
+            scores, found = cache.get_many(unique_texts)
+        pending = np.flatnonzero(~found)
+    else:
+        scores = np.zeros((len(unique_texts), len(LABELS)), dtype=np.float32)
+        pending = np.arange(len(unique_texts))
+    
+    return unique_texts, inverse, multiplicity, scores, pending
+
+
+def run_bucketed_inference(model, texts, batch_size=DEFAULT_BATCH_SIZE, progress_callback=None):
+    """토큰 길이별 배치 추론 수행 후 원래 순서로 결과 반환
+    
+    Args:
+        model: infer_batch 메서드를 가진 감정 분석 모델 인스턴스
+        texts (list): 분석할 텍스트 목록
+        batch_size (int): 배치 크기
+        progress_callback (callable, optional): (완료 건수, 전체 건수)를 받는 진행 상황 콜백
+        
+    Returns:
+        tuple: ((n, 44) float32 감정 점수 행렬, (n,) 오류 여부 배열)
+    """
+    texts = list(texts)
+    total = len(texts)
+    
+    if total == 0:
+        return np.zeros((0, len(LABELS)), dtype=np.float32), np.zeros(0, dtype=bool)
+    
+    unique_texts, inverse, multiplicity, scores, pending = prepare_inference(model, texts)
+    failed = np.zeros(len(unique_texts), dtype=bool)
+    cache = getattr(model, 'result_cache', None)
+    
+    done = total - int(multiplicity[pending].sum())
+    if done and progress_callback is not None:
+        progress_callback(done, total)
+    
+    pending_texts = [unique_texts[i] for i in pending]
+    lengths = measure_lengths(model, pending_texts) if pending_texts else np.zeros(0, dtype=np.int64)
+    
+    for batch_pos in schedule_batches(lengths, batch_size):
+        batch_idx = pending[batch_pos]
+        batch_texts = [unique_texts[i] for i in batch_idx]
+        try:
+            scores[batch_idx] = model.infer_batch(batch_texts, batch_size=len(batch_texts))
+        except Exception as e:
+            print(f"배치 추론 중 오류 발생: {str(e)}. 행 단위로 다시 시도합니다.")
+            print(traceback.format_exc())
+            scores[batch_idx], failed[batch_idx] = _infer_rows(model, batch_texts)
+        
+        if cache is not None:
+            stored = batch_idx[~failed[batch_idx]]
+            cache.put_many([unique_texts[i] for i in stored], scores[stored])
+        
+        done += int(multiplicity[batch_idx].sum())
+        if progress_callback is not None:
+            progress_callback(done, total)
+    
+    # 원래 행 순서로 결과 복원
+    return scores[inverse], failed[inverse]
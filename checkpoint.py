@@ -0,0 +1,202 @@
+"""
+파일 감정 분석 체크포인트 모듈
+
+분석이 끝난 행 구간과 감정 점수를 SQLite 보조 파일(sidecar)에 주기적으로 기록하여
+프로그램이 중단되더라도 같은 입력 파일/컬럼으로 다시 실행하면 남은 행부터 이어서 분석합니다.
+"""
+import os
+import json
+import hashlib
+import sqlite3
+import traceback
+import numpy as np
+
+from configure import LABELS, ensure_output_dir
+from inference_cache import model_fingerprint
+
+# 기본 체크포인트 저장 간격 (행 수)
+DEFAULT_CHECKPOINT_ROWS = 10000
+
+# 체크포인트 파일 확장자
+CHECKPOINT_EXT = ".ckpt.sqlite3"
+
+
+def model_identity(model):
+    """체크포인트 비교용 모델 식별 문자열 (모델 파일 지문 및 양자화 여부)
+
+    Args:
+        model: 감정 분석 모델 인스턴스
+
+    Returns:
+        str: 모델 식별 문자열
+    """
+    cache = getattr(model, 'result_cache', None)
+    if cache is not None:
+        return cache.fingerprint
+
+    source_path = getattr(model, 'source_path', None)
+    if source_path and os.path.isfile(source_path):
+        identity = model_fingerprint(source_path)
+    else:
+        identity = type(model).__name__
+    if getattr(model, 'quantized', False):
+        identity += ":int8"
+    return identity
+
+
+def checkpoint_path_for(input_path, text_column):
+    """입력 파일과 분석 컬럼에 대응하는 체크포인트 파일 경로 (output/checkpoints 폴더)"""
+    checkpoint_dir = os.path.join(ensure_output_dir(), "checkpoints")
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    key = hashlib.sha1(f"{os.path.abspath(input_path)}\0{text_column}".encode("utf-8")).hexdigest()[:12]
+    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(checkpoint_dir, f"{base_name}_{key}{CHECKPOINT_EXT}")
+
+
+def pending_ranges(done_mask, interval):
+    """완료되지 않은 행을 최대 interval 행 단위의 연속 구간으로 나누기
+
+    Args:
+        done_mask (np.ndarray): 행별 완료 여부 배열
+        interval (int): 구간 최대 행 수
+
+    Returns:
+        list: (시작 위치, 끝 위치) 구간 목록
+    """
+    ranges = []
+    pending = np.flatnonzero(~done_mask)
+    if len(pending) == 0:
+        return ranges
+
+    # 연속된 미완료 구간 찾기
+    breaks = np.flatnonzero(np.diff(pending) != 1) + 1
+    for run in np.split(pending, breaks):
+        run_start, run_stop = int(run[0]), int(run[-1]) + 1
+        for start in range(run_start, run_stop, interval):
+            ranges.append((start, min(start + interval, run_stop)))
+    return ranges
+
+
+class AnalysisCheckpoint:
+    """파일 분석 진행 상황 체크포인트 클래스"""
+
+    def __init__(self, input_path, text_column, model, checkpoint_path=None):
+        """체크포인트 열기 (입력 파일, 컬럼, 모델이 이전 기록과 다르면 초기화)
+
+        Args:
+            input_path (str): 분석 대상 파일 경로
+            text_column (str): 텍스트 컬럼 이름
+            model: 감정 분석 모델 인스턴스
+            checkpoint_path (str, optional): 체크포인트 파일 경로, None이면 output/checkpoints 폴더 사용
+        """
+        stat = os.stat(input_path)
+        self.identity = json.dumps({
+            "input_path": os.path.abspath(input_path),
+            "size": stat.st_size,
+            "mtime": int(stat.st_mtime),
+            "text_column": text_column,
+            "model": model_identity(model)
+        }, ensure_ascii=False, sort_keys=True)
+        self.path = checkpoint_path or checkpoint_path_for(input_path, text_column)
+
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ranges ("
+            "start INTEGER PRIMARY KEY, stop INTEGER NOT NULL, "
+            "scores BLOB NOT NULL, analyzed BLOB NOT NULL, errored BLOB NOT NULL)"
+        )
+
+        # 입력 파일이 바뀌었거나 다른 모델이면 이전 기록 폐기
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'identity'").fetchone()
+        if row is None or row[0] != self.identity:
+            if row is not None:
+                print("입력 파일 또는 모델이 변경되어 이전 분석 기록을 초기화합니다.")
+            self._conn.execute("DELETE FROM ranges")
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('identity', ?)", (self.identity,))
+        self._conn.commit()
+
+    def restore(self, num_rows):
+        """저장된 구간의 감정 점수 및 행 상태 복원
+
+        Args:
+            num_rows (int): 전체 행 수
+
+        Returns:
+            tuple: ((n, 44) 감정 점수 행렬, 분석 완료 여부 배열, 오류 여부 배열, 완료 구간 여부 배열)
+        """
+        scores = np.zeros((num_rows, len(LABELS)), dtype=np.float32)
+        analyzed = np.zeros(num_rows, dtype=bool)
+        errored = np.zeros(num_rows, dtype=bool)
+        done = np.zeros(num_rows, dtype=bool)
+
+        for start, stop, score_blob, analyzed_blob, errored_blob in self._conn.execute(
+            "SELECT start, stop, scores, analyzed, errored FROM ranges WHERE stop <= ?", (num_rows,)
+        ):
+            scores[start:stop] = np.frombuffer(score_blob, dtype=np.float32).reshape(stop - start, len(LABELS))
+            analyzed[start:stop] = np.frombuffer(analyzed_blob, dtype=bool)
+            errored[start:stop] = np.frombuffer(errored_blob, dtype=bool)
+            done[start:stop] = True
+
+        return scores, analyzed, errored, done
+
+    def load(self, start, stop):
+        """정확히 일치하는 저장 구간 하나 복원 (조각 단위 스트리밍 분석용)
+
+        Args:
+            start (int): 구간 시작 위치
+            stop (int): 구간 끝 위치
+
+        Returns:
+            tuple: (감정 점수 행렬, 분석 완료 여부 배열, 오류 여부 배열) 또는 기록이 없으면 None
+        """
+        row = self._conn.execute(
+            "SELECT scores, analyzed, errored FROM ranges WHERE start = ? AND stop = ?", (int(start), int(stop))
+        ).fetchone()
+        if row is None:
+            return None
+
+        score_blob, analyzed_blob, errored_blob = row
+        return (np.frombuffer(score_blob, dtype=np.float32).reshape(stop - start, len(LABELS)).copy(),
+                np.frombuffer(analyzed_blob, dtype=bool).copy(),
+                np.frombuffer(errored_blob, dtype=bool).copy())
+
+    def save(self, start, scores, analyzed, errored):
+        """분석이 끝난 행 구간 기록
+
+        Args:
+            start (int): 구간 시작 위치
+            scores (np.ndarray): 구간의 감정 점수 행렬
+            analyzed (np.ndarray): 구간의 분석 완료 여부 배열
+            errored (np.ndarray): 구간의 오류 여부 배열
+        """
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ranges (start, stop, scores, analyzed, errored) VALUES (?, ?, ?, ?, ?)",
+                (int(start), int(start) + len(scores),
+                 np.ascontiguousarray(scores, dtype=np.float32).tobytes(),
+                 np.ascontiguousarray(analyzed, dtype=bool).tobytes(),
+                 np.ascontiguousarray(errored, dtype=bool).tobytes())
+            )
+            self._conn.commit()
+        except Exception as e:
+            # 체크포인트 저장 실패는 분석을 중단하지 않음
+            print(f"체크포인트 저장 중 오류 발생: {e}")
+            print(traceback.format_exc())
+
+    def close(self):
+        """체크포인트 파일 연결 종료"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def remove(self):
+        """분석 완료 후 체크포인트 파일 삭제"""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
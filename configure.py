@@ -3,12 +3,12 @@
 """
 import os
 import sys
+import json
 import time
 import base64
 import logging
 from datetime import datetime, timedelta
 import pandas as pd
-import torch
 
 # 파일 확장자 정의
 csv_ext = ".csv"  # CSV 파일 확장자
@@ -42,6 +42,9 @@ POLARITY_MAP = {
 # GPU 설정
 def setup_device():
     """GPU 사용 설정 및 장치 정보 반환"""
+    # ONNX Runtime 백엔드만 사용하는 경우 torch를 불러오지 않도록 함수 안에서 import
+    import torch
+    
     os.environ['CUDA_VISIBLE_DEVICES'] = '-1'  # GPU 사용 비활성화
     device = torch.device("cpu")
     print(f"사용 중인 디바이스: {device}")
@@ -66,9 +69,221 @@ def ensure_output_dir():
         os.makedirs(output_dir, exist_ok=True)
     return output_dir
 
+# 애플리케이션 설정 파일 (마지막으로 사용한 모델 경로 등)
+SETTINGS_FILE_NAME = "감정분석_설정.json"
+
+def load_app_settings():
+    """애플리케이션 설정 읽기
+    
+    Returns:
+        dict: 설정 사전 (파일이 없거나 읽을 수 없으면 빈 사전)
+    """
+    settings_path = os.path.join(ensure_output_dir(), SETTINGS_FILE_NAME)
+    try:
+        with open(settings_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"설정 파일을 읽을 수 없습니다: {e}")
+        return {}
+
+def save_app_settings(**updates):
+    """애플리케이션 설정 저장 (기존 설정에 병합)
+    
+    Args:
+        **updates: 변경할 설정 항목
+        
+    Returns:
+        dict: 저장된 전체 설정
+    """
+    settings = load_app_settings()
+    settings.update(updates)
+    
+    settings_path = os.path.join(ensure_output_dir(), SETTINGS_FILE_NAME)
+    temp_path = settings_path + ".tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(settings, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, settings_path)
+    except Exception as e:
+        print(f"설정 파일을 저장할 수 없습니다: {e}")
+    return settings
+
+# 작업 기록 파일 (CSV 또는 SQLite)
+WORK_LOG_NAME = "감정분석_작업기록"
+WORK_LOG_COLUMNS = ['작업분류', '작업시작시간', '소요시간(초)', '파일명', '분석건수', '기타정보']
+
+class WorkLog:
+    """추가 전용(append-only) 작업 기록 클래스
+    
+    기록은 메모리 버퍼에 모았다가 일정 건수 또는 시간마다 파일 끝에 이어 쓰고
+    fsync로 디스크에 반영합니다. 기존 기록을 다시 읽거나 덮어쓰지 않으므로
+    기록 건수와 무관하게 호출 비용이 일정합니다.
+    """
+    def __init__(self, backend="csv", flush_rows=20, flush_interval=2.0):
+        """작업 기록 초기화
+        
+        Args:
+            backend (str): 저장 방식 ('csv' 또는 'sqlite')
+            flush_rows (int): 버퍼에 모이면 바로 기록할 건수
+            flush_interval (float): 버퍼 내용을 기록하기까지 최대 대기 시간(초)
+        """
+        import atexit
+        import threading
+        
+        self.backend = backend
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.path = os.path.join(ensure_output_dir(), WORK_LOG_NAME + ('.sqlite3' if backend == 'sqlite' else csv_ext))
+        
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._timer = None
+        self._columns = None
+        self._conn = None
+        
+        # 프로그램 종료 시 남은 기록 저장
+        atexit.register(self.flush)
+    
+    def append(self, record):
+        """기록 한 건 추가 (버퍼가 차면 즉시, 아니면 잠시 후 기록)
+        
+        Args:
+            record (dict): 작업 기록 항목
+        """
+        import threading
+        
+        with self._lock:
+            self._buffer.append(record)
+            flush_now = len(self._buffer) >= self.flush_rows
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        
+        if flush_now:
+            self.flush()
+    
+    def flush(self):
+        """버퍼의 기록을 파일 끝에 이어 쓰기"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            records, self._buffer = self._buffer, []
+            if not records:
+                return
+            
+            try:
+                if self.backend == 'sqlite':
+                    self._write_sqlite(records)
+                else:
+                    self._write_csv(records)
+            except Exception as e:
+                print(f"작업 기록 저장 중 오류 발생: {str(e)}")
+    
+    def _write_csv(self, records):
+        """CSV 파일 끝에 기록 추가 (새 파일이면 헤더 포함)"""
+        import csv
+        import io
+        
+        # 헤더는 처음 한 번만 확인 (기존 파일의 컬럼 순서 유지)
+        if self._columns is None:
+            self._columns = WORK_LOG_COLUMNS
+            if os.path.isfile(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, 'r', encoding='utf-8-sig', newline='') as f:
+                    header = next(csv.reader(f), None)
+                if header:
+                    self._columns = header
+                    if any(col not in header for col in WORK_LOG_COLUMNS):
+                        self._columns = self._migrate_csv_header(header)
+        
+        new_file = not os.path.isfile(self.path) or os.path.getsize(self.path) == 0
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator=os.linesep)
+        if new_file:
+            writer.writerow(self._columns)
+        for record in records:
+            writer.writerow(['' if record.get(col) is None else record.get(col) for col in self._columns])
+        
+        # 한 번의 쓰기로 추가 후 디스크 반영 (기존 내용은 건드리지 않음)
+        with open(self.path, 'a', encoding='utf-8-sig' if new_file else 'utf-8', newline='') as f:
+            f.write(buffer.getvalue())
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _migrate_csv_header(self, header):
+        """이전 버전 기록 파일의 헤더에 없는 컬럼을 추가해 파일 전체를 한 번 다시 쓰기
+        
+        이전 버전은 첫 기록에 있던 컬럼만 헤더로 썼으므로(예: 모델 로드 기록) 그대로 이어 쓰면
+        파일명, 분석건수 등이 저장되지 않습니다. 다시 쓴 뒤에는 추가 전용으로 기록합니다.
+        
+        Args:
+            header (list): 기존 파일의 헤더
+            
+        Returns:
+            list: 기존 컬럼 뒤에 빠진 컬럼을 추가한 헤더
+        """
+        import csv
+        
+        columns = list(header) + [col for col in WORK_LOG_COLUMNS if col not in header]
+        temp_path = self.path + ".tmp"
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as src, \
+                open(temp_path, 'w', encoding='utf-8-sig', newline='') as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst, lineterminator=os.linesep)
+            next(reader, None)
+            writer.writerow(columns)
+            for row in reader:
+                writer.writerow(row + [''] * (len(columns) - len(row)))
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(temp_path, self.path)
+        print(f"작업 기록 파일에 컬럼을 추가했습니다: {', '.join(columns[len(header):])}")
+        return columns
+    
+    def _write_sqlite(self, records):
+        """SQLite 작업 기록 테이블에 추가 (작업분류, 작업시작시간 색인)"""
+        import sqlite3
+        
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS work_log ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, 작업분류 TEXT NOT NULL, 작업시작시간 TEXT NOT NULL, "
+                "소요시간 REAL, 분석건수 INTEGER, 파일명 TEXT, 기타정보 TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_work_log_category ON work_log (작업분류)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_work_log_start ON work_log (작업시작시간)")
+        
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO work_log (작업분류, 작업시작시간, 소요시간, 분석건수, 파일명, 기타정보) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(r['작업분류'], r['작업시작시간'], r['소요시간(초)'], r.get('분석건수'), r.get('파일명'), r.get('기타정보'))
+                 for r in records]
+            )
+
+_work_log = None
+
+def get_work_log():
+    """작업 기록 객체 반환 (저장 방식은 설정 파일의 work_log_backend, 기본값 csv)"""
+    global _work_log
+    if _work_log is None:
+        backend = load_app_settings().get('work_log_backend', 'csv')
+        _work_log = WorkLog(backend='sqlite' if backend == 'sqlite' else 'csv')
+    return _work_log
+
+def flush_work_log():
+    """버퍼에 남은 작업 기록을 즉시 저장"""
+    if _work_log is not None:
+        _work_log.flush()
+
 # 작업 기록 함수
 def log_work(작업분류, start_time, end_time=None, 분석건수=None, 파일명=None, 기타정보=None):
-    """작업 기록을 CSV 파일로 저장
+    """작업 기록을 파일 끝에 추가 (버퍼링된 추가 전용 기록)
     
     Args:
         작업분류 (str): 작업 유형 (텍스트_감정분석, 파일_감정분석 등)
@@ -77,6 +292,9 @@ def log_work(작업분류, start_time, end_time=None, 분석건수=None, 파일
         분석건수 (int, optional): 분석한 항목 수
         파일명 (str, optional): 분석한 파일 이름
         기타정보 (str, optional): 추가 정보
+        
+    Returns:
+        str: 작업 기록 파일 경로
     """
     if end_time is None:
         end_time = datetime.now()
@@ -100,43 +318,18 @@ def log_work(작업분류, start_time, end_time=None, 분석건수=None, 파일
     # 소요시간 반올림
     소요시간 = round(소요시간, 2)
     
-    # 기본 데이터
-    data = {
-        '작업분류': [작업분류], 
-        '작업시작시간': [작업시작시간], 
-        '소요시간(초)': [소요시간]
-    }
-    
-    # 추가 정보가 있으면 추가
-    if 분석건수 is not None:
-        data['분석건수'] = [분석건수]
-    
-    if 파일명 is not None:
-        data['파일명'] = [파일명]
-    
-    if 기타정보 is not None:
-        data['기타정보'] = [기타정보]
-    
-    record_df = pd.DataFrame(data)
-    
-    # output 폴더 생성 및 확인
-    output_dir = ensure_output_dir()
-    
-    # CSV 파일로 저장
-    output_filename = os.path.join(output_dir, '감정분석_작업기록.csv')
-    
-    # 파일 존재 여부 확인
-    file_exists = os.path.isfile(output_filename)
-    
-    # 파일이 존재하면 추가, 아니면 새로 생성
-    if file_exists:
-        existing_df = pd.read_csv(output_filename, encoding='utf-8-sig')
-        combined_df = pd.concat([existing_df, record_df], ignore_index=True)
-        combined_df.to_csv(output_filename, index=False, encoding='utf-8-sig')
-    else:
-        record_df.to_csv(output_filename, index=False, encoding='utf-8-sig')
+    # 기록 추가
+    work_log = get_work_log()
+    work_log.append({
+        '작업분류': 작업분류,
+        '작업시작시간': 작업시작시간,
+        '소요시간(초)': 소요시간,
+        '분석건수': 분석건수,
+        '파일명': 파일명,
+        '기타정보': 기타정보
+    })
     
-    return output_filename
+    return work_log.path
 
 # 스타일 설정
 STYLE = """
@@ -2,17 +2,36 @@
 감정 분석 GUI 컴포넌트 모듈
 """
 import os
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import traceback
-import pandas as pd
 from datetime import datetime
 
 from KOTE_load import load_custom_model
+from onnx_backend import load_onnx_model
+from parallel_inference import available_cpus
+from checkpoint import DEFAULT_CHECKPOINT_ROWS
+from result_io import read_result_file
+from tracing import trace_mode, TRACE_ENV_VAR
+from job_runner import JobRunner, format_duration
+from online_stats import OnlineEmotionStats
 from text_SentimentAnalysis import analyze_text
-from file_SentimentAnalysis import load_file, analyze_file
+from file_SentimentAnalysis import load_file, analyze_file, analyze_file_streaming
 from statistics import load_and_display_statistics
-from configure import setup_device, log_work, LABELS
+from statistics.sketch import summarize_result_files, format_sketch_summary
+from configure import setup_device, log_work, load_app_settings, save_app_settings
+
+
+# 스트리밍 분석 시 컬럼 확인용으로 읽을 미리보기 행 수
+STREAMING_PREVIEW_ROWS = 100
+
+# 그룹 컬럼 선택 안 함 표시
+NO_GROUP_COLUMN = "(없음)"
+
+# 통계 요약에 표시할 최대 그룹 수 (행 수가 많은 순)
+GROUP_SUMMARY_LIMIT = 20
 
 
 class EmotionAnalysisGUI:
@@ -21,14 +40,22 @@ class EmotionAnalysisGUI:
         self.parent = parent
         self.model = model
         self.loaded_data = None  # 불러온 데이터 저장 변수
+        self.loaded_is_preview = False  # 불러온 데이터가 스트리밍용 미리보기(앞부분 일부 행)인지 여부
         self.analyzed_data = None  # 감정 분석된 데이터프레임
         self.columns = []  # 데이터 컬럼 목록
         self.file_path = None  # 선택한 파일 경로
         self.analyze_enabled = model is not None  # 모델이 로드되었는지 여부
+        self.model_loader = None  # 모델 로드 작업 스레드
+        self.controls_before_load = {}  # 모델 로드 시작 전 파일 분석 컨트롤 상태 (로드 실패 시 복원)
+        self.live_stats = None  # 파일 분석 중 누적되는 실시간 통계
+        self.live_stats_version = None  # 통계 요약에 마지막으로 표시한 실시간 통계 버전
         
         # UI 설정
         self.setup_ui()
         
+        # 파일 분석 작업 실행기 (작업 스레드에서 분석, 진행 상황은 메인 스레드에서 표시)
+        self.job_runner = JobRunner(self.parent, on_progress=self.on_job_progress)
+        
         # 모델이 로드되지 않았으면 컨트롤 비활성화
         self.toggle_analyze_controls(self.analyze_enabled)
         
@@ -80,11 +107,54 @@ class EmotionAnalysisGUI:
         self.column_combo = ttk.Combobox(file_frame, width=15, state="disabled")
         self.column_combo.pack(side=tk.LEFT, padx=5, pady=5)
         
+        # 그룹 컬럼 선택 콤보박스 (분석 중 그룹별 실시간 통계 표시)
+        ttk.Label(file_frame, text="그룹 컬럼:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.group_combo = ttk.Combobox(file_frame, width=12, state="disabled", values=[NO_GROUP_COLUMN])
+        self.group_combo.set(NO_GROUP_COLUMN)
+        self.group_combo.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        # 추론 프로세스 수 (2 이상이면 다중 프로세스로 분석)
+        ttk.Label(file_frame, text="프로세스:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.num_workers_var = tk.IntVar(value=1)
+        self.num_workers_spin = ttk.Spinbox(file_frame, from_=1, to=available_cpus(), width=4,
+                                            textvariable=self.num_workers_var, state="readonly")
+        self.num_workers_spin.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        # 대용량 파일 스트리밍 분석 (조각 단위로 읽고 결과 파일에 바로 저장)
+        self.streaming_var = tk.BooleanVar(value=False)
+        self.streaming_check = ttk.Checkbutton(file_frame, text="대용량 스트리밍", variable=self.streaming_var)
+        self.streaming_check.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        # 결과 파일 형식 (Parquet: 감정 점수 float32 열 단위 저장, 빠른 재로드)
+        self.parquet_var = tk.BooleanVar(value=load_app_settings().get('result_format', 'csv') == 'parquet')
+        self.parquet_check = ttk.Checkbutton(file_frame, text="Parquet 저장", variable=self.parquet_var,
+                                             command=self.on_result_format_toggle)
+        self.parquet_check.pack(side=tk.LEFT, padx=5, pady=5)
+        
+        # 추적 기록 (분석 단계 및 배치별 순전파 구간을 Chrome trace 파일로 저장)
+        self.trace_var = tk.BooleanVar(value=trace_mode() != 'off')
+        self.trace_check = ttk.Checkbutton(file_frame, text="추적 기록", variable=self.trace_var,
+                                           command=self.on_trace_toggle)
+        self.trace_check.pack(side=tk.LEFT, padx=5, pady=5)
+        
         # 파일 분석 버튼
         self.file_analyze_button = ttk.Button(file_frame, text="파일 감정 분석", 
                                            command=self.analyze_file, state="disabled")
         self.file_analyze_button.pack(side=tk.LEFT, padx=5, pady=5)
         
+        # 파일 분석 진행 상황 (진행 막대, 처리 속도/예상 남은 시간, 취소 버튼)
+        progress_frame = ttk.Frame(left_column)
+        progress_frame.pack(fill=tk.X, expand=False, padx=5, pady=(0, 5))
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, orient="horizontal", mode="determinate", maximum=100)
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        self.progress_label = ttk.Label(progress_frame, text="", width=45)
+        self.progress_label.pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_button = ttk.Button(progress_frame, text="취소", command=self.cancel_file_analysis, state="disabled")
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        
         # 좌측 하단: 결과 표시 영역
         result_frame = ttk.LabelFrame(left_column, text="분석 결과")
         result_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -111,6 +181,18 @@ class EmotionAnalysisGUI:
         self.load_model_button = ttk.Button(model_frame, text="모델 불러오기", command=self.load_emotion_model)
         self.load_model_button.pack(fill=tk.X, padx=5, pady=5)
         
+        # INT8 양자화 옵션 (CPU 추론 속도 향상)
+        self.quantize_var = tk.BooleanVar(value=False)
+        self.quantize_check = ttk.Checkbutton(model_frame, text="INT8 양자화 모델 사용 (CPU 고속 추론, ONNX 모델 제외)",
+                                              variable=self.quantize_var)
+        self.quantize_check.pack(fill=tk.X, padx=5, pady=(0, 5))
+        
+        # 시작 시 마지막 모델 자동 로드 옵션
+        self.preload_var = tk.BooleanVar(value=load_app_settings().get('preload_last_model', True))
+        self.preload_check = ttk.Checkbutton(model_frame, text="시작 시 마지막 모델 자동 로드",
+                                             variable=self.preload_var, command=self.on_preload_toggle)
+        self.preload_check.pack(fill=tk.X, padx=5, pady=(0, 5))
+        
         # 모델 상태 표시
         self.model_status_label = ttk.Label(model_frame, text="모델 상태: 로드되지 않음", foreground="red")
         self.model_status_label.pack(fill=tk.X, padx=5, pady=5)
@@ -142,6 +224,11 @@ class EmotionAnalysisGUI:
                                          command=self.load_analysis_result_file)
         self.load_stats_button.pack(fill=tk.X, padx=5, pady=5)
         
+        # 대용량/분할 결과 파일 감정 강도 요약 버튼 (파일 전체를 메모리에 올리지 않음)
+        self.summarize_results_button = ttk.Button(file_info_frame, text="결과 파일 감정 강도 요약",
+                                                command=self.summarize_result_files)
+        self.summarize_results_button.pack(fill=tk.X, padx=5, pady=5)
+        
         # 우측 하단: 통계 요약 프레임
         stats_frame = ttk.LabelFrame(right_column, text="통계 정보")
         stats_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -178,50 +265,177 @@ class EmotionAnalysisGUI:
             self.model_status_label.config(text="모델 상태: 로드되지 않음", foreground="red")
             self.file_analyze_button["state"] = "disabled"
             self.column_combo["state"] = "disabled"
+            self.group_combo["state"] = "disabled"
             self.open_stats_button["state"] = "disabled"
     
     def load_emotion_model(self):
-        """감정 분석 모델 로드"""
+        """감정 분석 모델 파일을 선택하고 백그라운드 로드 시작"""
+        # 현재 스크립트 실행 경로 가져오기
+        initial_dir = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+        
+        # 파일 선택 대화상자
+        model_path = filedialog.askopenfilename(
+            title="감정 분석 모델 파일 선택",
+            filetypes=[("KOTE 모델", "*.bin"), ("배포용 모델", "*.safetensors"), ("ONNX 모델", "*.onnx"),
+                       ("모든 파일", "*.*")],
+            initialdir=initial_dir
+        )
+        
+        if model_path:
+            self.start_model_loading(model_path, self.quantize_var.get())
+    
+    def preload_last_model(self):
+        """프로그램 시작 직후 마지막으로 사용한 모델을 백그라운드에서 미리 로드"""
+        settings = load_app_settings()
+        model_path = settings.get('last_model_path')
+        
+        if not self.preload_var.get() or not model_path:
+            return
+        
+        if not os.path.isfile(model_path):
+            print(f"마지막으로 사용한 모델 파일을 찾을 수 없습니다: {model_path}")
+            return
+        
+        print(f"마지막으로 사용한 모델을 미리 불러옵니다: {os.path.basename(model_path)}")
+        quantize = settings.get('last_model_quantize', False)
+        self.quantize_var.set(quantize)
+        self.start_model_loading(model_path, quantize, notify=False)
+    
+    def start_model_loading(self, model_path, quantize=False, notify=True):
+        """작업 스레드에서 모델 로드 시작 (Tk 메인 스레드는 계속 응답)
+        
+        Args:
+            model_path (str): 모델 파일 경로
+            quantize (bool): INT8 양자화 적용 여부
+            notify (bool): 완료 시 메시지 상자 표시 여부
+        """
+        if self.model_loader is not None and self.model_loader.is_alive():
+            print("모델을 불러오는 중입니다. 잠시 기다려 주세요.")
+            return
+        
+        # ONNX 모델은 INT8 양자화를 적용하지 않음 (PyTorch 모델 전용 설정)
+        if model_path.lower().endswith('.onnx') and quantize:
+            print("ONNX 모델에는 INT8 양자화 설정이 적용되지 않습니다. 양자화 없이 불러옵니다.")
+            quantize = False
+        
+        # 로드에 실패하면 이전 모델로 되돌릴 수 있도록 파일 분석 컨트롤 상태 저장
+        self.controls_before_load = {
+            widget: str(widget["state"])
+            for widget in (self.file_analyze_button, self.column_combo, self.group_combo, self.open_stats_button)
+        }
+        
+        # 로드 중에는 분석 및 모델 로드 버튼 비활성화
+        self.load_model_button["state"] = "disabled"
+        self.toggle_analyze_controls(False)
+        self.model_status_label.config(text="모델 상태: 불러오는 중...", foreground="orange")
+        
+        result_queue = queue.Queue()
+        self.model_loader = threading.Thread(
+            target=self._load_model_worker,
+            args=(model_path, quantize, result_queue),
+            daemon=True
+        )
+        self.model_loader.start()
+        self.parent.after(100, self._poll_model_loader, result_queue, model_path, quantize, notify)
+    
+    def _load_model_worker(self, model_path, quantize, result_queue):
+        """작업 스레드: 모델 로드 및 워밍업 추론 (진행 상황은 로그 창에 출력)"""
         try:
-            # 현재 스크립트 실행 경로 가져오기
-            initial_dir = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
-            
-            # 파일 선택 대화상자
-            model_path = filedialog.askopenfilename(
-                title="감정 분석 모델 파일 선택",
-                filetypes=[("KOTE 모델", "*.bin"), ("모든 파일", "*.*")],
-                initialdir=initial_dir
-            )
-            
-            if model_path:
+            if model_path.lower().endswith('.onnx'):
+                # ONNX Runtime 백엔드로 로드
+                model = load_onnx_model(model_path)
+            else:
                 # 디바이스 설정
                 device = setup_device()
                 
                 # 모델 로드 - load_custom_model 함수 사용
-                self.model = load_custom_model(model_path, device)
-                self.analyze_enabled = True
-                
-                # 컨트롤 활성화
-                self.toggle_analyze_controls(True)
-                
-                # 작업 기록
-                log_work(
-                    "모델_로드", 
-                    datetime.now(), 
-                    datetime.now(), 
-                    파일명=os.path.basename(model_path)
-                )
-                
-                # 상태 메시지 업데이트
-                messagebox.showinfo("모델 로드", "감정 분석 모델이 성공적으로 로드되었습니다.")
+                model = load_custom_model(model_path, device, quantize=quantize)
+            
+            # 첫 분석의 초기 호출 비용을 미리 지불하는 워밍업 추론
+            print("모델 워밍업 추론을 수행하는 중입니다...")
+            warmup_start = datetime.now()
+            model.infer_batch(["감정 분석 모델을 준비하고 있습니다.", "좋아요"])
+            print(f"모델 워밍업 완료 ({(datetime.now() - warmup_start).total_seconds():.2f}초)")
+            
+            result_queue.put(("done", model))
+        except BaseException as e:
+            # SystemExit 등으로 스레드가 끝나도 메인 스레드가 결과를 받을 수 있도록 모든 예외 전달
+            result_queue.put(("error", e, traceback.format_exc()))
+    
+    def _poll_model_loader(self, result_queue, model_path, quantize, notify):
+        """메인 스레드: 모델 로드 결과 확인"""
+        try:
+            message = result_queue.get_nowait()
+        except queue.Empty:
+            if self.model_loader.is_alive():
+                self.parent.after(100, self._poll_model_loader, result_queue, model_path, quantize, notify)
+                return
+            # 작업 스레드가 결과를 남기지 않고 끝난 경우 (종료 직전에 넣은 결과가 있으면 사용)
+            try:
+                message = result_queue.get_nowait()
+            except queue.Empty:
+                message = ("error", RuntimeError("모델 로드 작업이 결과 없이 종료되었습니다."), "")
         
-        except Exception as e:
-            error_msg = f"모델 로드 중 오류 발생: {str(e)}"
+        self.load_model_button["state"] = "normal"
+        
+        if message[0] == "done":
+            self.model = message[1]
+            self.analyze_enabled = True
+            
+            # 컨트롤 활성화
+            self.toggle_analyze_controls(True)
+            
+            # 다음 실행 시 미리 로드할 수 있도록 모델 경로 저장
+            save_app_settings(last_model_path=model_path, last_model_quantize=bool(quantize))
+            
+            # 작업 기록
+            log_work(
+                "모델_로드", 
+                datetime.now(), 
+                datetime.now(), 
+                파일명=os.path.basename(model_path)
+            )
+            
+            # 상태 메시지 업데이트
+            if notify:
+                messagebox.showinfo("모델 로드", "감정 분석 모델이 성공적으로 로드되었습니다.")
+            else:
+                print("감정 분석 모델이 준비되었습니다.")
+        else:
+            error, error_trace = message[1], message[2]
+            error_msg = f"모델 로드 중 오류 발생: {str(error)}"
             messagebox.showerror("모델 로드 오류", error_msg)
             print(error_msg)
-            traceback.print_exc()
-            self.analyze_enabled = False
-            self.toggle_analyze_controls(False)
+            print(error_trace)
+            
+            if self.model is not None:
+                # 이전에 불러온 모델은 그대로 사용 가능하므로 컨트롤 복원
+                print("이전에 불러온 모델을 계속 사용합니다.")
+                self.analyze_enabled = True
+                self.toggle_analyze_controls(True)
+                for widget, state in self.controls_before_load.items():
+                    widget["state"] = state
+            else:
+                self.analyze_enabled = False
+                self.toggle_analyze_controls(False)
+    
+    def result_format(self):
+        """선택된 결과 파일 형식 ('csv' 또는 'parquet')"""
+        return 'parquet' if self.parquet_var.get() else 'csv'
+    
+    def on_result_format_toggle(self):
+        """결과 파일 형식 설정 저장"""
+        save_app_settings(result_format=self.result_format())
+    
+    def on_trace_toggle(self):
+        """추적 기록 설정 저장 (환경 변수 KOTE_TRACE가 있으면 환경 변수가 우선)"""
+        save_app_settings(trace_mode='spans' if self.trace_var.get() else 'off')
+        if os.environ.get(TRACE_ENV_VAR) is not None:
+            print(f"환경 변수 {TRACE_ENV_VAR}가 설정되어 있어 추적 모드는 환경 변수 값을 따릅니다.")
+    
+    def on_preload_toggle(self):
+        """시작 시 모델 미리 로드 설정 저장"""
+        save_app_settings(preload_last_model=bool(self.preload_var.get()))
     
     def analyze_direct_input(self):
         """텍스트 직접 입력 분석"""
@@ -270,9 +484,11 @@ class EmotionAnalysisGUI:
             self.file_label.config(text=f"선택된 파일: {os.path.basename(file_path)}")
             
             try:
-                # 파일 로드
-                df, file_info = load_file(file_path)
+                # 파일 로드 (스트리밍 분석은 컬럼 확인용 미리보기만 로드)
+                preview_rows = STREAMING_PREVIEW_ROWS if self.streaming_var.get() else None
+                df, file_info = load_file(file_path, nrows=preview_rows)
                 self.loaded_data = df
+                self.loaded_is_preview = preview_rows is not None and len(df) >= preview_rows
                 self.columns = list(df.columns)
                 
                 # 컬럼 선택 콤보박스 업데이트
@@ -280,6 +496,11 @@ class EmotionAnalysisGUI:
                 self.column_combo.current(0)  # 첫 번째 컬럼 선택
                 self.column_combo["state"] = "readonly"
                 
+                # 그룹 컬럼 콤보박스 업데이트 (기본값: 그룹 없음)
+                self.group_combo["values"] = [NO_GROUP_COLUMN] + self.columns
+                self.group_combo.set(NO_GROUP_COLUMN)
+                self.group_combo["state"] = "readonly"
+                
                 # 파일 분석 버튼 활성화
                 self.file_analyze_button["state"] = "normal"
                 
@@ -312,40 +533,177 @@ class EmotionAnalysisGUI:
             messagebox.showwarning("컬럼 오류", "분석할 컬럼을 선택하세요.")
             return
         
-        try:
-            # 파일 감정 분석 실행
-            results, result_text, original_df = analyze_file(
-                self.loaded_data, 
-                selected_column, 
-                self.model, 
-                file_path=self.file_path
-            )
+        if self.job_runner.running:
+            messagebox.showwarning("분석 중", "이미 파일 분석이 진행 중입니다.")
+            return
+        
+        if self.streaming_var.get():
+            self.analyze_file_streaming(selected_column)
+            return
+        
+        # 스트리밍용 미리보기만 불러온 경우 전체 파일을 다시 로드 (미리보기 행만 분석/저장하지 않도록)
+        if self.loaded_is_preview:
+            try:
+                print("스트리밍 분석이 해제되어 전체 파일을 다시 로드합니다.")
+                self.loaded_data, _ = load_file(self.file_path)
+                self.loaded_is_preview = False
+            except Exception as e:
+                error_msg = f"전체 파일 로드 중 오류 발생: {str(e)}"
+                messagebox.showerror("파일 로드 오류", error_msg)
+                print(error_msg)
+                traceback.print_exc()
+                return
+        
+        # 파일 감정 분석 실행 (작업 스레드)
+        self.start_file_job(
+            analyze_file,
+            self.on_file_analysis_done,
+            self.loaded_data,
+            selected_column,
+            self.model,
+            file_path=self.file_path,
+            num_workers=self.num_workers_var.get(),
+            checkpoint_interval=load_app_settings().get('checkpoint_interval', DEFAULT_CHECKPOINT_ROWS),
+            result_format=self.result_format()
+        )
+    
+    def start_file_job(self, func, on_done, *args, **kwargs):
+        """파일 분석 작업을 작업 스레드에서 시작하고 진행 상황 표시 준비
+        
+        Args:
+            func (callable): 분석 함수 (progress_callback, cancel_event 키워드 인자 지원)
+            on_done (callable): 분석 함수의 반환값을 받는 완료 처리 함수
+            *args, **kwargs: 분석 함수 인자
+        """
+        # 분석 중 구간이 끝날 때마다 갱신되는 실시간 통계 (완료 후 통계 요약에 그대로 사용)
+        self.live_stats = OnlineEmotionStats(group_column=self.selected_group_column())
+        self.live_stats_version = None
+        kwargs['live_stats'] = self.live_stats
+        
+        self.set_file_job_controls(True)
+        self.progress_bar.config(mode="determinate", value=0)
+        self.progress_label.config(text="분석 준비 중...")
+        
+        def on_finish(result, error, cancelled):
+            self.set_file_job_controls(False)
+            if error is not None:
+                self.progress_label.config(text="분석 오류")
+                error_msg = f"파일 분석 중 오류 발생: {str(error)}"
+                messagebox.showerror("분석 오류", error_msg)
+                print(error_msg)
+                return
             
+            self.progress_label.config(text="분석 취소됨" if cancelled else "분석 완료")
+            self.refresh_live_stats(final=True)
+            if not cancelled:
+                self.progress_bar.config(mode="determinate", value=100)
+            try:
+                on_done(result)
+            except Exception as e:
+                error_msg = f"분석 결과 표시 중 오류 발생: {str(e)}"
+                messagebox.showerror("분석 오류", error_msg)
+                print(error_msg)
+                traceback.print_exc()
+        
+        self.job_runner.on_finish = on_finish
+        self.job_runner.start(func, *args, **kwargs)
+    
+    def selected_group_column(self):
+        """선택된 그룹 컬럼 (선택하지 않았으면 None)"""
+        column = self.group_combo.get()
+        return column if column and column != NO_GROUP_COLUMN else None
+    
+    def set_file_job_controls(self, running):
+        """파일 분석 중 다른 작업을 막고 취소 버튼 활성화"""
+        state = "disabled" if running else "normal"
+        self.file_analyze_button["state"] = state
+        self.file_button["state"] = state
+        self.load_model_button["state"] = state
+        self.load_stats_button["state"] = state
+        self.summarize_results_button["state"] = state
+        self.group_combo["state"] = "disabled" if running else "readonly"
+        self.cancel_button["state"] = "normal" if running else "disabled"
+    
+    def on_job_progress(self, progress):
+        """진행 막대 및 처리 속도/예상 남은 시간 표시 (메인 스레드)"""
+        text = f"{progress.done:,}행 완료"
+        if progress.total:
+            self.progress_bar.config(mode="determinate", value=progress.done / progress.total * 100)
+            text = f"{progress.done:,}/{progress.total:,}행"
+        if progress.rate > 0:
+            text += f" · {progress.rate:,.0f}행/초"
+        if progress.eta is not None:
+            text += f" · 남은 시간 {format_duration(progress.eta)}"
+        self.progress_label.config(text=text)
+        self.refresh_live_stats()
+    
+    def refresh_live_stats(self, final=False):
+        """실시간 통계가 갱신되었으면 통계 요약 영역에 표시 (메인 스레드)"""
+        if self.live_stats is None or (not final and self.live_stats.version == self.live_stats_version):
+            return
+        self.live_stats_version = self.live_stats.version
+        self.update_stats_summary(self.live_stats, in_progress=not final)
+    
+    def cancel_file_analysis(self):
+        """진행 중인 파일 분석 취소 (완료된 구간까지의 결과는 저장)"""
+        if self.job_runner.running:
+            self.job_runner.cancel()
+            self.cancel_button["state"] = "disabled"
+            self.progress_label.config(text="취소 중... (진행 중인 배치 정리)")
+    
+    def on_file_analysis_done(self, result):
+        """파일 감정 분석 완료 처리 (메인 스레드)"""
+        results, result_text, original_df = result
+        
+        # 결과 텍스트 표시
+        self.result_text.config(state="normal")
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, result_text)
+        self.result_text.config(state="disabled")
+        
+        if results is None:
+            return
+        
+        try:
             # 분석 결과 설정
             self.analyzed_data = results
             
             # 메타데이터 설정 (이미 analyze_file 내에서 처리됨)
-            if not hasattr(self.analyzed_data, '_metadata'):
-                self.analyzed_data._metadata = {'analysis_file_path': self.file_path}
-            
-            # 결과 텍스트 표시
-            self.result_text.config(state="normal")
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, result_text)
-            self.result_text.config(state="disabled")
+            self.analyzed_data.attrs.setdefault('analysis_file_path', self.file_path)
             
-            # 통계 버튼 활성화
+            # 통계 버튼 활성화 (통계 요약은 분석 중 누적한 실시간 통계로 이미 표시됨)
             self.open_stats_button["state"] = "normal"
             
-            # 통계 요약 업데이트
-            self.update_stats_summary()
-            
         except Exception as e:
             error_msg = f"파일 분석 중 오류 발생: {str(e)}"
             messagebox.showerror("분석 오류", error_msg)
             print(error_msg)
             traceback.print_exc()
     
+    def analyze_file_streaming(self, selected_column):
+        """대용량 파일 스트리밍 감정 분석 (결과는 파일로만 저장)"""
+        self.start_file_job(
+            analyze_file_streaming,
+            self.on_streaming_analysis_done,
+            self.file_path,
+            selected_column,
+            self.model,
+            num_workers=self.num_workers_var.get(),
+            result_format=self.result_format()
+        )
+    
+    def on_streaming_analysis_done(self, result):
+        """스트리밍 분석 완료 처리 (메인 스레드)"""
+        saved_path, result_text = result
+        
+        # 결과 텍스트 표시
+        self.result_text.config(state="normal")
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, result_text)
+        if saved_path:
+            self.result_text.insert(tk.END, "\n통계 분석은 '분석 결과 파일 불러오기'로 결과 파일을 열어 확인하세요.\n")
+        self.result_text.config(state="disabled")
+    
     def load_analysis_result_file(self):
         """감정 분석 결과 파일 불러오기"""
         # 모델이 로드되지 않았으면 경고
@@ -356,20 +714,18 @@ class EmotionAnalysisGUI:
         # 파일 선택 대화상자 표시
         file_path = filedialog.askopenfilename(
             title="감정 분석 결과 파일 선택",
-            filetypes=[("CSV 파일", "*.csv"), ("Excel 파일", "*.xlsx"), ("모든 파일", "*.*")]
+            filetypes=[("분석 결과 파일", "*.csv;*.parquet;*.xlsx"), ("CSV 파일", "*.csv"),
+                       ("Parquet 파일", "*.parquet"), ("Excel 파일", "*.xlsx"), ("모든 파일", "*.*")]
         )
         
         if not file_path:
             return
         
         try:
-            # 파일 확장자에 따라 로드 방식 결정
-            _, ext = os.path.splitext(file_path)
-            if ext.lower() == '.csv':
-                df = pd.read_csv(file_path, encoding='utf-8-sig')
-            elif ext.lower() in ['.xlsx', '.xls']:
-                df = pd.read_excel(file_path)
-            else:
+            # 파일 확장자에 따라 로드 방식 결정 (분석 정보와 파일 경로는 df.attrs에 저장됨)
+            try:
+                df = read_result_file(file_path)
+            except ValueError:
                 messagebox.showerror("파일 오류", "지원되지 않는 파일 형식입니다.")
                 return
             
@@ -383,9 +739,6 @@ class EmotionAnalysisGUI:
                                     f"올바른 감정 분석 결과 파일을 선택해주세요.")
                 return
             
-            # 메타데이터에 파일 경로 추가
-            df._metadata = {"analysis_file_path": file_path}
-            
             # 분석 결과 데이터프레임 초기화
             self.load_analysis_result_from_df(df)
             
@@ -395,12 +748,45 @@ class EmotionAnalysisGUI:
             print(error_msg)
             traceback.print_exc()
     
+    def summarize_result_files(self):
+        """하나 이상의 결과 파일(분할 저장된 부분 결과 포함)의 감정 강도 분위수 요약 표시
+        
+        결과 파일 옆에 저장된 스케치가 있으면 복원하고, 없으면 파일을 조각 단위로 읽어 근사합니다.
+        """
+        file_paths = filedialog.askopenfilenames(
+            title="요약할 감정 분석 결과 파일 선택",
+            filetypes=[("분석 결과 파일", "*.csv;*.parquet"), ("CSV 파일", "*.csv"),
+                       ("Parquet 파일", "*.parquet"), ("모든 파일", "*.*")]
+        )
+        
+        if not file_paths:
+            return
+        
+        try:
+            sketch = summarize_result_files(list(file_paths))
+            
+            result_text = "===== 결과 파일 감정 강도 요약 =====\n\n"
+            result_text += "\n".join(f"- {os.path.basename(path)}" for path in file_paths) + "\n\n"
+            result_text += format_sketch_summary(sketch)
+            result_text += "\n* 분위수는 파일을 메모리에 올리지 않고 계산한 근사값입니다.\n"
+            
+            self.stats_summary_area.config(state="normal")
+            self.stats_summary_area.delete(1.0, tk.END)
+            self.stats_summary_area.insert(tk.END, result_text)
+            self.stats_summary_area.config(state="disabled")
+            
+        except Exception as e:
+            error_msg = f"결과 파일 요약 중 오류 발생: {str(e)}"
+            messagebox.showerror("파일 로드 오류", error_msg)
+            print(error_msg)
+            traceback.print_exc()
+    
     def load_analysis_result_from_df(self, df):
         """감정 분석 결과 데이터프레임 초기화"""
         self.analyzed_data = df
         
         # 파일 경로 정보 (있는 경우)
-        file_path = getattr(df, '_metadata', {}).get('analysis_file_path', "분석 결과")
+        file_path = df.attrs.get('analysis_file_path') or "분석 결과"
         
         # 파일 라벨 업데이트
         self.stats_file_label.config(text=f"분석 결과 파일: {os.path.basename(file_path)}")
@@ -422,33 +808,46 @@ class EmotionAnalysisGUI:
         # 통계 버튼 활성화
         self.open_stats_button["state"] = "normal"
     
-    def update_stats_summary(self):
-        """통계 요약 업데이트"""
-        if self.analyzed_data is None:
-            return
-        
-        # 통계 계산
-        total_rows = len(self.analyzed_data)
+    def update_stats_summary(self, stats=None, in_progress=False):
+        """통계 요약 업데이트
         
+        Args:
+            stats (OnlineEmotionStats, optional): 표시할 누적 통계, None이면 분석 결과 데이터로 계산
+            in_progress (bool): 분석 진행 중인 중간 결과 여부
+        """
         # 감정 분류별 통계
         try:
-            # 필요한 컬럼들이 있는지 확인
-            if '감정_분류' not in self.analyzed_data.columns:
-                self.stats_summary_area.config(state="normal")
-                self.stats_summary_area.delete(1.0, tk.END)
-                self.stats_summary_area.insert(tk.END, "감정_분류 컬럼을 찾을 수 없습니다.")
-                self.stats_summary_area.config(state="disabled")
-                return
+            if stats is None:
+                if self.analyzed_data is None:
+                    return
+                
+                # 필요한 컬럼들이 있는지 확인
+                if '감정_분류' not in self.analyzed_data.columns:
+                    self.stats_summary_area.config(state="normal")
+                    self.stats_summary_area.delete(1.0, tk.END)
+                    self.stats_summary_area.insert(tk.END, "감정_분류 컬럼을 찾을 수 없습니다.")
+                    self.stats_summary_area.config(state="disabled")
+                    return
                 
-            polarity_counts = self.analyzed_data['감정_분류'].value_counts()
-            polarity_percent = self.analyzed_data['감정_분류'].value_counts(normalize=True) * 100
+                group_column = self.selected_group_column()
+                if group_column not in self.analyzed_data.columns:
+                    group_column = None
+                stats = OnlineEmotionStats.from_frame(self.analyzed_data, group_column)
             
-            # 주요 감정별 통계 
-            emotion_counts = self.analyzed_data['주요_감정'].value_counts()
-            emotion_percent = self.analyzed_data['주요_감정'].value_counts(normalize=True) * 100
+            summary = stats.snapshot()
+            total_rows = summary['rows']
+            
+            # 감정 분류별/주요 감정별 비율 (값이 있는 행 기준)
+            polarity_counts = summary['polarity_counts']
+            polarity_total = sum(polarity_counts.values())
+            emotion_counts = summary['emotion_counts']
+            emotion_total = sum(emotion_counts.values())
             
             # 통계 요약 텍스트 생성
-            result_text = f"감정 분석 통계 요약 (총 {total_rows}개 항목)\n\n"
+            if in_progress:
+                result_text = f"감정 분석 통계 요약 (분석 중, 현재 {total_rows}개 항목)\n\n"
+            else:
+                result_text = f"감정 분석 통계 요약 (총 {total_rows}개 항목)\n\n"
             
             # 감정 분류별 통계 (기존 형식 유지)
             result_text += "[감정 분류별 통계]\n"
@@ -456,7 +855,7 @@ class EmotionAnalysisGUI:
             
             for polarity in ['긍정', '부정', '중립']:
                 count = polarity_counts.get(polarity, 0)
-                percent = polarity_percent.get(polarity, 0)
+                percent = count / polarity_total * 100 if polarity_total else 0
                 result_text += f"{polarity}: {count}개 ({percent:.2f}%)\n"
             
             result_text += "-" * 40 + "\n\n"
@@ -466,42 +865,59 @@ class EmotionAnalysisGUI:
             result_text += "-" * 40 + "\n"
             
             # 모든 감정을 빈도순으로 정렬
-            sorted_emotions = emotion_counts.sort_values(ascending=False)
+            sorted_emotions = sorted(emotion_counts.items(), key=lambda x: x[1], reverse=True)
             
             # 모든 감정에 대한 통계 표시
-            for emotion, count in sorted_emotions.items():
-                percent = emotion_percent[emotion]
+            for emotion, count in sorted_emotions:
+                percent = count / emotion_total * 100
                 result_text += f"{emotion}: {count}개 ({percent:.2f}%)\n"
             
             result_text += "-" * 40 + "\n\n"
             
+            # 감정 강도 평균/표준편차
+            result_text += "[감정 강도]\n"
+            result_text += "-" * 40 + "\n"
+            if summary['intensity_count']:
+                result_text += f"평균: {summary['intensity_mean']:.4f}\n"
+                if summary['intensity_count'] > 1:
+                    result_text += f"표준편차: {summary['intensity_std']:.4f}\n"
+            else:
+                result_text += "감정 강도 값이 없습니다.\n"
+            
+            result_text += "-" * 40 + "\n\n"
+            
             # 모든 감정 점수 평균 통계
             result_text += "[감정별 평균 점수]\n"
             result_text += "-" * 40 + "\n"
             
-            # 모든 감정 컬럼 찾기 (주요_감정, 감정_분류, 감정_강도를 제외한 나머지)
-            emotion_columns = [col for col in self.analyzed_data.columns 
-                              if col not in ['주요_감정', '감정_분류', '감정_강도', '텍스트'] 
-                              and col in LABELS + ['무감정']]
-            
-            if emotion_columns:
+            if summary['score_means']:
                 # 감정 점수 평균
-                emotion_means = self.analyzed_data[emotion_columns].mean().sort_values(ascending=False)
+                emotion_means = sorted(summary['score_means'].items(), key=lambda x: x[1], reverse=True)
                 
-                for emotion, mean_score in emotion_means.items():
+                for emotion, mean_score in emotion_means:
                     result_text += f"{emotion}: {mean_score:.4f}\n"
             else:
                 result_text += "감정 점수 컬럼을 찾을 수 없습니다.\n"
             
             result_text += "-" * 40 + "\n\n"
             
-            result_text += "* 통계 분석 창을 열어 더 자세한 분석을 수행할 수 있습니다."
+            # 그룹별 통계 (그룹 컬럼을 선택한 경우, 행 수가 많은 순)
+            if stats.group_column is not None:
+                result_text += self.format_group_summary(stats)
             
-            # 결과 표시
+            if in_progress:
+                result_text += "* 분석이 끝나면 최종 통계로 갱신됩니다."
+            else:
+                result_text += "* 통계 분석 창을 열어 더 자세한 분석을 수행할 수 있습니다."
+            
+            # 결과 표시 (분석 중에는 보던 위치 유지)
+            position = self.stats_summary_area.yview()[0]
             self.stats_summary_area.config(state="normal")
             self.stats_summary_area.delete(1.0, tk.END)
             self.stats_summary_area.insert(tk.END, result_text)
             self.stats_summary_area.config(state="disabled")
+            if in_progress:
+                self.stats_summary_area.yview_moveto(position)
         
         except Exception as e:
             error_msg = f"통계 요약 생성 중 오류 발생: {str(e)}"
@@ -513,6 +929,42 @@ class EmotionAnalysisGUI:
             self.stats_summary_area.insert(tk.END, f"통계 요약을 생성할 수 없습니다: {str(e)}")
             self.stats_summary_area.config(state="disabled")
     
+    def format_group_summary(self, stats):
+        """그룹 값별 행 수, 감정 분류 비율, 최다 주요 감정, 평균 감정 강도 텍스트
+        
+        Args:
+            stats (OnlineEmotionStats): 그룹 컬럼을 지정한 누적 통계
+            
+        Returns:
+            str: 통계 요약에 덧붙일 텍스트
+        """
+        groups = sorted(stats.group_snapshots().items(), key=lambda item: item[1]['rows'], reverse=True)
+        
+        result_text = f"[그룹별 통계: {stats.group_column}]\n"
+        result_text += "-" * 40 + "\n"
+        if not groups:
+            result_text += "그룹 값이 있는 행이 없습니다.\n"
+        
+        for key, group in groups[:GROUP_SUMMARY_LIMIT]:
+            polarity_total = sum(group['polarity_counts'].values())
+            ratios = ", ".join(
+                f"{polarity} {group['polarity_counts'].get(polarity, 0) / polarity_total * 100:.1f}%"
+                for polarity in ['긍정', '부정', '중립']
+            ) if polarity_total else "감정 분류 없음"
+            result_text += f"{key}: {group['rows']}개 ({ratios})"
+            if group['emotion_counts']:
+                top_emotion = max(group['emotion_counts'].items(), key=lambda x: x[1])[0]
+                result_text += f", 주요 감정 {top_emotion}"
+            if group['intensity_count']:
+                result_text += f", 평균 강도 {group['intensity_mean']:.4f}"
+            result_text += "\n"
+        
+        if len(groups) > GROUP_SUMMARY_LIMIT:
+            result_text += f"... 외 {len(groups) - GROUP_SUMMARY_LIMIT}개 그룹\n"
+        
+        result_text += "-" * 40 + "\n\n"
+        return result_text
+    
     def open_statistics_window(self):
         """통계 분석 창 열기"""
         if self.analyzed_data is None:
@@ -527,16 +979,9 @@ class EmotionAnalysisGUI:
             # 파일 경로 정보
             file_path = ""
             
-            # 메타데이터가 있으면 복사
-            if hasattr(self.analyzed_data, '_metadata') and self.analyzed_data._metadata:
-                # 메타데이터를 새 사전으로 복사
-                copied_data._metadata = dict(self.analyzed_data._metadata)
-                # 파일 경로 가져오기
-                file_path = copied_data._metadata.get('analysis_file_path', "")
-            else:
-                # 메타데이터가 없는 경우 기본값 설정
-                copied_data._metadata = {'analysis_file_path': self.file_path or ""}
-                file_path = self.file_path or ""
+            # 메타데이터(df.attrs)는 복사본에도 유지됨
+            file_path = copied_data.attrs.get('analysis_file_path') or self.file_path or ""
+            copied_data.attrs['analysis_file_path'] = file_path
             
             # 통계 창 열기 (파일명 파라미터 전달)
             stats_window = load_and_display_statistics(self.parent, copied_data, file_path)
@@ -2,18 +2,195 @@
 파일 입력에 대한 감정 분석 기능 모듈
 """
 import os
+import time
 import numpy as np
 import pandas as pd
 import traceback
 from datetime import datetime
 import tkinter as tk
 from tkinter import filedialog
-import torch
 
-from configure import LABELS, POLARITY_MAP, ensure_output_dir, log_work, csv_ext
+from configure import LABELS, ensure_output_dir, log_work, csv_ext
 from text_SentimentAnalysis import analyze_text
+from batch_inference import run_bucketed_inference, summarize_scores, label_names, DEFAULT_BATCH_SIZE
+from parallel_inference import InferencePool, run_parallel_inference
+from checkpoint import AnalysisCheckpoint, pending_ranges, model_identity, DEFAULT_CHECKPOINT_ROWS
+from result_io import RESULT_FORMATS, ParquetResultWriter, write_result_file
+from instrumentation import current_instrumentation, scoped_job, span, timed_iter, dump_job_stats
+from tracing import traced
+from statistics.sketch import KLLSketch, save_result_sketch, format_sketch_summary
 
-def analyze_file(df, text_column, model, file_path=None, date_column=None, id_column=None, replace_none=False):
+# 스트리밍 분석 시 한 번에 읽고 분석할 기본 행 수
+DEFAULT_CHUNK_ROWS = 20000
+
+
+class AnalysisCancelled(Exception):
+    """사용자가 파일 분석을 취소했을 때 발생하는 예외"""
+
+
+def check_cancelled(cancel_event):
+    """취소 요청이 있으면 AnalysisCancelled 발생"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise AnalysisCancelled()
+
+
+def select_valid_rows(texts):
+    """분석 대상 행 위치 선별 (결측값 및 빈 텍스트 제외)
+    
+    Args:
+        texts (list): 텍스트 컬럼 값 목록
+        
+    Returns:
+        np.ndarray: 분석 대상 행 위치 배열
+    """
+    return np.array([
+        i for i, text in enumerate(texts)
+        if not pd.isna(text) and str(text).strip()
+    ], dtype=np.int64)
+
+
+def score_rows(model, texts, batch_size=DEFAULT_BATCH_SIZE, num_workers=1, progress_callback=None, pool=None):
+    """텍스트 컬럼 전체에 대한 감정 점수 행렬 및 행 상태 계산
+    
+    Args:
+        model: 감정 분석 모델 인스턴스
+        texts (list): 텍스트 컬럼 값 목록
+        batch_size (int): 배치 크기
+        num_workers (int): 추론 프로세스 수
+        progress_callback (callable, optional): (완료 건수, 전체 건수)를 받는 진행 상황 콜백
+        pool (InferencePool, optional): 재사용할 추론 프로세스 풀 (지정 시 num_workers 무시)
+        
+    Returns:
+        tuple: ((n, 44) 감정 점수 행렬, 분석 완료 여부 배열, 오류 여부 배열, 분석 대상 행 위치 배열)
+    """
+    valid_pos = select_valid_rows(texts)
+    
+    # 토큰 길이별 배치 추론 - 입력 텍스트를 문자열로 변환하여 전달
+    valid_texts = [str(texts[i]).strip() for i in valid_pos]
+    if pool is not None:
+        valid_scores, failed = pool.run(valid_texts, progress_callback=progress_callback)
+    else:
+        valid_scores, failed = run_parallel_inference(
+            model,
+            valid_texts,
+            num_workers,
+            batch_size=batch_size,
+            progress_callback=progress_callback
+        )
+    
+    # 전체 행에 대한 감정 점수 행렬 (빈 텍스트 행은 0점)
+    scores = np.zeros((len(texts), len(LABELS)), dtype=np.float32)
+    scores[valid_pos] = valid_scores
+    
+    # 행 상태 구분: 분석 완료 / 오류 / 건너뜀(빈 텍스트)
+    analyzed = np.zeros(len(texts), dtype=bool)
+    analyzed[valid_pos] = True
+    errored = np.zeros(len(texts), dtype=bool)
+    errored[valid_pos[failed]] = True
+    analyzed &= ~errored
+    
+    return scores, analyzed, errored, valid_pos
+
+
+def result_row_values(scores, analyzed, errored, replace_none=False):
+    """행별 주요 감정, 감정 강도, 감정 분류 값 계산
+    
+    Args:
+        scores (np.ndarray): (n, 44) 감정 점수 행렬
+        analyzed (np.ndarray): 분석 완료 여부 배열
+        errored (np.ndarray): 오류 여부 배열
+        replace_none (bool): '없음'을 '무감정'으로 대체할지 여부
+        
+    Returns:
+        tuple: (주요 감정, 감정 강도, 감정 분류, 주요 감정 인덱스, 극성) 배열
+    """
+    top_idx, intensity, polarity = summarize_scores(scores)
+    names = label_names(replace_none)
+    
+    top_emotion = np.where(analyzed, names[top_idx], None)
+    top_emotion[errored] = '오류'
+    top_polarity = np.where(analyzed, polarity, None)
+    top_polarity[errored] = '중립'
+    top_score = np.where(analyzed, intensity, np.nan)
+    top_score[errored] = 0.0
+    return top_emotion, top_score, top_polarity, top_idx, polarity
+
+
+def update_live_stats(live_stats, df, scores, analyzed, errored, replace_none=False):
+    """분석이 끝난 구간 결과를 실시간 통계에 반영 (결과 파일과 같은 행별 값 기준)
+    
+    Args:
+        live_stats (OnlineEmotionStats): 실시간 통계 (None이면 무시)
+        df (pd.DataFrame): 구간의 원본 데이터프레임 (그룹 컬럼 값 사용)
+        scores, analyzed, errored: 구간의 감정 점수 행렬 및 행 상태 배열
+        replace_none (bool): '없음'을 '무감정'으로 대체할지 여부
+    """
+    if live_stats is None or len(df) == 0:
+        return
+    top_emotion, top_score, top_polarity, _, _ = result_row_values(scores, analyzed, errored, replace_none)
+    group_keys = df[live_stats.group_column].to_numpy() if live_stats.group_column in df.columns else None
+    live_stats.update(top_polarity, top_emotion, top_score, scores, group_keys=group_keys)
+
+
+def assemble_result_frame(df, scores, analyzed, errored, replace_none=False):
+    """원본 데이터프레임에 주요 감정, 감정 강도, 감정 분류 및 감정별 점수 컬럼 결합
+    
+    Args:
+        df (pd.DataFrame): 원본 데이터프레임
+        scores (np.ndarray): (n, 44) 감정 점수 행렬
+        analyzed (np.ndarray): 분석 완료 여부 배열
+        errored (np.ndarray): 오류 여부 배열
+        replace_none (bool): '없음'을 '무감정'으로 대체할지 여부
+        
+    Returns:
+        tuple: (결과 데이터프레임, 감정 분류별 개수 사전, 감정별 개수 사전)
+    """
+    # 감정 분류 및 강도 계산
+    top_emotion, top_score, top_polarity, top_idx, polarity = result_row_values(scores, analyzed, errored, replace_none)
+    names = label_names(replace_none)
+    
+    # 결과 데이터프레임 생성 (기존 결과 컬럼이 있으면 새 값으로 대체)
+    result_columns = ['주요_감정', '감정_강도', '감정_분류'] + LABELS
+    results_df = pd.concat([
+        df.drop(columns=[col for col in result_columns if col in df.columns]),
+        pd.DataFrame({
+            '주요_감정': top_emotion,
+            '감정_강도': top_score,
+            '감정_분류': top_polarity
+        }, index=df.index),
+        pd.DataFrame(scores, index=df.index, columns=LABELS)
+    ], axis=1)
+    
+    # 감정 분류별 카운트
+    emotion_counts = dict(zip(names, np.bincount(top_idx[analyzed], minlength=len(LABELS))))
+    emotion_counts = {emotion: int(count) for emotion, count in emotion_counts.items() if count > 0}
+    polarity_counts = {'긍정': 0, '부정': 0, '중립': 0}
+    polarity_values, polarity_totals = np.unique(polarity[analyzed].astype(str), return_counts=True)
+    for value, count in zip(polarity_values, polarity_totals):
+        polarity_counts[value] = polarity_counts.get(value, 0) + int(count)
+    
+    return results_df, polarity_counts, emotion_counts
+
+
+def format_count_summary(polarity_counts, emotion_counts, total):
+    """감정 분류별 통계 및 상위 감정 통계 텍스트 생성"""
+    summary = "== 감정 분류별 통계 ==\n"
+    for polarity, count in polarity_counts.items():
+        percent = count / total * 100 if total > 0 else 0
+        summary += f"{polarity}: {count}개 ({percent:.1f}%)\n"
+    
+    summary += "\n== 상위 감정 통계 (상위 5개) ==\n"
+    sorted_emotions = sorted(emotion_counts.items(), key=lambda x: x[1], reverse=True)
+    for emotion, count in sorted_emotions[:5]:
+        percent = count / total * 100 if total > 0 else 0
+        summary += f"{emotion}: {count}개 ({percent:.1f}%)\n"
+    return summary
+
+@scoped_job
+@traced("파일_감정분석")
+def analyze_file(df, text_column, model, file_path=None, date_column=None, id_column=None, replace_none=False,
+                 batch_size=DEFAULT_BATCH_SIZE, num_workers=1, checkpoint_interval=DEFAULT_CHECKPOINT_ROWS,
+                 resume=True, result_format="csv", progress_callback=None, cancel_event=None, live_stats=None):
     """
     파일을 로드하고 감정 분석 수행
     
@@ -25,16 +202,25 @@ def analyze_file(df, text_column, model, file_path=None, date_column=None, id_co
         date_column (str, optional): 날짜 컬럼 이름
         id_column (str, optional): ID 컬럼 이름
         replace_none (bool, optional): '없음'을 '무감정'으로 대체할지 여부
+        batch_size (int, optional): 한 번의 순전파에 넣을 텍스트 수
+        num_workers (int, optional): 추론 프로세스 수 (2 이상이면 다중 프로세스 추론)
+        checkpoint_interval (int, optional): 체크포인트 저장 간격 (행 수)
+        resume (bool, optional): 파일 경로가 있을 때 체크포인트로 중단된 분석 이어가기 여부
+        result_format (str, optional): 결과 파일 형식 ('csv' 또는 'parquet')
+        progress_callback (callable, optional): (완료 행 수, 전체 행 수)를 받는 진행 상황 콜백
+        cancel_event (threading.Event, optional): 설정되면 분석을 중단하고 완료된 구간까지의 결과 저장
+        live_stats (OnlineEmotionStats, optional): 구간 분석이 끝날 때마다 갱신할 실시간 통계
         
     Returns:
         tuple: (분석 결과 데이터프레임, 결과 텍스트, 원본 데이터프레임)
     """
-    # 원본 데이터 복사 (참조 방지)
-    original_df = df.copy()
+    # 원본 데이터프레임은 수정하지 않음 (결과는 새 데이터프레임으로 생성)
+    original_df = df
     file_info = file_path if file_path else "데이터프레임 직접 입력"
     
     # 분석 시작 시간 기록
     analyze_start_time = datetime.now()
+    checkpoint = None
     
     # 분석 수행
     try:
@@ -42,7 +228,10 @@ def analyze_file(df, text_column, model, file_path=None, date_column=None, id_co
         metadata = {
             "파일정보": file_info,
             "전체행수": len(df),
-            "분석컬럼": text_column
+            "분석컬럼": text_column,
+            "분석일시": analyze_start_time.strftime('%Y-%m-%d %H:%M:%S'),
+            "모델": model_identity(model),
+            "감정라벨수": len(LABELS)
         }
         
         # 분석 시작 메시지
@@ -50,88 +239,93 @@ def analyze_file(df, text_column, model, file_path=None, date_column=None, id_co
         result_text += f"파일: {os.path.basename(file_info) if isinstance(file_info, str) else '데이터프레임'}\n"
         result_text += f"총 {len(df)}개 행 분석 중...\n\n"
         
-        # 결과 데이터프레임 초기화
-        results_df = df.copy()
-        
         # 텍스트 컬럼 유효성 검사
         if text_column not in df.columns:
             error_msg = f"텍스트 컬럼 '{text_column}'이 데이터에 존재하지 않습니다."
             return None, error_msg, None
         
-        # 결과 컬럼 추가
-        results_df['주요_감정'] = None
-        results_df['감정_강도'] = None
-        results_df['감정_분류'] = None
+        # 분석 시작 시간 (더 정확한 계산을 위해)
+        start_time = datetime.now()
         
-        # 각 감정별 강도 컬럼 추가
-        for emotion in LABELS:
-            results_df[emotion] = 0.0
+        # 추론 결과 캐시 적중/미적중 횟수 (작업 기록용)
+        cache = getattr(model, 'result_cache', None)
+        cache_counts_before = cache.counts() if cache is not None else (0, 0)
         
-        # 감정 분류별 카운트
-        emotion_counts = {}
-        polarity_counts = {'긍정': 0, '부정': 0, '중립': 0}
+        texts = df[text_column].tolist()
+        num_rows = len(texts)
         
-        # CUDA 메모리 모니터링
-        progress_interval = max(1, len(df) // 10)  # 10% 단위로 진행 상황 표시
+        # 같은 파일/컬럼/모델의 이전 분석 기록이 있으면 완료된 구간은 건너뛰기
+        if resume and isinstance(file_path, str) and os.path.isfile(file_path):
+            try:
+                checkpoint = AnalysisCheckpoint(file_path, text_column, model)
+            except Exception as e:
+                print(f"체크포인트를 사용할 수 없습니다: {e}")
         
-        # 분석 시작 시간 (더 정확한 계산을 위해)
-        start_time = datetime.now()
+        if checkpoint is not None:
+            scores, analyzed, errored, done_mask = checkpoint.restore(num_rows)
+            resumed_rows = int(done_mask.sum())
+            if resumed_rows:
+                result_text += f"이전 분석 기록에서 {resumed_rows}개 행을 불러와 이어서 분석합니다.\n"
+                update_live_stats(live_stats, df[done_mask], scores[done_mask], analyzed[done_mask],
+                                  errored[done_mask], replace_none)
+        else:
+            scores = np.zeros((num_rows, len(LABELS)), dtype=np.float32)
+            analyzed = np.zeros(num_rows, dtype=bool)
+            errored = np.zeros(num_rows, dtype=bool)
+            resumed_rows = 0
+            done_mask = np.zeros(num_rows, dtype=bool)
         
-        # 각 행 분석
-        for i, row in enumerate(df.itertuples()):
-            # 텍스트 가져오기
-            text = getattr(row, text_column, "")
-            
-            # 빈 텍스트는 건너뛰기
-            if not text or (isinstance(text, str) and not text.strip()):
-                continue
-            
-            try:
-                # 모델 추론 - 입력 텍스트를 문자열로 변환하여 전달
-                text_str = str(text).strip()
-                with torch.no_grad():
-                    output = model(text_str).cpu().numpy()[0]
-                
-                # 감정 분류 및 강도 계산
-                top_emotion_idx = np.argmax(output)
-                top_emotion = LABELS[top_emotion_idx]
-                top_score = output[top_emotion_idx]
-                top_polarity = POLARITY_MAP.get(top_emotion, '중립')
-                
-                # '없음'을 '무감정'으로 대체
-                if replace_none and top_emotion == "없음":
-                    top_emotion = "무감정"
-                
-                # 인덱스 찾기 (튜플 -> 인덱스)
-                row_idx = row.Index
-                
-                # 감정 분석 결과 저장
-                results_df.at[row_idx, '주요_감정'] = top_emotion
-                results_df.at[row_idx, '감정_강도'] = float(top_score)
-                results_df.at[row_idx, '감정_분류'] = top_polarity
-                
-                # 각 감정별 강도 저장
-                for emotion_idx, emotion in enumerate(LABELS):
-                    results_df.at[row_idx, emotion] = float(output[emotion_idx])
-                
-                # 감정 통계 업데이트
-                emotion_counts[top_emotion] = emotion_counts.get(top_emotion, 0) + 1
-                polarity_counts[top_polarity] = polarity_counts.get(top_polarity, 0) + 1
+        # 체크포인트가 없어도 같은 간격의 구간으로 나누어 구간마다 실시간 통계 갱신
+        ranges = pending_ranges(done_mask, max(1, checkpoint_interval))
+        
+        # 진행 상황 표시 (전체 행 기준 10% 단위)
+        progress_interval = max(1, num_rows // 10)
+        next_report = progress_interval
+        
+        def report_progress(done):
+            nonlocal result_text, next_report
+            if progress_callback is not None:
+                progress_callback(done, num_rows)
+            if done < num_rows:
+                check_cancelled(cancel_event)
+            if done >= next_report or done == num_rows:
+                next_report = (done // progress_interval + 1) * progress_interval
+                progress = done / num_rows * 100
+                elapsed = (datetime.now() - start_time).total_seconds()
+                est_remaining = elapsed / max(1, done - resumed_rows) * (num_rows - done)
+                result_text += f"진행: {progress:.1f}% ({done}/{num_rows}) - 예상 남은 시간: {est_remaining:.1f}초\n"
+        
+        # 감정 점수 계산 (빈 텍스트는 건너뛰기) - 구간마다 체크포인트 저장
+        rows_done = resumed_rows
+        with InferencePool(model, num_workers, batch_size=batch_size) as pool:
+            for range_start, range_stop in ranges:
+                range_rows = range_stop - range_start
+                range_scores, range_analyzed, range_errored, _ = score_rows(
+                    model,
+                    texts[range_start:range_stop],
+                    batch_size=batch_size,
+                    progress_callback=lambda done, total, base=rows_done, size=range_rows:
+                        report_progress(base + round(done / total * size)),
+                    pool=pool
+                )
+                scores[range_start:range_stop] = range_scores
+                analyzed[range_start:range_stop] = range_analyzed
+                errored[range_start:range_stop] = range_errored
+                if checkpoint is not None:
+                    checkpoint.save(range_start, range_scores, range_analyzed, range_errored)
+                done_mask[range_start:range_stop] = True
+                update_live_stats(live_stats, df.iloc[range_start:range_stop], range_scores, range_analyzed,
+                                  range_errored, replace_none)
                 
-                # 진행 상황 표시
-                if (i + 1) % progress_interval == 0 or i + 1 == len(df):
-                    progress = (i + 1) / len(df) * 100
-                    elapsed = (datetime.now() - start_time).total_seconds()
-                    est_remaining = elapsed / (i + 1) * (len(df) - i - 1)
-                    result_text += f"진행: {progress:.1f}% ({i+1}/{len(df)}) - 예상 남은 시간: {est_remaining:.1f}초\n"
-            
-            except Exception as e:
-                print(f"행 {i}({row.Index}) 분석 중 오류: {str(e)}")
-                # 오류 발생 시 빈 값으로 처리
-                row_idx = row.Index
-                results_df.at[row_idx, '주요_감정'] = '오류'
-                results_df.at[row_idx, '감정_강도'] = 0.0
-                results_df.at[row_idx, '감정_분류'] = '중립'
+                rows_done += range_rows
+                report_progress(rows_done)
+        
+        for pos in np.flatnonzero(errored):
+            print(f"행 {pos}({df.index[pos]}) 분석 중 오류 발생")
+        
+        # 결과 데이터프레임 및 감정별 개수
+        with span("결과_조립", len(df)):
+            results_df, polarity_counts, emotion_counts = assemble_result_frame(df, scores, analyzed, errored, replace_none)
         
         # 소요 시간 계산
         elapsed_time = (datetime.now() - start_time).total_seconds()
@@ -139,30 +333,26 @@ def analyze_file(df, text_column, model, file_path=None, date_column=None, id_co
         # 결과 요약
         result_text += f"\n분석 완료!\n"
         result_text += f"소요 시간: {elapsed_time:.2f}초 (평균 {elapsed_time/len(df):.4f}초/항목)\n\n"
+        result_text += format_count_summary(polarity_counts, emotion_counts, len(df))
         
-        # 감정 분류별 통계
-        result_text += "== 감정 분류별 통계 ==\n"
-        for polarity, count in polarity_counts.items():
-            percent = count / len(df) * 100 if len(df) > 0 else 0
-            result_text += f"{polarity}: {count}개 ({percent:.1f}%)\n"
-        
-        # 상위 감정 통계
-        result_text += "\n== 상위 감정 통계 (상위 5개) ==\n"
-        sorted_emotions = sorted(emotion_counts.items(), key=lambda x: x[1], reverse=True)
-        for emotion, count in sorted_emotions[:5]:
-            percent = count / len(df) * 100 if len(df) > 0 else 0
-            result_text += f"{emotion}: {count}개 ({percent:.1f}%)\n"
-        
-        # 감정 분석 결과 저장
-        saved_path = save_file_analysis_results(results_df, file_info, replace_none)
+        # 감정 분석 결과 저장 (분석 정보는 Parquet 파일에 함께 기록)
+        metadata["소요시간"] = round(elapsed_time, 2)
+        saved_path = save_file_analysis_results(results_df, file_info, replace_none,
+                                                result_format=result_format, metadata=metadata)
         
         if saved_path:
             result_text += f"\n분석 결과가 저장되었습니다: {os.path.basename(saved_path)}\n"
+            # 결과 파일 저장이 끝나면 체크포인트 삭제
+            if checkpoint is not None:
+                checkpoint.remove()
         else:
             result_text += "\n결과 저장에 실패했습니다.\n"
+            if checkpoint is not None:
+                checkpoint.close()
         
         # 분석 결과에 메타데이터 추가
-        results_df._metadata = {'analysis_file_path': saved_path}
+        results_df.attrs.update(metadata)
+        results_df.attrs['analysis_file_path'] = saved_path
         
         # 작업 기록 - 작업 종료 시간 및 추가 정보 기록
         analyze_end_time = datetime.now()
@@ -175,13 +365,62 @@ def analyze_file(df, text_column, model, file_path=None, date_column=None, id_co
             파일명 = "데이터프레임"
         
         # 작업 기록 저장
+        기타정보 = f"소요시간: {소요시간:.2f}초, 긍정: {polarity_counts['긍정']}개, 부정: {polarity_counts['부정']}개, 중립: {polarity_counts['중립']}개"
+        if cache is not None:
+            cache_hits, cache_misses = (after - before for after, before in zip(cache.counts(), cache_counts_before))
+            기타정보 += f", 캐시 적중: {cache_hits}개, 캐시 미적중: {cache_misses}개"
+        if num_workers > 1:
+            기타정보 += f", 추론 프로세스: {num_workers}개"
+        if resumed_rows:
+            기타정보 += f", 이어서 분석: {resumed_rows}행 복원"
+        
+        # 단계별 소요 시간 요약 및 저장
+        result_text += "\n== 단계별 소요 시간 ==\n" + current_instrumentation().format_summary(limit=8) + "\n"
+        dump_job_stats(os.path.splitext(파일명)[0], metadata)
+        
         log_work(
             "파일_감정분석", 
             analyze_start_time, 
             analyze_end_time, 
             분석건수=len(df), 
             파일명=파일명,
-            기타정보=f"소요시간: {소요시간:.2f}초, 긍정: {polarity_counts['긍정']}개, 부정: {polarity_counts['부정']}개, 중립: {polarity_counts['중립']}개"
+            기타정보=기타정보
+        )
+        
+        return results_df, result_text, original_df
+        
+    except AnalysisCancelled:
+        print("사용자 요청으로 파일 분석을 중단합니다.")
+        if checkpoint is not None:
+            checkpoint.close()
+        
+        # 완료된 구간까지의 결과만 저장 (체크포인트가 남아 있어 다시 분석하면 이어서 진행)
+        partial_df = df[done_mask]
+        results_df, polarity_counts, emotion_counts = assemble_result_frame(
+            partial_df, scores[done_mask], analyzed[done_mask], errored[done_mask], replace_none
+        )
+        result_text += f"\n분석이 취소되었습니다. ({len(results_df)}/{num_rows}행 완료)\n\n"
+        saved_path = None
+        if len(results_df):
+            result_text += format_count_summary(polarity_counts, emotion_counts, len(results_df))
+            metadata.update({"분석중단": True, "완료행수": len(results_df)})
+            saved_path = save_file_analysis_results(results_df, file_info, replace_none,
+                                                    result_format=result_format, metadata=metadata)
+            if saved_path:
+                result_text += f"\n부분 분석 결과가 저장되었습니다: {os.path.basename(saved_path)}\n"
+        if checkpoint is not None:
+            result_text += "같은 파일과 컬럼으로 다시 분석하면 완료된 구간 이후부터 이어서 진행합니다.\n"
+        
+        results_df.attrs.update(metadata)
+        results_df.attrs['analysis_file_path'] = saved_path
+        
+        log_work(
+            "파일_감정분석_취소",
+            analyze_start_time,
+            datetime.now(),
+            분석건수=len(results_df),
+            파일명=os.path.basename(file_info) if isinstance(file_info, str) else "데이터프레임",
+            기타정보=f"완료: {len(results_df)}/{num_rows}행"
         )
         
         return results_df, result_text, original_df
@@ -191,6 +430,11 @@ def analyze_file(df, text_column, model, file_path=None, date_column=None, id_co
         print(f"파일 분석 중 오류 발생: {e}")
         print(traceback.format_exc())
         
+        # 체크포인트는 남겨 두어 다음 실행 시 완료된 구간부터 이어서 분석
+        if checkpoint is not None:
+            checkpoint.close()
+            error_msg += "\n완료된 구간은 저장되었으며, 같은 파일과 컬럼으로 다시 분석하면 이어서 진행합니다."
+        
         # 작업 기록 - 오류 발생 시에도 기록
         analyze_end_time = datetime.now()
         log_work(
@@ -203,7 +447,84 @@ def analyze_file(df, text_column, model, file_path=None, date_column=None, id_co
         
         return None, error_msg, None
 
-def save_file_analysis_results(results_df, original_file_path, replace_none=False):
+def result_file_path(original_file_path, ext=csv_ext):
+    """결과 저장 경로 생성 - output 디렉토리의 원본 파일명_감정분석결과_타임스탬프 형식
+    
+    Args:
+        original_file_path: 원본 파일 경로
+        ext (str): 결과 파일 확장자
+        
+    Returns:
+        str: 결과 파일 경로
+    """
+    # output 디렉토리 확인 및 생성
+    output_dir = ensure_output_dir()
+    
+    if isinstance(original_file_path, str) and os.path.exists(original_file_path):
+        base_file_name = os.path.splitext(os.path.basename(original_file_path))[0]
+    else:
+        base_file_name = "분석결과"
+        
+    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    return os.path.join(output_dir, f"{base_file_name}_감정분석결과_{timestamp}{ext}")
+
+def prepare_save_frame(results_df, replace_none=False, verbose=True):
+    """저장용 데이터프레임 준비 (누락된 감정 컬럼 추가, '없음' -> '무감정' 변경)
+    
+    컬럼을 바꿀 필요가 없으면 복사 없이 입력 데이터프레임을 그대로 반환합니다.
+    
+    Args:
+        results_df: 분석 결과 데이터프레임
+        replace_none: '없음'을 '무감정'으로 대체할지 여부
+        verbose: 누락된 감정 컬럼 추가 메시지 출력 여부
+        
+    Returns:
+        pd.DataFrame: 저장용 데이터프레임
+    """
+    # 모든 감정 라벨이 포함되어 있는지 확인하고 추가
+    all_emotions = set(LABELS)
+    if replace_none:
+        # '없음'을 '무감정'으로 대체하는 경우
+        all_emotions.remove('없음')
+        all_emotions.add('무감정')
+    
+    # 현재 감정 컬럼 목록
+    existing_emotions = {col for col in results_df.columns if col in all_emotions or col == ('무감정' if replace_none else '없음')}
+    
+    # 누락된 감정 컬럼 식별
+    missing_emotions = all_emotions - existing_emotions
+    
+    # 변경할 내용이 없으면 복사 없이 그대로 저장
+    if not missing_emotions and not replace_none:
+        return results_df
+    
+    # '없음' 컬럼 제거와 함께 한 번만 복사하고 이후는 제자리에서 수정
+    drop_none = replace_none and "없음" in results_df.columns
+    save_df = results_df.drop(columns=["없음"] if drop_none else [])
+    
+    # 누락된 감정 컬럼 추가 (모두 0으로 초기화)
+    for emotion in missing_emotions:
+        save_df[emotion] = 0.0
+        if verbose:
+            print(f"누락된 감정 컬럼 추가: {emotion}")
+    
+    # '없음'을 '무감정'으로 변경 처리
+    if replace_none:
+        if drop_none:
+            if "무감정" not in save_df.columns:
+                # '없음' 컬럼 값을 '무감정' 컬럼으로 복사
+                save_df["무감정"] = results_df["없음"]
+            else:
+                # 이미 '무감정' 컬럼이 있으면 기존 값과 '없음' 값 중 큰 값 사용
+                save_df["무감정"] = np.maximum(save_df["무감정"], results_df["없음"])
+        
+        # 주요 감정이 '없음'인 경우 '무감정'으로 변경
+        save_df.loc[save_df['주요_감정'] == '없음', '주요_감정'] = '무감정'
+    
+    return save_df
+
+def save_file_analysis_results(results_df, original_file_path, replace_none=False, result_format="csv",
+                               metadata=None):
     """
     파일 분석 결과를 저장
     
@@ -211,68 +532,24 @@ def save_file_analysis_results(results_df, original_file_path, replace_none=Fals
         results_df: 분석 결과 데이터프레임
         original_file_path: 원본 파일 경로
         replace_none: '없음'을 '무감정'으로 대체할지 여부
+        result_format: 결과 파일 형식 ('csv' 또는 'parquet')
+        metadata: 결과 파일에 함께 기록할 분석 정보 (Parquet만 해당)
         
     Returns:
         str: 저장된 파일 경로 또는 None
     """
     try:
-        # output 디렉토리 확인 및 생성
-        output_dir = ensure_output_dir()
-        
         # 결과 저장 경로 설정 - 원본 파일명_타임스탬프 형식
-        if isinstance(original_file_path, str) and os.path.exists(original_file_path):
-            base_file_name = os.path.splitext(os.path.basename(original_file_path))[0]
-        else:
-            base_file_name = "분석결과"
-            
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        result_file_name = f"{base_file_name}_감정분석결과_{timestamp}.csv"
-        default_save_path = os.path.join(output_dir, result_file_name)
+        default_save_path = result_file_path(original_file_path, RESULT_FORMATS.get(result_format, csv_ext))
         
-        # 결과 데이터프레임 복사 (원본 보존)
-        save_df = results_df.copy()
-        
-        # 모든 감정 라벨이 포함되어 있는지 확인하고 추가
-        all_emotions = set(LABELS)
-        if replace_none:
-            # '없음'을 '무감정'으로 대체하는 경우
-            all_emotions.remove('없음')
-            all_emotions.add('무감정')
-        
-        # 현재 감정 컬럼 목록
-        existing_emotions = {col for col in save_df.columns if col in all_emotions or col == ('무감정' if replace_none else '없음')}
-        
-        # 누락된 감정 컬럼 식별
-        missing_emotions = all_emotions - existing_emotions
-        
-        # 누락된 감정 컬럼 추가 (모두 0으로 초기화)
-        for emotion in missing_emotions:
-            save_df[emotion] = 0.0
-            print(f"누락된 감정 컬럼 추가: {emotion}")
-        
-        # '없음'을 '무감정'으로 변경 처리
-        if replace_none:
-            # '없음' 컬럼이 있는 경우 처리
-            if "없음" in save_df.columns:
-                # '없음' 컬럼 값을 '무감정' 컬럼으로 복사
-                if "무감정" not in save_df.columns:
-                    save_df["무감정"] = save_df["없음"]
-                else:
-                    # 이미 '무감정' 컬럼이 있으면 기존 값과 '없음' 값 중 큰 값 사용
-                    save_df["무감정"] = save_df[["무감정", "없음"]].max(axis=1)
-                # '없음' 컬럼 삭제
-                save_df = save_df.drop(columns=["없음"])
-            
-            # 주요 감정이 '없음'인 경우 '무감정'으로 변경
-            save_df.loc[save_df['주요_감정'] == '없음', '주요_감정'] = '무감정'
+        # 저장용 데이터프레임 (변경이 필요할 때만 복사)
+        save_df = prepare_save_frame(results_df, replace_none)
         
         # 결과 저장 (직접 지정된 경로에 저장)
-        save_df.to_csv(default_save_path, index=False, encoding='utf-8-sig')
+        with span("결과_저장", len(save_df)):
+            write_result_file(save_df, default_save_path, metadata)
         print(f"분석 결과가 저장되었습니다: {default_save_path}")
-        print(f"저장된 감정 컬럼 수: {len(all_emotions)}, 컬럼 목록: {', '.join(sorted(save_df.columns))}")
-        
-        # 메타데이터에 파일 경로 추가
-        save_df._metadata = {"analysis_file_path": default_save_path}
+        print(f"저장된 감정 컬럼 수: {len(LABELS)}, 컬럼 목록: {', '.join(sorted(save_df.columns))}")
         
         return default_save_path
         
@@ -281,12 +558,13 @@ def save_file_analysis_results(results_df, original_file_path, replace_none=Fals
         print(traceback.format_exc())
         return None
 
-def load_file(file_path=None):
+def load_file(file_path=None, nrows=None):
     """
     파일을 로드하고 데이터프레임으로 반환
     
     Args:
         file_path (str, optional): 파일 경로, None이면 파일 선택 대화상자 표시
+        nrows (int, optional): 읽을 최대 행 수 (스트리밍 분석용 미리보기), None이면 전체
         
     Returns:
         tuple: (로드된 데이터프레임, 파일 정보 문자열)
@@ -314,15 +592,16 @@ def load_file(file_path=None):
         file_ext = file_ext.lower()
         
         # 파일 로드
+        read_start = time.perf_counter()
         if file_ext == '.csv':
             # CSV 파일
             try:
-                df = pd.read_csv(file_path, encoding='utf-8-sig')
+                df = pd.read_csv(file_path, encoding='utf-8-sig', nrows=nrows)
             except:
-                df = pd.read_csv(file_path, encoding='cp949')
+                df = pd.read_csv(file_path, encoding='cp949', nrows=nrows)
         elif file_ext in ['.xlsx', '.xls']:
             # Excel 파일
-            df = pd.read_excel(file_path)
+            df = pd.read_excel(file_path, nrows=nrows)
         elif file_ext == '.txt':
             # 텍스트 파일
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -337,12 +616,14 @@ def load_file(file_path=None):
         else:
             return None, f"지원되지 않는 파일 형식입니다: {file_ext}"
         
+        current_instrumentation().record("파일_읽기", time.perf_counter() - read_start, len(df), read_start)
+        
         # 데이터프레임 메타데이터에 파일 경로 저장
-        df._metadata = {"filepath": file_path}
+        df.attrs["filepath"] = file_path
         
         # 파일 정보 생성
         file_info = f"파일: {os.path.basename(file_path)}\n"
-        file_info += f"행 수: {len(df)}\n"
+        file_info += f"행 수: {len(df)}{' (미리보기)' if nrows is not None else ''}\n"
         file_info += f"열 수: {len(df.columns)}\n"
         file_info += f"열 목록: {', '.join(df.columns.tolist())}\n"
         
@@ -370,6 +651,329 @@ def load_file(file_path=None):
         print(traceback.format_exc())
         return None, error_msg
 
+def detect_csv_encoding(file_path, block_size=1024 * 1024):
+    """CSV 파일 인코딩 확인 (UTF-8 디코딩을 블록 단위로 시도, 실패 시 cp949)
+    
+    Args:
+        file_path (str): CSV 파일 경로
+        block_size (int): 한 번에 읽을 바이트 수
+        
+    Returns:
+        str: 'utf-8-sig' 또는 'cp949'
+    """
+    import codecs
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    try:
+        with open(file_path, 'rb') as f:
+            while True:
+                block = f.read(block_size)
+                decoder.decode(block, final=not block)
+                if not block:
+                    return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+def iter_file_chunks(file_path, chunksize=DEFAULT_CHUNK_ROWS):
+    """데이터 파일을 일정 행 수 단위로 나누어 읽기
+    
+    CSV는 chunksize 행씩 읽어 최대 메모리 사용량이 파일 크기와 무관합니다.
+    Excel은 스트리밍 읽기를 지원하지 않으므로 한 번에 읽은 뒤 나누어 반환합니다.
+    
+    Args:
+        file_path (str): CSV 또는 Excel 파일 경로
+        chunksize (int): 한 번에 읽을 행 수
+        
+    Yields:
+        pd.DataFrame: 행 단위 조각 (인덱스는 파일 전체 기준 행 번호)
+    """
+    _, file_ext = os.path.splitext(file_path)
+    file_ext = file_ext.lower()
+    
+    if file_ext == '.csv':
+        encoding = detect_csv_encoding(file_path)
+        with pd.read_csv(file_path, encoding=encoding, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk
+    elif file_ext in ['.xlsx', '.xls']:
+        df = pd.read_excel(file_path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    else:
+        raise ValueError(f"스트리밍 분석을 지원하지 않는 파일 형식입니다: {file_ext}")
+
+def estimate_row_count(file_path, block_size=1024 * 1024):
+    """진행 상황 표시용 전체 행 수 추정 (CSV는 줄바꿈 수 기준, 따옴표 안의 줄바꿈도 포함될 수 있음)
+    
+    Args:
+        file_path (str): 데이터 파일 경로
+        block_size (int): 한 번에 읽을 바이트 수
+        
+    Returns:
+        int: 추정 행 수 (헤더 제외) 또는 추정할 수 없으면 None
+    """
+    if not file_path.lower().endswith('.csv'):
+        return None
+    try:
+        lines = 0
+        last_block = b""
+        with open(file_path, 'rb') as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                lines += block.count(b"\n")
+                last_block = block
+        # 마지막 줄에 줄바꿈이 없는 경우 포함
+        if last_block and not last_block.endswith(b"\n"):
+            lines += 1
+        return max(0, lines - 1)
+    except OSError:
+        return None
+
+@scoped_job
+@traced("파일_스트리밍_감정분석")
+def analyze_file_streaming(file_path, text_column, model, output_path=None, chunksize=DEFAULT_CHUNK_ROWS,
+                           replace_none=False, batch_size=DEFAULT_BATCH_SIZE, num_workers=1, resume=True,
+                           result_format="csv", progress_callback=None, cancel_event=None, live_stats=None):
+    """
+    대용량 파일을 조각 단위로 읽고 분석하여 결과 파일에 바로 이어 쓰기
+    
+    전체 데이터를 메모리에 올리지 않으므로 최대 메모리 사용량은 조각 크기에 비례합니다.
+    결과는 임시 파일(.part)에 기록한 뒤 완료 시 최종 파일명으로 변경합니다.
+    조각마다 체크포인트를 저장하므로 중단 후 다시 실행하면 분석이 끝난 조각은 추론하지 않습니다.
+    
+    Args:
+        file_path (str): 분석할 CSV 또는 Excel 파일 경로
+        text_column (str): 텍스트 컬럼 이름
+        model: 감정 분석 모델 인스턴스
+        output_path (str, optional): 결과 파일 경로, None이면 output 디렉토리에 생성
+        chunksize (int, optional): 한 번에 읽고 분석할 행 수
+        replace_none (bool, optional): '없음'을 '무감정'으로 대체할지 여부
+        batch_size (int, optional): 한 번의 순전파에 넣을 텍스트 수
+        num_workers (int, optional): 추론 프로세스 수
+        resume (bool, optional): 체크포인트로 중단된 분석 이어가기 여부
+        result_format (str, optional): 결과 파일 형식 ('csv' 또는 'parquet'), output_path가 있으면 확장자로 결정
+        progress_callback (callable, optional): (완료 행 수, 추정 전체 행 수 또는 None)을 받는 진행 상황 콜백
+        cancel_event (threading.Event, optional): 설정되면 분석을 중단하고 완료된 조각까지의 결과 파일 저장
+        live_stats (OnlineEmotionStats, optional): 조각 분석이 끝날 때마다 갱신할 실시간 통계
+        
+    Returns:
+        tuple: (저장된 결과 파일 경로 또는 None, 결과 텍스트)
+    """
+    analyze_start_time = datetime.now()
+    output_path = output_path or result_file_path(file_path, RESULT_FORMATS.get(result_format, csv_ext))
+    part_path = output_path + ".part"
+    
+    # Parquet 결과는 조각마다 행 그룹으로 이어 쓰기 (분석 정보는 파일 스키마에 기록)
+    parquet_writer = None
+    if output_path.lower().endswith(RESULT_FORMATS["parquet"]):
+        parquet_writer = ParquetResultWriter(part_path, metadata={
+            "파일정보": file_path,
+            "분석컬럼": text_column,
+            "분석일시": analyze_start_time.strftime('%Y-%m-%d %H:%M:%S'),
+            "모델": model_identity(model),
+            "감정라벨수": len(LABELS),
+            "조각크기": chunksize
+        })
+    
+    result_text = f"대용량 파일 스트리밍 감정 분석 시작...\n\n"
+    result_text += f"파일: {os.path.basename(file_path)}\n"
+    result_text += f"조각 크기: {chunksize}행\n\n"
+    
+    total_rows = 0
+    resumed_rows = 0
+    polarity_counts = {'긍정': 0, '부정': 0, '중립': 0}
+    emotion_counts = {}
+    # 감정 강도 분위수 스케치 (결과 파일을 다시 읽지 않고 요약하도록 결과 파일 옆에 저장)
+    intensity_sketch = KLLSketch()
+    checkpoint = None
+    pool = InferencePool(model, num_workers, batch_size=batch_size)
+    
+    # 진행 상황 표시용 전체 행 수 (CSV 줄 수 기준 추정)
+    estimated_rows = estimate_row_count(file_path) if progress_callback is not None else None
+    
+    def report_progress(done):
+        if progress_callback is not None:
+            progress_callback(done, max(estimated_rows, done) if estimated_rows is not None else None)
+    
+    try:
+        if resume:
+            try:
+                checkpoint = AnalysisCheckpoint(file_path, text_column, model)
+            except Exception as e:
+                print(f"체크포인트를 사용할 수 없습니다: {e}")
+        
+        for chunk_no, chunk in enumerate(timed_iter("파일_읽기", iter_file_chunks(file_path, chunksize))):
+            check_cancelled(cancel_event)
+            if text_column not in chunk.columns:
+                if checkpoint is not None:
+                    checkpoint.close()
+                # 이미 기록된 조각이 있어도 불완전한 결과이므로 임시 파일 삭제
+                if parquet_writer is not None:
+                    parquet_writer.close()
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                return None, f"텍스트 컬럼 '{text_column}'이 데이터에 존재하지 않습니다."
+            
+            # 체크포인트에 기록된 조각은 저장된 점수 사용, 나머지는 분석 후 기록
+            range_start, range_stop = total_rows, total_rows + len(chunk)
+            restored = checkpoint.load(range_start, range_stop) if checkpoint is not None else None
+            if restored is not None:
+                scores, analyzed, errored = restored
+                resumed_rows += len(chunk)
+            else:
+                def on_chunk_progress(done, total, base=total_rows, size=len(chunk)):
+                    report_progress(base + round(done / total * size))
+                    check_cancelled(cancel_event)
+                
+                scores, analyzed, errored, _ = score_rows(
+                    model, chunk[text_column].tolist(), batch_size=batch_size,
+                    progress_callback=on_chunk_progress, pool=pool
+                )
+                if checkpoint is not None:
+                    checkpoint.save(range_start, scores, analyzed, errored)
+            
+            # 결과 컬럼 결합
+            for pos in np.flatnonzero(errored):
+                print(f"행 {chunk.index[pos]} 분석 중 오류 발생")
+            with span("결과_조립", len(chunk)):
+                chunk_results, chunk_polarity, chunk_emotions = assemble_result_frame(
+                    chunk, scores, analyzed, errored, replace_none
+                )
+                save_df = prepare_save_frame(chunk_results, replace_none, verbose=chunk_no == 0)
+            
+            # 첫 조각은 헤더와 BOM을 포함하여 새로 쓰고, 이후 조각은 이어 쓰기
+            with span("결과_저장", len(save_df)):
+                if parquet_writer is not None:
+                    parquet_writer.write(save_df)
+                elif chunk_no == 0:
+                    save_df.to_csv(part_path, index=False, encoding='utf-8-sig', mode='w')
+                else:
+                    save_df.to_csv(part_path, index=False, encoding='utf-8', mode='a', header=False)
+            
+            # 누적 통계 갱신
+            total_rows += len(chunk)
+            if live_stats is not None:
+                live_stats.update_frame(chunk_results)
+            intensity_sketch.update(chunk_results['감정_강도'].to_numpy(dtype=np.float64))
+            for polarity, count in chunk_polarity.items():
+                polarity_counts[polarity] = polarity_counts.get(polarity, 0) + count
+            for emotion, count in chunk_emotions.items():
+                emotion_counts[emotion] = emotion_counts.get(emotion, 0) + count
+            
+            elapsed = (datetime.now() - analyze_start_time).total_seconds()
+            progress_msg = f"진행: {total_rows}행 분석 완료 ({elapsed:.1f}초 경과)"
+            print(progress_msg)
+            result_text += progress_msg + "\n"
+            report_progress(total_rows)
+            
+            # 조각 결과 해제
+            del scores, chunk_results, save_df
+        
+        if parquet_writer is not None:
+            parquet_writer.close()
+        
+        if total_rows == 0:
+            if checkpoint is not None:
+                checkpoint.remove()
+            return None, "분석할 데이터가 없습니다."
+        
+        os.replace(part_path, output_path)
+        save_result_sketch(output_path, intensity_sketch)
+        
+        # 결과 파일이 완성되면 체크포인트 삭제
+        if checkpoint is not None:
+            checkpoint.remove()
+        if resumed_rows:
+            result_text += f"\n이전 분석 기록에서 {resumed_rows}개 행을 불러왔습니다.\n"
+        
+        # 결과 요약
+        elapsed_time = (datetime.now() - analyze_start_time).total_seconds()
+        result_text += f"\n분석 완료!\n"
+        result_text += f"소요 시간: {elapsed_time:.2f}초 (평균 {elapsed_time/total_rows:.4f}초/항목)\n\n"
+        result_text += format_count_summary(polarity_counts, emotion_counts, total_rows)
+        result_text += "\n== 감정 강도 ==\n" + format_sketch_summary(intensity_sketch)
+        result_text += f"\n분석 결과가 저장되었습니다: {os.path.basename(output_path)}\n"
+        print(f"분석 결과가 저장되었습니다: {output_path}")
+        
+        # 단계별 소요 시간 요약 및 저장
+        result_text += "\n== 단계별 소요 시간 ==\n" + current_instrumentation().format_summary(limit=8) + "\n"
+        dump_job_stats(os.path.splitext(os.path.basename(file_path))[0], {
+            "파일정보": file_path,
+            "전체행수": total_rows,
+            "분석컬럼": text_column,
+            "조각크기": chunksize,
+            "소요시간": round(elapsed_time, 2)
+        })
+        
+        log_work(
+            "파일_스트리밍_감정분석",
+            analyze_start_time,
+            datetime.now(),
+            분석건수=total_rows,
+            파일명=os.path.basename(file_path),
+            기타정보=f"소요시간: {elapsed_time:.2f}초, 조각 크기: {chunksize}행, 긍정: {polarity_counts['긍정']}개, "
+                  f"부정: {polarity_counts['부정']}개, 중립: {polarity_counts['중립']}개"
+        )
+        
+        return output_path, result_text
+        
+    except AnalysisCancelled:
+        print("사용자 요청으로 스트리밍 분석을 중단합니다.")
+        if checkpoint is not None:
+            checkpoint.close()
+        
+        # 완료된 조각까지 기록된 임시 파일을 결과 파일로 보존
+        result_text += f"\n분석이 취소되었습니다. ({total_rows}행 완료)\n"
+        saved_path = None
+        if parquet_writer is not None:
+            parquet_writer.close()
+        if total_rows and os.path.exists(part_path):
+            os.replace(part_path, output_path)
+            save_result_sketch(output_path, intensity_sketch)
+            saved_path = output_path
+            result_text += format_count_summary(polarity_counts, emotion_counts, total_rows)
+            result_text += "\n== 감정 강도 ==\n" + format_sketch_summary(intensity_sketch)
+            result_text += f"\n부분 분석 결과가 저장되었습니다: {os.path.basename(output_path)}\n"
+        if checkpoint is not None:
+            result_text += "같은 파일과 컬럼으로 다시 분석하면 완료된 조각은 건너뛰고 이어서 진행합니다.\n"
+        
+        log_work(
+            "파일_스트리밍_감정분석_취소",
+            analyze_start_time,
+            datetime.now(),
+            분석건수=total_rows,
+            파일명=os.path.basename(file_path),
+            기타정보=f"완료: {total_rows}행, 조각 크기: {chunksize}행"
+        )
+        
+        return saved_path, result_text
+        
+    except Exception as e:
+        error_msg = f"스트리밍 분석 중 오류 발생: {str(e)}"
+        print(error_msg)
+        print(traceback.format_exc())
+        
+        # 체크포인트는 남겨 두어 다음 실행 시 분석이 끝난 조각은 건너뛰기
+        if checkpoint is not None:
+            checkpoint.close()
+            error_msg += "\n완료된 조각은 저장되었으며, 같은 파일과 컬럼으로 다시 분석하면 이어서 진행합니다."
+        
+        log_work(
+            "파일_스트리밍_감정분석_오류",
+            analyze_start_time,
+            datetime.now(),
+            분석건수=total_rows,
+            파일명=os.path.basename(file_path),
+            기타정보=f"오류: {str(e)}"
+        )
+        
+        return None, error_msg
+    finally:
+        pool.close()
+        if parquet_writer is not None:
+            parquet_writer.close()
+
 def analyze_file_data(model, df, text_column, date_column=None, id_column=None, replace_none=False):
     """
     파일 데이터에 대한 감정 분석 수행
@@ -400,128 +1004,39 @@ def analyze_file_data(model, df, text_column, date_column=None, id_column=None,
     # 원본 데이터프레임 복사
     analyzed_df = df.copy()
     
-    # 데이터 분석
-    results = pd.DataFrame(index=range(len(df)))
-    results['텍스트'] = df[text_column].fillna('')
+    # 분석할 텍스트 목록 (결측값은 빈 문자열로 처리)
+    texts = df[text_column].fillna('').astype(str).str.strip().tolist()
     
-    # 모든 감정 종류 리스트 생성
-    all_emotions = LABELS.copy()
+    # 모든 감정 종류 리스트 생성 ('없음'을 '무감정'으로 대체하는 경우 포함)
+    names = label_names(replace_none)
     
-    # '없음'을 '무감정'으로 대체하는 경우
-    if replace_none:
-        all_emotions = [emotion if emotion != '없음' else '무감정' for emotion in all_emotions]
+    # 빈 텍스트를 제외한 행만 배치 추론
+    valid_pos = np.array([i for i, text in enumerate(texts) if text], dtype=np.int64)
+    valid_scores, failed = run_bucketed_inference(model, [texts[i] for i in valid_pos])
     
-    # 빈 감정 목록 초기화 - 모든 감정 점수 컬럼을 0으로 초기화
-    for label in all_emotions:
-        results[label] = 0.0
+    # 전체 행에 대한 감정 점수 행렬
+    scores = np.zeros((len(df), len(LABELS)), dtype=np.float32)
+    scores[valid_pos] = valid_scores
     
-    # 주요 감정 컬럼 추가
-    results['주요_감정'] = ""
-    results['감정_분류'] = ""
-    results['감정_강도'] = 0.0
+    # 빈 텍스트 및 오류 행은 '무감정' 또는 '없음' 1.0으로 설정
+    analyzed = np.zeros(len(df), dtype=bool)
+    analyzed[valid_pos[~failed]] = True
+    for pos in valid_pos[failed]:
+        print(f"행 {df.index[pos]} 분석 중 오류 발생")
     
-    # 빈 텍스트 카운터
-    empty_text_count = 0
-    error_count = 0
+    scores[~analyzed] = 0.0
+    scores[~analyzed, LABELS.index('없음')] = 1.0
     
-    # 각 행 분석
-    for idx, row in df.iterrows():
-        try:
-            text = str(row[text_column]).strip()
-            
-            # 빈 텍스트 처리
-            if not text:
-                empty_text_count += 1
-                
-                # 빈 텍스트의 경우 '무감정' 또는 '없음'으로 설정
-                emotion = "무감정" if replace_none else "없음"
-                polarity = "중립"
-                intensity = 0.0
-                
-                # 결과 저장
-                results.at[idx, '주요_감정'] = emotion
-                results.at[idx, '감정_분류'] = polarity
-                results.at[idx, '감정_강도'] = intensity
-                results.at[idx, emotion] = 1.0
-                continue
-            
-            # 모델 추론 방식 확인 및 감정 추론
-            try:
-                # 예전 모델 호환성 확인: infer 메서드가 있는지 확인
-                if hasattr(model, 'infer') and callable(getattr(model, 'infer')):
-                    # infer 메서드 사용
-                    emotions, intensity = model.infer(text)
-                else:
-                    # forward 메서드 사용 (기존 방식)
-                    with torch.no_grad():
-                        output = model(text).cpu().numpy()[0]
-                    
-                    # 감정 및 점수 맵핑
-                    emotions = dict(zip(LABELS, output))
-                    # 최대 감정 점수를 강도로 사용
-                    intensity = max(output)
-                
-                # 최고 감정 식별
-                if emotions:
-                    # 모든 감정 점수 저장
-                    for emotion, score in emotions.items():
-                        # '없음'을 '무감정'으로 변경
-                        emotion_key = '무감정' if emotion == '없음' and replace_none else emotion
-                        results.at[idx, emotion_key] = score
-                    
-                    # 최대 감정 값과 키 찾기
-                    max_emotion = max(emotions.items(), key=lambda x: x[1])
-                    top_emotion = max_emotion[0]
-                    top_score = max_emotion[1]
-                    
-                    # '없음'을 '무감정'으로 변경
-                    if top_emotion == '없음' and replace_none:
-                        top_emotion = '무감정'
-                    
-                    # 감정 분류 (극성) 결정
-                    polarity = POLARITY_MAP.get(top_emotion, "중립")
-                    
-                    # 결과 저장
-                    results.at[idx, '주요_감정'] = top_emotion
-                    results.at[idx, '감정_분류'] = polarity
-                    results.at[idx, '감정_강도'] = intensity
-                else:
-                    # 감정이 없는 경우 기본값 설정
-                    emotion = "무감정" if replace_none else "없음"
-                    results.at[idx, '주요_감정'] = emotion
-                    results.at[idx, '감정_분류'] = "중립"
-                    results.at[idx, '감정_강도'] = 0.0
-                    results.at[idx, emotion] = 1.0
-            
-            except Exception as e:
-                error_count += 1
-                print(f"행 {idx} 분석 중 오류 발생: {str(e)}")
-                traceback.print_exc()
-                
-                # 오류 시 기본값 설정
-                emotion = "무감정" if replace_none else "없음"
-                results.at[idx, '주요_감정'] = emotion
-                results.at[idx, '감정_분류'] = "중립"
-                results.at[idx, '감정_강도'] = 0.0
-                results.at[idx, emotion] = 1.0
-        
-        except Exception as e:
-            error_count += 1
-            print(f"행 {idx} 분석 중 오류 발생: {str(e)}")
-            traceback.print_exc()
-            
-            # 오류 시 기본값 설정
-            emotion = "무감정" if replace_none else "없음"
-            results.at[idx, '주요_감정'] = emotion
-            results.at[idx, '감정_분류'] = "중립"
-            results.at[idx, '감정_강도'] = 0.0
-            results.at[idx, emotion] = 1.0
+    # 최고 감정 식별 및 감정 분류 (극성) 결정
+    top_idx, intensity, polarity = summarize_scores(scores)
     
-    # 기존 데이터프레임과 결과 합치기
-    results.index = df.index  # 인덱스 맞추기
+    results = pd.DataFrame(scores, index=df.index, columns=list(names))
+    results['주요_감정'] = names[top_idx]
+    results['감정_분류'] = np.where(analyzed, polarity, "중립")
+    results['감정_강도'] = np.where(analyzed, intensity, 0.0)
     
     # 원본 데이터와 결과 데이터 병합
-    merged_results = pd.concat([df, results.drop(columns=['텍스트'])], axis=1)
+    merged_results = pd.concat([df, results], axis=1)
     
     # 결과 저장
     save_path = save_file_analysis_results(merged_results, text_column, replace_none)
@@ -542,6 +1057,7 @@ def analyze_file_data(model, df, text_column, date_column=None, id_column=None,
 
 if __name__ == "__main__":
     # 테스트용 코드
+    import torch
     from KOTE_load import load_model
     
     device = torch.device("cpu")
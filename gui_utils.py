@@ -3,6 +3,8 @@ GUI 유틸리티 함수 모듈
 """
 import os
 import sys
+import threading
+from collections import deque
 import tkinter as tk
 from tkinter import ttk, messagebox
 from configure import resource_path
@@ -36,139 +38,371 @@ def center_window(window, width, height):
     window.geometry(f"{width}x{height}+{x_coordinate}+{y_coordinate}")
 
 
+# 로그 창 갱신 간격 (밀리초) 및 보관할 최대 줄 수
+LOG_FLUSH_INTERVAL_MS = 100
+LOG_MAX_LINES = 2000
+
+# 다음 갱신 전까지 쌓아 둘 최대 메시지 수 (초과 시 오래된 메시지부터 버림)
+LOG_MAX_PENDING = 10000
+
+
 class StdoutRedirector:
-    """표준 출력을 GUI 텍스트 위젯으로 리디렉션하는 클래스"""
-    def __init__(self, text_widget):
+    """표준 출력을 GUI 텍스트 위젯으로 리디렉션하는 클래스
+    
+    print 호출마다 위젯을 갱신하지 않고 메시지를 버퍼에 모은 뒤,
+    Tk 메인 스레드에서 flush_interval 밀리초마다 한 번에 추가합니다.
+    어느 스레드에서 출력해도 안전하며, 위젯에는 최근 max_lines 줄만 유지합니다.
+    """
+    def __init__(self, text_widget, flush_interval=LOG_FLUSH_INTERVAL_MS, max_lines=LOG_MAX_LINES):
         self.text_widget = text_widget
+        self.flush_interval = flush_interval
+        self.max_lines = max_lines
         self._original_stdout = sys.stdout
+        self._pending = deque(maxlen=LOG_MAX_PENDING)
+        self._lock = threading.Lock()
+        self._closed = False
+        
+        # 주기적 갱신 시작 (생성은 메인 스레드에서 수행)
+        self._schedule()
         
     def write(self, message):
-        try:
-            # 위젯이 존재하고 유효한지 확인
-            if self.text_widget and self.text_widget.winfo_exists():
-                self.text_widget.config(state="normal")
-                self.text_widget.insert("end", message)
-                self.text_widget.see("end")
-                self.text_widget.config(state="disabled")
-        except tk.TclError:
-            # 위젯이 소멸된 경우 예외 무시
-            pass
-        except Exception as e:
-            # 다른 예외는 콘솔에만 출력
-            print(f"GUI 출력 오류: {str(e)}")
+        if not message:
+            return
+        with self._lock:
+            self._pending.append(message)
             
         # 원래 stdout에도 출력
-        self._original_stdout.write(message)
+        if self._original_stdout is not None:
+            self._original_stdout.write(message)
         
     def flush(self):
+        # 위젯 갱신은 주기적 갱신에서 처리 (update 호출로 인한 재진입 방지)
+        if self._original_stdout is not None:
+            self._original_stdout.flush()
+    
+    def _schedule(self):
+        """다음 위젯 갱신 예약"""
+        if self._closed:
+            return
         try:
-            # 위젯이 존재하는 경우에만 갱신
-            if self.text_widget and self.text_widget.winfo_exists():
-                self.text_widget.update()
-        except:
-            pass
+            self.text_widget.after(self.flush_interval, self._drain)
+        except (tk.TclError, RuntimeError):
+            # 위젯이 소멸된 경우 갱신 중단
+            self._closed = True
+    
+    def _drain(self):
+        """버퍼에 모인 메시지를 위젯에 한 번에 추가 (메인 스레드)"""
+        with self._lock:
+            messages = list(self._pending)
+            self._pending.clear()
+        
+        if messages:
+            try:
+                # 위젯이 존재하고 유효한지 확인
+                if self.text_widget and self.text_widget.winfo_exists():
+                    self.text_widget.config(state="normal")
+                    self.text_widget.insert("end", "".join(messages))
+                    
+                    # 보관 줄 수 초과분은 앞에서부터 삭제
+                    line_count = int(self.text_widget.index("end-1c").split(".")[0])
+                    if line_count > self.max_lines:
+                        self.text_widget.delete("1.0", f"{line_count - self.max_lines + 1}.0")
+                    
+                    self.text_widget.see("end")
+                    self.text_widget.config(state="disabled")
+            except tk.TclError:
+                # 위젯이 소멸된 경우 예외 무시
+                pass
+            except Exception as e:
+                # 다른 예외는 콘솔에만 출력
+                if self._original_stdout is not None:
+                    self._original_stdout.write(f"GUI 출력 오류: {str(e)}\n")
         
-        # 원래 stdout도 플러시
-        self._original_stdout.flush()
+        self._schedule()
+    
+    def close(self):
+        """남은 메시지를 위젯에 반영하고 주기적 갱신 중단 (메인 스레드에서 호출)"""
+        self._closed = True
+        try:
+            self._drain()
+        except Exception:
+            pass
+
+
+# 컬럼 너비 추정에 사용할 표본 행 수
+TABLE_WIDTH_SAMPLE_ROWS = 200
+
+# 표시 행 수를 계산하기 전 기본 행 수 및 기본 행 높이 (픽셀)
+TABLE_DEFAULT_VISIBLE_ROWS = 20
+TABLE_DEFAULT_ROW_HEIGHT = 20
+TABLE_HEADER_HEIGHT = 25
 
 
 class TableWidget(ttk.Frame):
-    """DataFrame을 테이블로 표시하는 위젯"""
+    """DataFrame을 테이블로 표시하는 위젯
+    
+    화면에 보이는 행만 트리뷰 항목으로 만들고 스크롤 시 해당 구간의 값만 다시 채우므로
+    행 수와 무관하게 빠르게 표시됩니다. 정렬(컬럼 머리글 클릭)과 검색어 필터는
+    위젯이 아닌 pandas/NumPy에서 행 순서 배열을 계산하여 처리합니다.
+    """
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
         self.parent = parent
         self.df = None
+        self._columns = []
+        self._view_index = np.arange(0)  # 정렬/필터가 적용된 표시 순서 (행 위치 배열)
+        self._offset = 0  # 화면 첫 행의 표시 순서 위치
+        self._visible_rows = TABLE_DEFAULT_VISIBLE_ROWS
+        self._row_items = []  # 화면 행에 대응하는 트리뷰 항목 ID
+        self._sort_column = None
+        self._sort_ascending = True
         self.setup_ui()
     
     def setup_ui(self):
         """테이블 UI 설정"""
+        # 검색어 필터 및 행 수 표시
+        filter_frame = ttk.Frame(self)
+        filter_frame.grid(column=0, row=0, columnspan=2, sticky='ew', pady=(0, 2))
+        
+        ttk.Label(filter_frame, text="검색:").pack(side="left", padx=(0, 5))
+        self.filter_var = tk.StringVar()
+        self.filter_entry = ttk.Entry(filter_frame, textvariable=self.filter_var, width=25)
+        self.filter_entry.pack(side="left")
+        self.filter_entry.bind("<Return>", lambda e: self.apply_filter())
+        ttk.Button(filter_frame, text="적용", command=self.apply_filter).pack(side="left", padx=5)
+        
+        self.count_label = ttk.Label(filter_frame, text="")
+        self.count_label.pack(side="right", padx=5)
+        
         # 스크롤바
-        self.vsb = ttk.Scrollbar(self, orient="vertical")
+        self.vsb = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
         self.hsb = ttk.Scrollbar(self, orient="horizontal")
         
-        # 트리뷰 (테이블)
+        # 트리뷰 (테이블) - 세로 스크롤은 트리뷰가 아닌 표시 구간 이동으로 처리
         self.tree = ttk.Treeview(self, 
                                  columns=(), 
                                  show='headings',
-                                 yscrollcommand=self.vsb.set,
                                  xscrollcommand=self.hsb.set)
         
         # 스크롤바 연결
-        self.vsb.config(command=self.tree.yview)
         self.hsb.config(command=self.tree.xview)
         
         # 그리드 배치
-        self.tree.grid(column=0, row=0, sticky='nsew')
-        self.vsb.grid(column=1, row=0, sticky='ns')
-        self.hsb.grid(column=0, row=1, sticky='ew')
+        self.tree.grid(column=0, row=1, sticky='nsew')
+        self.vsb.grid(column=1, row=1, sticky='ns')
+        self.hsb.grid(column=0, row=2, sticky='ew')
         
         # 리사이징 설정
         self.grid_columnconfigure(0, weight=1)
-        self.grid_rowconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        
+        # 태그별 스타일 설정
+        self.tree.tag_configure('odd', background='#ffffff')
+        self.tree.tag_configure('even', background='#f0f0f0')
+        
+        # 크기 변경 및 마우스 휠/키보드 스크롤
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self._scroll_by(-1 if e.delta > 0 else 1, "units", 3))
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-1, "units", 3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(1, "units", 3))
+        self.tree.bind("<Prior>", lambda e: self._scroll_by(-1, "pages"))
+        self.tree.bind("<Next>", lambda e: self._scroll_by(1, "pages"))
+        self.tree.bind("<Home>", lambda e: self._scroll_to(0))
+        self.tree.bind("<End>", lambda e: self._scroll_to(len(self._view_index)))
     
     def _format_value(self, value):
         """표시할 값 형식 변환"""
-        if isinstance(value, float):
+        if isinstance(value, (float, np.floating)):
             # NaN 값 처리
             if np.isnan(value):
                 return ""
             # 소수점 값 처리 (2자리)
             return f"{value:.2f}"
+        if value is None:
+            return ""
         return str(value)
     
     def set_dataframe(self, df):
         """DataFrame 설정 및 테이블 업데이트"""
         self.df = df
+        self._sort_column = None
+        self._sort_ascending = True
+        self.filter_var.set("")
         self._update_table()
     
     def _update_table(self):
-        """테이블 내용 업데이트"""
+        """테이블 컬럼 및 표시 구간 초기화"""
         # 기존 내용 초기화
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        self.tree.delete(*self.tree.get_children())
+        self._row_items = []
+        self._offset = 0
             
         # DataFrame이 없으면 종료
         if self.df is None or self.df.empty:
+            self._view_index = np.arange(0)
+            self.tree["columns"] = ()
+            self._columns = []
+            self._update_count_label()
             return
             
         # 컬럼 설정
-        columns = list(self.df.columns)
-        self.tree["columns"] = columns
+        self._columns = list(self.df.columns)
+        column_ids = [f"c{i}" for i in range(len(self._columns))]
+        self.tree["columns"] = column_ids
         
-        # 컬럼 헤더 설정
-        for col in columns:
-            # 컬럼 ID와 텍스트 설정
-            self.tree.heading(col, text=str(col))
+        # 컬럼 너비는 표본 행으로 추정 (컬럼 이름과 표본 값 중 가장 긴 것의 길이에 맞춤)
+        sample_pos = np.unique(np.linspace(0, len(self.df) - 1, min(len(self.df), TABLE_WIDTH_SAMPLE_ROWS)).astype(int))
+        sample = self.df.iloc[sample_pos].to_numpy(dtype=object)
+        for i, (col, column_id) in enumerate(zip(self._columns, column_ids)):
+            # 컬럼 ID와 텍스트 설정 (머리글 클릭 시 정렬)
+            self.tree.heading(column_id, text=str(col), command=lambda i=i: self.sort_by(i))
             
-            # 컬럼 너비 설정 (컬럼 이름과 값들 중 가장 긴 것의 길이에 맞춤)
-            max_len = max(
-                len(str(col)),
-                *[len(self._format_value(v)) for v in self.df[col].values if v is not None]
-            )
+            max_len = max([len(str(col))] + [len(self._format_value(v)) for v in sample[:, i]])
             # 픽셀 단위로 변환 (대략적인 값)
-            width = max(max_len * 10, 80)  # 최소 너비 80픽셀
-            self.tree.column(col, width=width, minwidth=50)
+            width = min(max(max_len * 10, 80), 400)  # 최소 너비 80픽셀, 최대 400픽셀
+            self.tree.column(column_id, width=width, minwidth=50, stretch=False)
         
-        # 행 추가
-        for i, (_, row) in enumerate(self.df.iterrows()):
-            # 행 데이터 포맷팅
-            values = [self._format_value(row[col]) for col in columns]
-            
+        self._view_index = np.arange(len(self.df))
+        self._render()
+    
+    def sort_by(self, column_pos):
+        """컬럼 기준 정렬 (같은 컬럼을 다시 누르면 역순, 결측값은 항상 마지막)"""
+        if self.df is None or self.df.empty:
+            return
+        
+        if self._sort_column == column_pos:
+            self._sort_ascending = not self._sort_ascending
+        else:
+            self._sort_column = column_pos
+            self._sort_ascending = True
+        
+        self._apply_sort()
+        for i, col in enumerate(self._columns):
+            arrow = (" ▲" if self._sort_ascending else " ▼") if i == column_pos else ""
+            self.tree.heading(f"c{i}", text=f"{col}{arrow}")
+        
+        self._offset = 0
+        self._render()
+    
+    def _apply_sort(self):
+        """현재 표시 순서를 정렬 기준 컬럼으로 안정 정렬"""
+        values = self.df.iloc[self._view_index, self._sort_column].reset_index(drop=True)
+        try:
+            order = values.sort_values(ascending=self._sort_ascending, kind="mergesort", na_position="last")
+        except TypeError:
+            # 숫자와 문자열이 섞인 컬럼은 문자열로 비교
+            order = values.astype(str).sort_values(ascending=self._sort_ascending, kind="mergesort")
+        self._view_index = self._view_index[order.index.to_numpy()]
+    
+    def apply_filter(self, text=None):
+        """검색어가 포함된 행만 표시 (문자열 컬럼 대상, 대소문자 무시)
+        
+        Args:
+            text (str, optional): 검색어, None이면 검색 입력란 값 사용
+        """
+        if self.df is None:
+            return
+        if text is not None:
+            self.filter_var.set(text)
+        text = self.filter_var.get().strip()
+        
+        if not text:
+            mask = np.ones(len(self.df), dtype=bool)
+        else:
+            mask = np.zeros(len(self.df), dtype=bool)
+            for col in self.df.columns:
+                series = self.df[col]
+                if series.dtype == object or isinstance(series.dtype, (pd.StringDtype, pd.CategoricalDtype)):
+                    mask |= series.astype(str).str.contains(text, case=False, regex=False).to_numpy(dtype=bool)
+        
+        self._view_index = np.flatnonzero(mask)
+        
+        # 정렬 상태 유지
+        if self._sort_column is not None:
+            self._apply_sort()
+        
+        self._offset = 0
+        self._render()
+    
+    def _ensure_row_items(self):
+        """화면 행 수에 맞게 트리뷰 항목 개수 조정"""
+        needed = min(self._visible_rows, len(self._view_index))
+        while len(self._row_items) < needed:
+            self._row_items.append(self.tree.insert('', 'end', values=()))
+        while len(self._row_items) > needed:
+            self.tree.delete(self._row_items.pop())
+    
+    def _render(self):
+        """현재 표시 구간의 행 값만 트리뷰 항목에 채우기"""
+        total = len(self._view_index)
+        self._offset = max(0, min(self._offset, total - self._visible_rows))
+        self._ensure_row_items()
+        
+        rows = self._view_index[self._offset:self._offset + len(self._row_items)]
+        values = self.df.iloc[rows].to_numpy(dtype=object) if len(rows) else []
+        for i, (item, row_values) in enumerate(zip(self._row_items, values)):
             # 행 태그 설정 (홀/짝 행 구분)
-            tag = 'odd' if i % 2 == 0 else 'even'
-            
-            # 트리에 행 추가
-            self.tree.insert('', 'end', values=values, tags=(tag,))
-            
-        # 태그별 스타일 설정
-        self.tree.tag_configure('odd', background='#ffffff')
-        self.tree.tag_configure('even', background='#f0f0f0')
+            tag = 'odd' if (self._offset + i) % 2 == 0 else 'even'
+            self.tree.item(item, values=[self._format_value(v) for v in row_values], tags=(tag,))
+        
+        # 스크롤바 위치 갱신
+        if total:
+            self.vsb.set(self._offset / total, min(1.0, (self._offset + len(self._row_items)) / total))
+        else:
+            self.vsb.set(0.0, 1.0)
+        self._update_count_label()
+    
+    def _update_count_label(self):
+        """표시 행 수 / 전체 행 수 표시"""
+        total = 0 if self.df is None else len(self.df)
+        shown = len(self._view_index)
+        if shown == total:
+            self.count_label.config(text=f"{total:,}행")
+        else:
+            self.count_label.config(text=f"{shown:,}/{total:,}행")
+    
+    def _scroll_to(self, offset):
+        """표시 구간 시작 위치 이동"""
+        if self.df is None:
+            return "break"
+        self._offset = int(offset)
+        self._render()
+        return "break"
+    
+    def _scroll_by(self, number, what="units", step=1):
+        """행 또는 페이지 단위로 표시 구간 이동"""
+        amount = number * (self._visible_rows if what == "pages" else step)
+        return self._scroll_to(self._offset + amount)
+    
+    def _on_scrollbar(self, *args):
+        """세로 스크롤바 조작 처리 (moveto 또는 scroll 명령)"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * len(self._view_index))
+        elif args[0] == "scroll":
+            self._scroll_by(int(args[1]), args[2])
+    
+    def _on_resize(self, event):
+        """위젯 높이에 맞게 화면 행 수 재계산"""
+        try:
+            row_height = int(ttk.Style().lookup("Treeview", "rowheight") or TABLE_DEFAULT_ROW_HEIGHT)
+        except (ValueError, tk.TclError):
+            row_height = TABLE_DEFAULT_ROW_HEIGHT
+        visible = max(1, (event.height - TABLE_HEADER_HEIGHT) // row_height)
+        if visible != self._visible_rows:
+            self._visible_rows = visible
+            if self.df is not None:
+                self._render()
     
     def clear(self):
         """테이블 내용 삭제"""
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        self.tree.delete(*self.tree.get_children())
+        self._row_items = []
+        self._view_index = np.arange(0)
+        self._offset = 0
         self.df = None
+        self._update_count_label()
 
 
 def create_labeled_entry(parent, label_text, width=None, row=None, column=None, padx=5, pady=5):
@@ -0,0 +1,202 @@
+"""
+감정 추론 결과 캐시 모듈
+
+정규화된 텍스트와 모델 파일 지문(fingerprint)으로 키를 만들어
+메모리 LRU와 SQLite 디스크 저장소 두 단계에 감정 점수를 보관합니다.
+"""
+import os
+import re
+import hashlib
+import sqlite3
+import threading
+import traceback
+import unicodedata
+from collections import OrderedDict
+import numpy as np
+
+from configure import LABELS, resource_path
+
+# 디스크 캐시 파일명 (모델 캐시 디렉토리에 생성)
+CACHE_DB_NAME = "kote_inference_cache.sqlite3"
+
+# 메모리 LRU에 보관할 최대 항목 수
+DEFAULT_MEMORY_ENTRIES = 100000
+
+# SQLite IN 절 하나에 넣을 최대 키 수
+_SQL_CHUNK = 500
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """캐시 키 및 모델 입력용 텍스트 정규화 (유니코드 NFC, 공백 정리)
+
+    Args:
+        text: 정규화할 텍스트
+
+    Returns:
+        str: 정규화된 텍스트
+    """
+    if text is None:
+        return ""
+    text = unicodedata.normalize("NFC", str(text))
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def model_fingerprint(model_path, sample_size=1024 * 1024):
+    """모델 파일 지문 계산 (파일 크기와 앞/뒤 일부 내용의 해시)
+
+    Args:
+        model_path (str): 모델 파일 경로
+        sample_size (int): 앞/뒤에서 읽을 바이트 수
+
+    Returns:
+        str: 모델 지문 문자열
+    """
+    size = os.path.getsize(model_path)
+    digest = hashlib.sha1(str(size).encode("utf-8"))
+    with open(model_path, "rb") as f:
+        digest.update(f.read(sample_size))
+        if size > sample_size:
+            f.seek(max(sample_size, size - sample_size))
+            digest.update(f.read(sample_size))
+    return digest.hexdigest()
+
+
+class InferenceCache:
+    """메모리 LRU + SQLite 2단계 감정 점수 캐시 클래스"""
+
+    def __init__(self, fingerprint, db_path=None, max_entries=DEFAULT_MEMORY_ENTRIES):
+        """캐시 초기화
+
+        Args:
+            fingerprint (str): 모델 지문 (키에 포함되어 모델이 바뀌면 다른 항목 사용)
+            db_path (str, optional): SQLite 파일 경로, None이면 모델 캐시 디렉토리 사용
+            max_entries (int): 메모리 LRU 최대 항목 수
+        """
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if db_path is None:
+            cache_dir = resource_path('model_cache')
+            os.makedirs(cache_dir, exist_ok=True)
+            db_path = os.path.join(cache_dir, CACHE_DB_NAME)
+        self.db_path = db_path
+
+        try:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, scores BLOB NOT NULL) WITHOUT ROWID"
+            )
+            self._conn.commit()
+        except Exception as e:
+            # 디스크 캐시를 사용할 수 없으면 메모리 캐시만 사용
+            print(f"디스크 캐시를 열 수 없어 메모리 캐시만 사용합니다: {e}")
+            self._conn = None
+
+    def _key(self, text):
+        """정규화된 텍스트와 모델 지문으로 캐시 키 생성"""
+        return hashlib.sha1(f"{self.fingerprint}\0{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key, scores):
+        """메모리 LRU에 항목 추가 (최대 크기 초과 시 오래된 항목 제거)"""
+        self._memory[key] = scores
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts):
+        """여러 텍스트의 캐시된 감정 점수 조회
+
+        Args:
+            texts (list): 정규화된 텍스트 목록
+
+        Returns:
+            tuple: ((n, 44) float32 점수 행렬, (n,) 적중 여부 배열)
+        """
+        scores = np.zeros((len(texts), len(LABELS)), dtype=np.float32)
+        found = np.zeros(len(texts), dtype=bool)
+        keys = [self._key(text) for text in texts]
+
+        with self._lock:
+            # 1단계: 메모리 LRU
+            disk_lookup = {}
+            for i, key in enumerate(keys):
+                cached = self._memory.get(key)
+                if cached is not None:
+                    self._memory.move_to_end(key)
+                    scores[i] = cached
+                    found[i] = True
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+
+            # 2단계: SQLite 디스크 저장소
+            if disk_lookup and self._conn is not None:
+                try:
+                    pending = list(disk_lookup)
+                    for start in range(0, len(pending), _SQL_CHUNK):
+                        chunk = pending[start:start + _SQL_CHUNK]
+                        placeholders = ",".join("?" * len(chunk))
+                        rows = self._conn.execute(
+                            f"SELECT key, scores FROM scores WHERE key IN ({placeholders})", chunk
+                        ).fetchall()
+                        for key, blob in rows:
+                            cached = np.frombuffer(blob, dtype=np.float32).copy()
+                            self._remember(key, cached)
+                            for i in disk_lookup[key]:
+                                scores[i] = cached
+                                found[i] = True
+                except Exception as e:
+                    print(f"디스크 캐시 조회 중 오류 발생: {e}")
+
+            hit_count = int(found.sum())
+            self.hits += hit_count
+            self.misses += len(texts) - hit_count
+
+        return scores, found
+
+    def put_many(self, texts, scores):
+        """여러 텍스트의 감정 점수를 캐시에 저장
+
+        Args:
+            texts (list): 정규화된 텍스트 목록
+            scores (np.ndarray): (n, 44) 감정 점수 행렬
+        """
+        if len(texts) == 0:
+            return
+
+        scores = np.asarray(scores, dtype=np.float32)
+        rows = []
+        with self._lock:
+            for text, row in zip(texts, scores):
+                key = self._key(text)
+                row = row.copy()
+                self._remember(key, row)
+                rows.append((key, row.tobytes()))
+
+            if self._conn is not None:
+                try:
+                    self._conn.executemany("INSERT OR REPLACE INTO scores (key, scores) VALUES (?, ?)", rows)
+                    self._conn.commit()
+                except Exception as e:
+                    print(f"디스크 캐시 저장 중 오류 발생: {e}")
+                    print(traceback.format_exc())
+
+    def counts(self):
+        """현재까지의 (적중, 미적중) 횟수 반환"""
+        return self.hits, self.misses
+
+    def close(self):
+        """디스크 저장소 연결 종료"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
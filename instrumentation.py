@@ -0,0 +1,256 @@
+"""
+분석 파이프라인 단계별 성능 측정 모듈
+
+파일 읽기, 텍스트 정규화, 토큰화, 인코더 순전파, 분류기/시그모이드, 결과 조립,
+결과 저장 등 각 단계를 구간(span)으로 감싸 호출 횟수, 누적 시간과
+p50/p95/p99 지연 시간을 집계합니다.
+
+파일 분석 작업은 scoped_job으로 감싸 작업마다 새 수집기를 사용하므로, 작업 사이에 실행된
+텍스트 분석, 파일 읽기, 모델 워밍업 등의 구간은 다음 작업의 통계에 섞이지 않습니다.
+작업 범위 밖의 구간은 프로그램 전체에서 공유하는 INSTRUMENTATION에 기록됩니다.
+
+사용 예:
+    from instrumentation import span, job_scope
+
+    with job_scope() as stats:
+        with span("토큰화"):
+            encoding = tokenizer(texts)
+
+    print(stats.summary())
+"""
+import os
+import json
+import time
+import random
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+# 단계별로 보관할 최대 측정값 수 (초과 시 저장소 표본 추출로 분위수 추정)
+MAX_SAMPLES = 10000
+
+
+class StageStats:
+    """단계 하나의 측정 통계 클래스"""
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.items = 0
+        self.max_samples = max_samples
+        self._samples = []
+
+    def add(self, seconds, items=None):
+        """측정값 하나 추가
+
+        Args:
+            seconds (float): 소요 시간(초)
+            items (int, optional): 구간에서 처리한 항목 수 (예: 배치 크기)
+        """
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if items is not None:
+            self.items += items
+
+        # 저장소 표본 추출 (reservoir sampling)
+        if len(self._samples) < self.max_samples:
+            self._samples.append(seconds)
+        else:
+            slot = random.randrange(self.count)
+            if slot < self.max_samples:
+                self._samples[slot] = seconds
+
+    def summary(self):
+        """통계 요약 사전 반환 (시간 단위: 초)"""
+        p50, p95, p99 = np.percentile(self._samples, [50, 95, 99]) if self._samples else (0.0, 0.0, 0.0)
+        result = {
+            "횟수": self.count,
+            "누적": round(self.total, 6),
+            "평균": round(self.total / self.count, 6) if self.count else 0.0,
+            "p50": round(float(p50), 6),
+            "p95": round(float(p95), 6),
+            "p99": round(float(p99), 6),
+            "최대": round(self.max, 6)
+        }
+        if self.items:
+            result["항목수"] = self.items
+        return result
+
+
+class Instrumentation:
+    """단계별 성능 측정 수집 클래스 (여러 스레드에서 동시에 사용 가능)"""
+
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def record(self, name, seconds, items=None, start=None):
+        """측정값 직접 기록
+
+        Args:
+            name (str): 단계 이름
+            seconds (float): 소요 시간(초)
+            items (int, optional): 처리한 항목 수
+            start (float, optional): 시작 시각 (time.perf_counter 기준)
+        """
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = StageStats()
+            stats.add(seconds, items)
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            listener(name, time.perf_counter() - seconds if start is None else start, seconds, items)
+
+    @contextmanager
+    def span(self, name, items=None):
+        """with 블록의 소요 시간을 단계 이름으로 기록
+
+        Args:
+            name (str): 단계 이름
+            items (int, optional): 블록에서 처리하는 항목 수
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, items, start)
+
+    def add_listener(self, listener):
+        """구간 종료 시 호출할 함수 등록 (단계 이름, 시작 시각, 소요 시간, 항목 수)"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """등록한 구간 종료 함수 해제"""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def reset(self):
+        """모든 측정값 초기화"""
+        with self._lock:
+            self._stages = {}
+
+    def summary(self):
+        """단계별 통계 요약 (누적 시간이 큰 순서)
+
+        Returns:
+            dict: 단계 이름 -> 통계 사전
+        """
+        with self._lock:
+            items = [(name, stats.summary()) for name, stats in self._stages.items()]
+        return dict(sorted(items, key=lambda item: item[1]["누적"], reverse=True))
+
+    def format_summary(self, limit=None):
+        """단계별 통계 요약 텍스트 (결과 표시용)"""
+        lines = []
+        for name, stats in list(self.summary().items())[:limit]:
+            lines.append(
+                f"{name}: {stats['횟수']}회, 누적 {stats['누적']:.2f}초, "
+                f"p50 {stats['p50'] * 1000:.1f}ms, p95 {stats['p95'] * 1000:.1f}ms, p99 {stats['p99'] * 1000:.1f}ms"
+            )
+        return "\n".join(lines)
+
+    def dump_json(self, file_path, job_info=None):
+        """단계별 통계를 JSON 파일로 저장
+
+        Args:
+            file_path (str): 저장 경로
+            job_info (dict, optional): 함께 기록할 작업 정보
+
+        Returns:
+            str: 저장된 파일 경로
+        """
+        payload = {
+            "기록시각": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "작업정보": job_info or {},
+            "단계별_통계": self.summary()
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2, default=str)
+        return file_path
+
+
+# 프로그램 전체에서 공유하는 측정 수집기 (작업 범위 밖의 구간 기록)
+INSTRUMENTATION = Instrumentation()
+
+# 현재 실행 흐름(스레드/컨텍스트)에서 진행 중인 작업의 측정 수집기
+_active_instrumentation = contextvars.ContextVar("active_instrumentation", default=None)
+
+
+def current_instrumentation():
+    """현재 작업의 측정 수집기 (작업 범위 밖이면 공유 수집기)"""
+    active = _active_instrumentation.get()
+    return INSTRUMENTATION if active is None else active
+
+
+@contextmanager
+def job_scope():
+    """with 블록 동안 현재 실행 흐름의 구간을 새 측정 수집기에 기록
+
+    Yields:
+        Instrumentation: 작업 전용 측정 수집기
+    """
+    instrumentation = Instrumentation()
+    token = _active_instrumentation.set(instrumentation)
+    try:
+        yield instrumentation
+    finally:
+        _active_instrumentation.reset(token)
+
+
+def scoped_job(func):
+    """함수 실행 전체를 job_scope로 감싸는 데코레이터 (추적 데코레이터보다 바깥에 적용)"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with job_scope():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def span(name, items=None):
+    """현재 작업의 측정 수집기에 단계 구간 기록 (with 문에서 사용)"""
+    return current_instrumentation().span(name, items)
+
+
+def timed_iter(name, iterable):
+    """반복자의 다음 항목을 가져오는 시간을 단계 이름으로 기록 (파일 조각 읽기 등)"""
+    iterator = iter(iterable)
+    while True:
+        with span(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def dump_job_stats(job_name, job_info=None):
+    """작업 종료 후 현재 작업의 단계별 통계를 output/성능측정 폴더에 JSON으로 저장
+
+    Args:
+        job_name (str): 작업 이름 (파일명에 사용)
+        job_info (dict, optional): 함께 기록할 작업 정보
+
+    Returns:
+        str: 저장된 파일 경로 또는 실패 시 None
+    """
+    from configure import ensure_output_dir
+
+    try:
+        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+        file_path = os.path.join(ensure_output_dir(), "성능측정", f"{job_name}_성능측정_{timestamp}.json")
+        return current_instrumentation().dump_json(file_path, job_info)
+    except Exception as e:
+        print(f"성능 측정 결과 저장 중 오류 발생: {e}")
+        return None
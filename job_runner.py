@@ -0,0 +1,128 @@
+"""
+GUI 백그라운드 작업 실행 모듈
+
+파일 분석처럼 오래 걸리는 작업을 작업 스레드에서 실행하고, 진행 상황(완료 행 수,
+초당 처리 행 수, 예상 남은 시간)과 완료 결과를 스레드 안전한 큐로 전달하여
+Tk 메인 스레드가 after 폴링으로 화면을 갱신하도록 합니다.
+작업 함수는 progress_callback과 cancel_event 키워드 인자를 받아야 합니다.
+"""
+import time
+import queue
+import threading
+import traceback
+from collections import namedtuple
+
+# 진행 상황 (완료 수, 전체 수 또는 None, 초당 처리 수, 예상 남은 시간(초) 또는 None, 경과 시간(초))
+JobProgress = namedtuple("JobProgress", ["done", "total", "rate", "eta", "elapsed"])
+
+
+def format_duration(seconds):
+    """초 단위 시간을 'H시간 M분 S초' 형식 문자열로 변환"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}시간 {minutes}분 {seconds}초"
+    if minutes:
+        return f"{minutes}분 {seconds}초"
+    return f"{seconds}초"
+
+
+class JobRunner:
+    """Tk 메인 스레드를 막지 않고 작업 스레드에서 작업 하나를 실행하는 클래스"""
+
+    def __init__(self, widget, on_progress=None, on_finish=None, poll_interval=100):
+        """작업 실행기 설정
+
+        Args:
+            widget: after 폴링에 사용할 Tk 위젯
+            on_progress (callable, optional): JobProgress를 받는 진행 상황 콜백 (메인 스레드에서 호출)
+            on_finish (callable, optional): (결과, 오류, 취소 여부)를 받는 완료 콜백 (메인 스레드에서 호출)
+            poll_interval (int): 큐 확인 간격 (밀리초)
+        """
+        self.widget = widget
+        self.on_progress = on_progress
+        self.on_finish = on_finish
+        self.poll_interval = poll_interval
+        self.cancel_event = threading.Event()
+        self._events = queue.Queue()
+        self._thread = None
+        self._start_time = None
+        self._base_done = None
+
+    @property
+    def running(self):
+        """작업 실행 중 여부"""
+        return self._thread is not None
+
+    def start(self, func, *args, **kwargs):
+        """작업 스레드에서 func(*args, progress_callback=..., cancel_event=..., **kwargs) 실행
+
+        Returns:
+            bool: 작업 시작 여부 (이미 실행 중이면 False)
+        """
+        if self.running:
+            return False
+
+        self.cancel_event.clear()
+        self._events = queue.Queue()
+        self._start_time = time.perf_counter()
+        self._base_done = None
+        self._thread = threading.Thread(target=self._run, args=(func, args, kwargs), daemon=True)
+        self._thread.start()
+        self.widget.after(self.poll_interval, self._poll)
+        return True
+
+    def cancel(self):
+        """작업 취소 요청 (작업 함수가 다음 확인 지점에서 완료된 부분까지 정리 후 종료)"""
+        if self.running:
+            self.cancel_event.set()
+
+    def _report(self, done, total=None):
+        """작업 스레드: 진행 상황 전달"""
+        self._events.put(("progress", done, total, time.perf_counter()))
+
+    def _run(self, func, args, kwargs):
+        """작업 스레드: 작업 실행 후 결과 또는 오류 전달"""
+        try:
+            result = func(*args, progress_callback=self._report, cancel_event=self.cancel_event, **kwargs)
+            self._events.put(("done", result, None))
+        except Exception as e:
+            print(f"작업 실행 중 오류 발생: {str(e)}")
+            print(traceback.format_exc())
+            self._events.put(("done", None, e))
+
+    def _progress(self, done, total, now):
+        """진행 상황 계산 (처리 속도는 첫 보고 이후 처리량 기준, 이어서 분석한 행 제외)"""
+        if self._base_done is None:
+            self._base_done = done
+        elapsed = now - self._start_time
+        rate = (done - self._base_done) / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if total is not None and rate > 0 else None
+        return JobProgress(done, total, rate, eta, elapsed)
+
+    def _poll(self):
+        """메인 스레드: 큐에 쌓인 이벤트 처리 (진행 상황은 마지막 값만 반영)"""
+        latest = None
+        finished = None
+        try:
+            while True:
+                event = self._events.get_nowait()
+                if event[0] == "progress":
+                    latest = event
+                else:
+                    finished = event
+        except queue.Empty:
+            pass
+
+        if latest is not None and self.on_progress is not None:
+            self.on_progress(self._progress(*latest[1:]))
+
+        if finished is None:
+            self.widget.after(self.poll_interval, self._poll)
+            return
+
+        self._thread = None
+        _, result, error = finished
+        if self.on_finish is not None:
+            self.on_finish(result, error, self.cancel_event.is_set())
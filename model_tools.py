@@ -0,0 +1,176 @@
+"""
+감정 분석 모델 점검 및 변환 도구 모듈
+
+사용 예:
+    python model_tools.py quant-check kote_pytorch_lightning.bin 설문.csv 의견 --limit 2000
+    python model_tools.py export-onnx kote_pytorch_lightning.bin model_files/kote.onnx
+    python model_tools.py compile kote_pytorch_lightning.bin
+"""
+import os
+import io
+import sys
+import copy
+import time
+import argparse
+import traceback
+import numpy as np
+import pandas as pd
+
+from configure import setup_device, log_work, init_config
+from batch_inference import run_bucketed_inference, summarize_scores, DEFAULT_BATCH_SIZE
+from onnx_backend import DEFAULT_OPSET
+
+
+def _state_dict_size_mb(model):
+    """모델 가중치를 직렬화했을 때의 크기(MB) 계산"""
+    import torch
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+
+def compare_quantized(fp32_model, int8_model, texts, batch_size=DEFAULT_BATCH_SIZE):
+    """FP32 모델과 INT8 양자화 모델의 결과 일치율 및 처리 속도 비교
+
+    Args:
+        fp32_model: 원본 FP32 모델 인스턴스
+        int8_model: 양자화된 모델 인스턴스
+        texts (list): 비교에 사용할 텍스트 목록
+        batch_size (int): 배치 크기
+
+    Returns:
+        dict: 비교 결과 (일치율, 처리 시간, 모델 크기 등)
+    """
+    results = {}
+    scores = {}
+    for name, model in (('fp32', fp32_model), ('int8', int8_model)):
+        start_time = time.time()
+        scores[name], _ = run_bucketed_inference(model, texts, batch_size=batch_size)
+        results[f'{name}_초'] = time.time() - start_time
+        results[f'{name}_크기(MB)'] = _state_dict_size_mb(model)
+
+    fp32_top, _, fp32_polarity = summarize_scores(scores['fp32'])
+    int8_top, _, int8_polarity = summarize_scores(scores['int8'])
+
+    results['건수'] = len(texts)
+    results['주요감정_일치율(%)'] = float(np.mean(fp32_top == int8_top) * 100) if len(texts) else 0.0
+    results['감정분류_일치율(%)'] = float(np.mean(fp32_polarity == int8_polarity) * 100) if len(texts) else 0.0
+    results['평균_절대오차'] = float(np.abs(scores['fp32'] - scores['int8']).mean()) if len(texts) else 0.0
+    results['속도_향상(배)'] = results['fp32_초'] / results['int8_초'] if results['int8_초'] > 0 else 0.0
+    return results
+
+
+def run_quant_check(args):
+    """INT8 양자화 일치율 점검 명령 실행"""
+    from KOTE_load import load_custom_model, quantize_model
+    from file_SentimentAnalysis import load_file
+
+    start_time = time.time()
+    df, file_info = load_file(args.data_file)
+    if not isinstance(df, pd.DataFrame):
+        print(f"데이터 파일을 불러올 수 없습니다: {file_info}")
+        return 1
+    if args.column not in df.columns:
+        print(f"컬럼 '{args.column}'이 데이터에 존재하지 않습니다.")
+        return 1
+
+    texts = df[args.column].dropna().astype(str).str.strip()
+    texts = texts[texts != ""].head(args.limit).tolist()
+
+    device = setup_device()
+    fp32_model = load_custom_model(args.model_path, device, use_cache=False)
+    int8_model = quantize_model(copy.deepcopy(fp32_model))
+
+    results = compare_quantized(fp32_model, int8_model, texts, batch_size=args.batch_size)
+
+    print("\n== INT8 양자화 점검 결과 ==")
+    for key, value in results.items():
+        print(f"{key}: {value:.4f}" if isinstance(value, float) else f"{key}: {value}")
+
+    log_work(
+        "양자화_일치율_점검",
+        start_time,
+        time.time(),
+        분석건수=results['건수'],
+        파일명=os.path.basename(args.data_file),
+        기타정보=(f"주요감정 일치율: {results['주요감정_일치율(%)']:.2f}%, "
+              f"감정분류 일치율: {results['감정분류_일치율(%)']:.2f}%, "
+              f"속도 향상: {results['속도_향상(배)']:.2f}배")
+    )
+    return 0
+
+
+def run_export_onnx(args):
+    """ONNX 내보내기 명령 실행"""
+    from KOTE_load import load_custom_model
+    from onnx_backend import export_onnx
+
+    start_time = time.time()
+    device = setup_device()
+    model = load_custom_model(args.model_path, device, use_cache=False)
+    model.eval()
+
+    output_path = export_onnx(model, args.output_path, opset_version=args.opset)
+
+    log_work("ONNX_내보내기", start_time, time.time(), 파일명=os.path.basename(output_path))
+    return 0
+
+
+def run_compile(args):
+    """배포용 단일 모델 파일 생성 명령 실행"""
+    from KOTE_load import load_custom_model, save_deploy_artifact, DEPLOY_ARTIFACT_NAME
+    from configure import resource_path
+
+    start_time = time.time()
+    device = setup_device()
+    model = load_custom_model(args.model_path, device, use_cache=False)
+
+    output_path = args.output_path or resource_path(DEPLOY_ARTIFACT_NAME)
+    save_deploy_artifact(model, output_path, source_path=args.model_path)
+
+    log_work("배포용_모델_생성", start_time, time.time(), 파일명=os.path.basename(output_path))
+    return 0
+
+
+def build_parser():
+    """명령행 인자 파서 생성"""
+    parser = argparse.ArgumentParser(description="감정 분석 모델 점검 및 변환 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    quant_parser = subparsers.add_parser("quant-check", help="INT8 양자화 모델과 FP32 모델의 결과 일치율 점검")
+    quant_parser.add_argument("model_path", help="KOTE 모델 파일 경로 (.bin)")
+    quant_parser.add_argument("data_file", help="비교에 사용할 CSV/Excel 파일")
+    quant_parser.add_argument("column", help="텍스트 컬럼 이름")
+    quant_parser.add_argument("--limit", type=int, default=1000, help="비교할 최대 행 수")
+    quant_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="배치 크기")
+    quant_parser.set_defaults(func=run_quant_check)
+
+    onnx_parser = subparsers.add_parser("export-onnx", help="모델을 ONNX 그래프로 내보내기 (가변 배치/시퀀스 축)")
+    onnx_parser.add_argument("model_path", help="KOTE 모델 파일 경로 (.bin)")
+    onnx_parser.add_argument("output_path", help="저장할 ONNX 파일 경로 (.onnx)")
+    onnx_parser.add_argument("--opset", type=int, default=DEFAULT_OPSET, help="ONNX opset 버전")
+    onnx_parser.set_defaults(func=run_export_onnx)
+
+    compile_parser = subparsers.add_parser("compile", help="설정/토크나이저/가중치를 담은 배포용 단일 모델 파일 생성")
+    compile_parser.add_argument("model_path", help="KOTE 모델 파일 경로 (.bin)")
+    compile_parser.add_argument("output_path", nargs="?", default=None,
+                                help="저장할 파일 경로 (기본값: 프로그램 폴더의 kote_deploy.safetensors)")
+    compile_parser.set_defaults(func=run_compile)
+
+    return parser
+
+
+def main(argv=None):
+    """도구 실행 함수"""
+    args = build_parser().parse_args(argv)
+    init_config()
+    try:
+        return args.func(args)
+    except Exception as e:
+        print(f"도구 실행 중 오류 발생: {str(e)}")
+        print(traceback.format_exc())
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
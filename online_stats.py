@@ -0,0 +1,205 @@
+"""
+실시간(온라인) 감정 통계 모듈
+
+파일 분석 중 구간/조각 결과가 나올 때마다 누적하여 감정 분류별/주요 감정별 개수,
+감정_강도의 평균과 분산(Welford 방식), 감정별 평균 점수(결측 점수 제외)를 유지합니다.
+그룹 컬럼을 지정하면 그룹 값별로 같은 통계를 함께 누적합니다.
+분석 스레드가 갱신하고 GUI 메인 스레드가 읽으므로 모든 접근은 잠금으로 보호합니다.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from configure import LABELS
+
+# 감정 점수 컬럼 ('없음' 대신 '무감정'을 사용한 결과 포함)
+SCORE_COLUMNS = LABELS + ['무감정']
+
+
+class RunningMoments:
+    """개수, 평균, 분산을 한 번의 통과로 누적하는 클래스 (Welford / Chan 병합)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values):
+        """값 배열 하나를 누적 (결측값 제외)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        batch_mean = values.mean()
+        batch_m2 = float(((values - batch_mean) ** 2).sum())
+        self._merge(len(values), batch_mean, batch_m2)
+
+    def merge(self, other):
+        """다른 누적 결과 병합"""
+        if other.count:
+            self._merge(other.count, other.mean, other.m2)
+
+    def _merge(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self):
+        """표본 분산 (ddof=1, 값이 2개 미만이면 NaN)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std(self):
+        """표본 표준편차"""
+        return float(np.sqrt(self.variance))
+
+
+class _EmotionAccumulator:
+    """통계 단위(전체 또는 그룹 하나)별 누적 값"""
+
+    def __init__(self, num_scores):
+        self.rows = 0
+        self.polarity_counts = {}
+        self.emotion_counts = {}
+        self.intensity = RunningMoments()
+        self.score_sums = np.zeros(num_scores, dtype=np.float64)
+        self.score_counts = np.zeros(num_scores, dtype=np.int64)
+
+    def update(self, polarity, emotion, intensity, scores):
+        self.rows += len(polarity)
+        _add_counts(self.polarity_counts, polarity)
+        _add_counts(self.emotion_counts, emotion)
+        self.intensity.update(intensity)
+        # 점수가 비어 있는 행은 감정별로 제외 (DataFrame.mean과 같은 기준)
+        self.score_sums += np.nansum(scores, axis=0, dtype=np.float64)
+        self.score_counts += (~np.isnan(scores)).sum(axis=0)
+
+    def snapshot(self, score_columns):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score_means = np.where(self.score_counts > 0, self.score_sums / self.score_counts, np.nan)
+        return {
+            'rows': self.rows,
+            'polarity_counts': dict(self.polarity_counts),
+            'emotion_counts': dict(self.emotion_counts),
+            'intensity_count': self.intensity.count,
+            'intensity_mean': self.intensity.mean if self.intensity.count else float('nan'),
+            'intensity_std': self.intensity.std,
+            'score_means': dict(zip(score_columns, score_means.tolist()))
+        }
+
+
+def _add_counts(counts, values):
+    """값별 개수 누적 (결측값 제외)"""
+    values = pd.Series(values, dtype=object).dropna()
+    for value, count in values.value_counts(sort=False).items():
+        counts[value] = counts.get(value, 0) + int(count)
+
+
+class OnlineEmotionStats:
+    """분석 결과 구간을 받아 전체/그룹별 감정 통계를 누적하는 클래스"""
+
+    def __init__(self, group_column=None):
+        """실시간 통계 초기화
+
+        Args:
+            group_column (str, optional): 그룹별 통계를 함께 누적할 원본 데이터 컬럼
+        """
+        self.group_column = group_column
+        self.score_columns = None
+        self.version = 0
+        self._overall = None
+        self._groups = {}
+        self._lock = threading.Lock()
+
+    def update(self, polarity, emotion, intensity, scores, score_columns=LABELS, group_keys=None):
+        """분석이 끝난 행 묶음 하나를 누적
+
+        Args:
+            polarity (array-like): 행별 감정 분류 (결측값은 개수에서 제외)
+            emotion (array-like): 행별 주요 감정 (결측값은 개수에서 제외)
+            intensity (array-like): 행별 감정 강도 (결측값은 평균/분산에서 제외)
+            scores (np.ndarray): (행 수, 감정 수) 감정 점수 행렬
+            score_columns (list): 감정 점수 행렬의 열 이름
+            group_keys (array-like, optional): 행별 그룹 값 (group_column을 지정한 경우)
+        """
+        polarity = np.asarray(polarity, dtype=object)
+        emotion = np.asarray(emotion, dtype=object)
+        intensity = np.asarray(intensity, dtype=np.float64)
+        scores = np.asarray(scores, dtype=np.float64)
+        if len(polarity) == 0:
+            return
+
+        with self._lock:
+            if self.score_columns is None:
+                self.score_columns = list(score_columns)
+                self._overall = _EmotionAccumulator(len(self.score_columns))
+            elif list(score_columns) != self.score_columns:
+                raise ValueError("감정 점수 컬럼 구성이 이전 구간과 다릅니다.")
+
+            self._overall.update(polarity, emotion, intensity, scores)
+
+            # 그룹 값별로 정렬한 뒤 연속 구간 단위로 누적 (결측 그룹 값은 제외)
+            if self.group_column is not None and group_keys is not None:
+                codes, uniques = pd.factorize(pd.Series(group_keys, dtype=object))
+                order = np.argsort(codes, kind='stable')
+                sorted_codes = codes[order]
+                bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+                for rows in np.split(order, bounds):
+                    code = codes[rows[0]]
+                    if code < 0:
+                        continue
+                    acc = self._groups.get(uniques[code])
+                    if acc is None:
+                        acc = self._groups[uniques[code]] = _EmotionAccumulator(len(self.score_columns))
+                    acc.update(polarity[rows], emotion[rows], intensity[rows], scores[rows])
+
+            self.version += 1
+
+    def update_frame(self, df):
+        """감정 분석 결과 데이터프레임(또는 조각) 누적
+
+        Args:
+            df (pd.DataFrame): 감정_분류, 주요_감정, 감정_강도 및 감정 점수 컬럼을 포함한 결과
+        """
+        score_columns = [col for col in SCORE_COLUMNS if col in df.columns]
+        group_keys = df[self.group_column].to_numpy() if self.group_column in df.columns else None
+        self.update(
+            df['감정_분류'].to_numpy() if '감정_분류' in df.columns else np.full(len(df), None),
+            df['주요_감정'].to_numpy() if '주요_감정' in df.columns else np.full(len(df), None),
+            df['감정_강도'].to_numpy() if '감정_강도' in df.columns else np.full(len(df), np.nan),
+            df[score_columns].to_numpy(dtype=np.float64),
+            score_columns=score_columns,
+            group_keys=group_keys
+        )
+
+    @classmethod
+    def from_frame(cls, df, group_column=None):
+        """결과 데이터프레임 전체로 통계 생성"""
+        stats = cls(group_column)
+        stats.update_frame(df)
+        return stats
+
+    def snapshot(self):
+        """현재까지의 전체 통계
+
+        Returns:
+            dict: rows, polarity_counts, emotion_counts, intensity_count, intensity_mean,
+                  intensity_std, score_means 항목 (누적된 행이 없으면 rows가 0)
+        """
+        with self._lock:
+            if self._overall is None:
+                return _EmotionAccumulator(0).snapshot([])
+            return self._overall.snapshot(self.score_columns)
+
+    def group_snapshots(self):
+        """현재까지의 그룹 값별 통계
+
+        Returns:
+            dict: 그룹 값 -> snapshot()과 같은 형식의 통계
+        """
+        with self._lock:
+            return {key: acc.snapshot(self.score_columns) for key, acc in self._groups.items()}
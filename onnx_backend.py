@@ -0,0 +1,224 @@
+"""
+ONNX 내보내기 및 ONNX Runtime 추론 백엔드 모듈
+
+KOTEtagger(ELECTRA + 분류기 + 시그모이드)를 배치/시퀀스 길이가 가변인
+ONNX 그래프로 내보내고, torch 없이 ONNX Runtime으로 추론합니다.
+"""
+import os
+import time
+import traceback
+import numpy as np
+
+from configure import LABELS, log_work
+from inference_cache import InferenceCache, model_fingerprint, normalize_text
+from instrumentation import span
+
+# ONNX 그래프 입출력 이름
+INPUT_NAMES = ["input_ids", "attention_mask"]
+OUTPUT_NAMES = ["scores"]
+
+# ONNX 내보내기 기본 opset 버전
+DEFAULT_OPSET = 14
+
+
+def tokenizer_dir_for(onnx_path):
+    """ONNX 모델 파일과 함께 저장되는 토크나이저 폴더 경로"""
+    return os.path.splitext(onnx_path)[0] + "_tokenizer"
+
+
+def export_onnx(model, output_path, opset_version=DEFAULT_OPSET):
+    """로드된 KOTEtagger를 ONNX 그래프로 내보내기
+
+    Args:
+        model: 가중치가 로드된 KOTEtagger 인스턴스 (양자화되지 않은 모델)
+        output_path (str): 저장할 .onnx 파일 경로
+        opset_version (int): ONNX opset 버전
+
+    Returns:
+        str: 저장된 ONNX 파일 경로
+    """
+    import torch
+
+    if getattr(model, 'quantized', False):
+        raise ValueError("INT8 양자화된 모델은 ONNX로 내보낼 수 없습니다. FP32 모델을 사용하세요.")
+
+    class _ScoringGraph(torch.nn.Module):
+        """ELECTRA + 분류기 + 시그모이드 추론 그래프"""
+        def __init__(self, tagger):
+            super().__init__()
+            self.electra = tagger.electra
+            self.classifier = tagger.classifier
+
+        def forward(self, input_ids, attention_mask):
+            output = self.electra(input_ids, attention_mask=attention_mask)
+            output = output.last_hidden_state[:, 0, :]
+            return torch.sigmoid(self.classifier(output))
+
+    graph = _ScoringGraph(model).eval().to("cpu")
+    sample = model.tokenizer(
+        ["감정 분석 모델을 내보냅니다.", "좋아요"],
+        padding="longest",
+        return_token_type_ids=False,
+        return_tensors="pt"
+    )
+
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"ONNX 모델을 내보내는 중입니다: {output_path}")
+    with torch.no_grad():
+        torch.onnx.export(
+            graph,
+            (sample["input_ids"], sample["attention_mask"]),
+            output_path,
+            input_names=INPUT_NAMES,
+            output_names=OUTPUT_NAMES,
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "scores": {0: "batch"}
+            },
+            opset_version=opset_version,
+            do_constant_folding=True
+        )
+
+    # 런타임에서 torch 없이 사용할 토크나이저 저장
+    model.tokenizer.save_pretrained(tokenizer_dir_for(output_path))
+    print(f"ONNX 모델 내보내기가 완료되었습니다: {output_path}")
+    return output_path
+
+
+class OnnxKOTETagger:
+    """ONNX Runtime 기반 KOTE 감정 분석 모델 클래스
+
+    KOTEtagger와 같은 infer/infer_batch 인터페이스를 제공하여
+    analyze_file, analyze_text에서 그대로 사용할 수 있습니다.
+    """
+
+    def __init__(self, onnx_path, tokenizer_path=None, num_threads=None):
+        """ONNX Runtime 세션 및 토크나이저 초기화
+
+        Args:
+            onnx_path (str): ONNX 모델 파일 경로
+            tokenizer_path (str, optional): 토크나이저 폴더, None이면 모델 파일 옆 폴더 사용
+            num_threads (int, optional): 연산 내부 스레드 수, None이면 런타임 기본값
+        """
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.onnx_path = onnx_path
+        self.session = ort.InferenceSession(onnx_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_path or tokenizer_dir_for(onnx_path))
+
+        # 추론 결과 캐시 (load_onnx_model에서 연결)
+        self.result_cache = None
+        self.quantized = False
+        self.source_path = onnx_path
+
+    def infer_batch(self, texts, batch_size=32):
+        """텍스트 목록에 대한 감정 점수 행렬 반환
+
+        Args:
+            texts (list): 분석할 텍스트 목록
+            batch_size (int): 한 번의 세션 실행에 넣을 최대 텍스트 수
+
+        Returns:
+            np.ndarray: (n, 44) 크기의 float32 감정 점수 행렬
+        """
+        texts = ["" if text is None else str(text) for text in texts]
+        scores = np.zeros((len(texts), len(LABELS)), dtype=np.float32)
+
+        # 빈 문자열은 0점으로 두고 나머지만 모델에 전달
+        valid_idx = np.array([i for i, text in enumerate(texts) if text.strip()], dtype=np.int64)
+
+        for start in range(0, len(valid_idx), batch_size):
+            batch_idx = valid_idx[start:start + batch_size]
+            with span("토큰화", len(batch_idx)):
+                encoding = self.tokenizer(
+                    [texts[i] for i in batch_idx],
+                    add_special_tokens=True,
+                    max_length=512,
+                    return_token_type_ids=False,
+                    padding="longest",
+                    return_attention_mask=True,
+                    return_tensors="np",
+                    truncation=True
+                )
+                feeds = {name: encoding[name].astype(np.int64) for name in INPUT_NAMES}
+
+            # 인코더와 분류기/시그모이드가 하나의 그래프로 실행됨
+            with span("ONNX_순전파", len(batch_idx)):
+                scores[batch_idx] = self.session.run(OUTPUT_NAMES, feeds)[0]
+
+        return scores
+
+    def infer(self, text):
+        """텍스트에 대한 감정 분석을 수행하고 감정-점수 사전과 강도를 반환
+
+        Args:
+            text (str): 분석할 텍스트
+
+        Returns:
+            tuple: (감정-점수 사전, 최대 감정 강도)
+        """
+        try:
+            if text is None or not isinstance(text, str) or not text.strip():
+                return {}, 0.0
+
+            text = normalize_text(text)
+            output = None
+            if self.result_cache is not None:
+                cached, found = self.result_cache.get_many([text])
+                if found[0]:
+                    output = cached[0]
+
+            if output is None:
+                output = self.infer_batch([text])[0]
+                if self.result_cache is not None:
+                    self.result_cache.put_many([text], output[None, :])
+
+            return dict(zip(LABELS, output)), float(output.max())
+
+        except Exception as e:
+            print(f"감정 추론 중 오류 발생: {str(e)}")
+            print(traceback.format_exc())
+            return {}, 0.0
+
+
+def load_onnx_model(onnx_path, use_cache=True, num_threads=None):
+    """ONNX Runtime 감정 분석 모델 로드 함수
+
+    Args:
+        onnx_path (str): ONNX 모델 파일 경로
+        use_cache (bool): 추론 결과 캐시 사용 여부
+        num_threads (int, optional): 연산 내부 스레드 수
+
+    Returns:
+        OnnxKOTETagger: 로드된 모델 인스턴스
+    """
+    start_time = time.time()
+    print(f"ONNX 감정분석 모델을 불러오는 중입니다: {onnx_path}")
+
+    if not os.path.isfile(onnx_path):
+        raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {onnx_path}")
+
+    model = OnnxKOTETagger(onnx_path, num_threads=num_threads)
+
+    # 추론 결과 캐시 연결 (PyTorch 모델과 별도 항목 사용)
+    if use_cache:
+        try:
+            model.result_cache = InferenceCache(model_fingerprint(onnx_path) + ":onnx")
+            print(f"추론 결과 캐시를 사용합니다: {model.result_cache.db_path}")
+        except Exception as e:
+            print(f"추론 결과 캐시를 사용할 수 없습니다: {e}")
+
+    end_time = time.time()
+    print(f"ONNX 감정분석 모델이 로딩되었습니다.\n소요된 시간은 {round(end_time - start_time, 2)}초 입니다.")
+    log_work("ONNX 감정분석 모델로딩", start_time, end_time, 파일명=os.path.basename(onnx_path))
+
+    return model
@@ -0,0 +1,282 @@
+"""
+다중 프로세스 추론 풀 모듈
+
+파일 분석 시 추론이 필요한 텍스트를 여러 조각으로 나누어 N개의 모델 복제본
+프로세스에서 동시에 추론하고, 결과를 원래 행 순서로 합칩니다.
+다른 스레드가 없는 프로세스(명령줄 실행 등)에서 fork를 지원하면 부모 프로세스의 모델
+가중치를 복사 없이(copy-on-write) 공유합니다. GUI처럼 작업 스레드, 작업 기록 스레드,
+로그 리디렉션 잠금이 살아 있는 프로세스를 fork하면 자식이 잠긴 상태의 잠금과 Tk에 연결된
+표준 출력을 물려받아 멈출 수 있으므로, 이때는 새 프로세스(spawn)에서 로컬 모델 파일을
+오프라인으로 다시 불러옵니다.
+(배포용 safetensors 파일은 메모리 매핑되어 프로세스 간 페이지를 공유합니다.)
+"""
+import os
+import threading
+import traceback
+import multiprocessing as mp
+import numpy as np
+
+from configure import LABELS
+from batch_inference import prepare_inference, run_bucketed_inference, DEFAULT_BATCH_SIZE
+from onnx_backend import OnnxKOTETagger
+
+# 작업 프로세스당 나누어 줄 조각 수 (작업량 균형 및 진행 상황 표시용)
+SHARDS_PER_WORKER = 4
+
+# 작업 프로세스에서 사용하는 모델 복제본 (fork 시 부모에서 상속, spawn 시 초기화 함수에서 로드)
+# fork 방식은 작업 프로세스가 다시 시작될 때도 상속받을 수 있도록 풀이 닫힐 때까지 유지
+_worker_model = None
+
+# spawn 방식 작업 프로세스에서 모델 복제본을 불러오지 못한 경우의 오류 메시지
+# (초기화 함수가 예외를 내면 풀이 작업 프로세스를 계속 다시 시작하므로 기록 후 조각마다 알림)
+_worker_load_error = None
+
+
+def available_cpus():
+    """현재 프로세스가 사용할 수 있는 CPU 코어 수"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def threads_per_worker(num_workers):
+    """작업 프로세스별 연산 스레드 수 (전체 합이 CPU 코어 수를 넘지 않도록 배분)
+
+    Args:
+        num_workers (int): 작업 프로세스 수
+
+    Returns:
+        int: 프로세스당 스레드 수
+    """
+    return max(1, available_cpus() // max(1, num_workers))
+
+
+def _limit_threads(num_threads):
+    """작업 프로세스의 연산 스레드 수 제한"""
+    os.environ["OMP_NUM_THREADS"] = str(num_threads)
+    os.environ["MKL_NUM_THREADS"] = str(num_threads)
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        # torch가 없거나 이미 병렬 작업이 시작되어 inter-op 스레드 수를 바꿀 수 없는 경우
+        pass
+
+
+def _init_forked_worker(num_threads):
+    """fork된 작업 프로세스 초기화 (부모의 모델 가중치를 그대로 사용)"""
+    _limit_threads(num_threads)
+    # 캐시 DB 연결은 부모 프로세스 전용 - 캐시 조회/저장은 부모가 담당
+    _worker_model.result_cache = None
+
+
+def _init_spawned_worker(source_path, quantize, num_threads):
+    """새로 시작된 작업 프로세스 초기화 (모델 파일에서 복제본 로드)
+
+    부모 프로세스가 이미 사전학습 모델 구성을 내려받았으므로 허브에 접속하지 않고
+    로컬 파일(모델 폴더 또는 내려받은 캐시)만 사용하며, 작업 기록은 남기지 않습니다.
+    """
+    global _worker_model, _worker_load_error
+    _limit_threads(num_threads)
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+    try:
+        if source_path.lower().endswith('.onnx'):
+            _worker_model = OnnxKOTETagger(source_path, num_threads=num_threads)
+        else:
+            import torch
+            from KOTE_load import load_custom_model
+            _worker_model = load_custom_model(source_path, torch.device("cpu"), use_cache=False, quantize=quantize,
+                                              offline_mode=True, record_work=False)
+            _worker_model.eval()
+    except Exception as e:
+        print(f"작업 프로세스 모델 로드 중 오류 발생: {str(e)}")
+        print(traceback.format_exc())
+        _worker_model = None
+        _worker_load_error = str(e)
+
+
+def _infer_shard(task):
+    """작업 프로세스: 텍스트 조각 하나를 길이별 배치로 추론
+
+    Returns:
+        tuple: (조각 번호, 점수 행렬, 오류 여부 배열, 모델 로드 오류 메시지 또는 None)
+    """
+    shard_id, texts, batch_size = task
+    if _worker_load_error is not None:
+        return shard_id, None, None, _worker_load_error
+    try:
+        scores, failed = run_bucketed_inference(_worker_model, texts, batch_size=batch_size)
+    except Exception as e:
+        print(f"작업 프로세스 추론 중 오류 발생: {str(e)}")
+        print(traceback.format_exc())
+        scores = np.zeros((len(texts), len(LABELS)), dtype=np.float32)
+        failed = np.ones(len(texts), dtype=bool)
+    return shard_id, scores, failed, None
+
+
+def _pool_context(model):
+    """모델 종류와 플랫폼에 맞는 프로세스 시작 방식 결정
+
+    Returns:
+        tuple: (multiprocessing 컨텍스트, 초기화 함수, 초기화 인자) 또는 사용할 수 없으면 None
+    """
+    # ONNX Runtime 세션은 fork 후 안전하게 사용할 수 없으므로 항상 새 프로세스에서 로드하고,
+    # 다른 스레드가 살아 있으면(GUI 작업 스레드, 작업 기록 스레드 등) 잠금 상태 상속을 피해 spawn 사용
+    can_fork = ("fork" in mp.get_all_start_methods() and not isinstance(model, OnnxKOTETagger)
+                and threading.active_count() == 1)
+    if can_fork:
+        return mp.get_context("fork"), _init_forked_worker, ()
+
+    source_path = getattr(model, 'source_path', None)
+    if source_path and os.path.isfile(source_path):
+        return mp.get_context("spawn"), _init_spawned_worker, (source_path, getattr(model, 'quantized', False))
+
+    return None
+
+
+class InferencePool:
+    """여러 번의 추론 호출에 재사용하는 모델 복제본 프로세스 풀
+
+    작업 프로세스는 처음으로 충분한 양의 텍스트가 들어올 때 시작되어
+    close() 또는 with 블록 종료 시까지 유지됩니다. (조각 단위 분석 시 모델 재로드 방지)
+    """
+
+    def __init__(self, model, num_workers, batch_size=DEFAULT_BATCH_SIZE):
+        """프로세스 풀 설정
+
+        Args:
+            model: 감정 분석 모델 인스턴스 (KOTEtagger 또는 OnnxKOTETagger)
+            num_workers (int): 작업 프로세스 수
+            batch_size (int): 배치 크기
+        """
+        self.model = model
+        self.batch_size = batch_size
+        self.num_workers = min(int(num_workers or 1), available_cpus())
+        self._pool = None
+        self._context = None
+
+        # GPU 모델은 단일 프로세스로 처리
+        device = getattr(model, '_device', None)
+        on_gpu = device is not None and getattr(device, 'type', str(device)) != 'cpu'
+        if self.num_workers > 1 and not on_gpu:
+            self._context = _pool_context(model)
+            if self._context is None:
+                print("모델 파일 경로를 알 수 없어 단일 프로세스로 분석합니다.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+    def _start(self):
+        """작업 프로세스 시작 (fork 방식은 모듈 전역 변수로 모델을 넘겨 가중치를 복사 없이 공유)"""
+        global _worker_model
+
+        ctx, initializer, initargs = self._context
+        num_threads = threads_per_worker(self.num_workers)
+        print(f"{self.num_workers}개 프로세스(프로세스당 스레드 {num_threads}개)로 추론합니다.")
+
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        if initializer is _init_forked_worker:
+            _worker_model = self.model
+        self._pool = ctx.Pool(self.num_workers, initializer=initializer, initargs=initargs + (num_threads,))
+
+    def run(self, texts, progress_callback=None):
+        """텍스트 목록 추론 후 원래 순서로 결과 반환
+
+        Args:
+            texts (list): 분석할 텍스트 목록
+            progress_callback (callable, optional): (완료 건수, 전체 건수)를 받는 진행 상황 콜백
+
+        Returns:
+            tuple: ((n, 44) float32 감정 점수 행렬, (n,) 오류 여부 배열)
+        """
+        texts = list(texts)
+        total = len(texts)
+
+        # 풀을 사용할 수 없거나 아직 시작 전이고 데이터가 적으면 현재 프로세스에서 처리
+        if self._context is None or (self._pool is None and total < self.num_workers * self.batch_size):
+            return run_bucketed_inference(self.model, texts, batch_size=self.batch_size,
+                                          progress_callback=progress_callback)
+
+        unique_texts, inverse, multiplicity, scores, pending = prepare_inference(self.model, texts)
+        failed = np.zeros(len(unique_texts), dtype=bool)
+        cache = getattr(self.model, 'result_cache', None)
+
+        done = total - int(multiplicity[pending].sum())
+        if done and progress_callback is not None:
+            progress_callback(done, total)
+
+        if len(pending) == 0:
+            return scores[inverse], failed[inverse]
+
+        if self._pool is None:
+            self._start()
+
+        # 연속된 조각으로 분할 (조각 안에서 다시 길이별 배치 구성)
+        shards = np.array_split(pending, min(len(pending), self.num_workers * SHARDS_PER_WORKER))
+        tasks = [(shard_id, [unique_texts[i] for i in shard], self.batch_size)
+                 for shard_id, shard in enumerate(shards)]
+
+        load_error = None
+        for shard_id, shard_scores, shard_failed, shard_error in self._pool.imap_unordered(_infer_shard, tasks):
+            shard = shards[shard_id]
+            if shard_error is not None:
+                # 작업 프로세스가 모델을 불러오지 못한 조각은 현재 프로세스에서 추론
+                load_error = shard_error
+                shard_scores, shard_failed = run_bucketed_inference(
+                    self.model, tasks[shard_id][1], batch_size=self.batch_size
+                )
+            scores[shard] = shard_scores
+            failed[shard] = shard_failed
+
+            if cache is not None:
+                stored = shard[~shard_failed]
+                cache.put_many([unique_texts[i] for i in stored], scores[stored])
+
+            done += int(multiplicity[shard].sum())
+            if progress_callback is not None:
+                progress_callback(done, total)
+
+        if load_error is not None:
+            # 이후 호출은 프로세스 풀 없이 현재 프로세스에서 처리
+            print(f"작업 프로세스에서 모델을 불러오지 못해 단일 프로세스로 분석합니다: {load_error}")
+            self.close()
+            self._context = None
+
+        # 원래 행 순서로 결과 복원
+        return scores[inverse], failed[inverse]
+
+    def close(self):
+        """작업 프로세스 종료 (fork 방식으로 넘긴 모델 참조도 해제)"""
+        global _worker_model
+
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        if _worker_model is self.model:
+            _worker_model = None
+
+
+def run_parallel_inference(model, texts, num_workers, batch_size=DEFAULT_BATCH_SIZE, progress_callback=None):
+    """여러 모델 복제본 프로세스로 추론 후 원래 순서로 결과 반환
+
+    Args:
+        model: 감정 분석 모델 인스턴스 (KOTEtagger 또는 OnnxKOTETagger)
+        texts (list): 분석할 텍스트 목록
+        num_workers (int): 작업 프로세스 수
+        batch_size (int): 배치 크기
+        progress_callback (callable, optional): (완료 건수, 전체 건수)를 받는 진행 상황 콜백
+
+    Returns:
+        tuple: ((n, 44) float32 감정 점수 행렬, (n,) 오류 여부 배열)
+    """
+    with InferencePool(model, num_workers, batch_size=batch_size) as pool:
+        return pool.run(texts, progress_callback=progress_callback)
@@ -0,0 +1,181 @@
+"""
+감정 분석 결과 파일 입출력 모듈
+
+CSV와 함께 열 단위(Parquet) 결과 형식을 지원합니다. Parquet 파일은 감정 점수를
+float32로, 주요_감정/감정_분류를 범주형으로 저장하고 분석 정보(메타데이터)를
+파일 스키마에 함께 기록합니다. 조각 단위로 이어 쓰는 경우 원본 입력 컬럼은 조각마다
+타입이 달라지지 않도록 문자열로 저장합니다.
+"""
+import os
+import json
+import numpy as np
+import pandas as pd
+
+from configure import LABELS, POLARITY_MAP
+
+# 결과 형식 -> 파일 확장자
+RESULT_FORMATS = {
+    "csv": ".csv",
+    "parquet": ".parquet"
+}
+
+# Parquet 스키마 메타데이터에 분석 정보를 기록하는 키
+RESULT_METADATA_KEY = b"kote_analysis"
+
+# 감정 점수 컬럼 ('없음' 대신 '무감정'을 사용한 결과 포함)
+SCORE_COLUMNS = LABELS + ['무감정']
+
+# 분석이 추가하는 결과 컬럼 (나머지는 원본 입력 컬럼)
+RESULT_COLUMNS = set(SCORE_COLUMNS) | {'주요_감정', '감정_강도', '감정_분류'}
+
+# 범주형 컬럼의 고정 범주 (조각마다 같은 스키마가 되도록 미리 정의)
+EMOTION_CATEGORIES = LABELS + ['무감정', '오류']
+POLARITY_CATEGORIES = sorted(set(POLARITY_MAP.values()) | {'중립'})
+
+
+def to_columnar(df):
+    """열 단위 저장용 형식 변환 (감정 점수 float32, 주요 감정/감정 분류 범주형)
+
+    Args:
+        df (pd.DataFrame): 감정 분석 결과 데이터프레임
+
+    Returns:
+        pd.DataFrame: 변환된 데이터프레임 (입력은 수정하지 않음)
+    """
+    converted = {}
+    for col in df.columns:
+        if col in SCORE_COLUMNS or col == '감정_강도':
+            converted[col] = df[col].astype(np.float32)
+        elif col == '주요_감정':
+            converted[col] = pd.Categorical(df[col], categories=EMOTION_CATEGORIES)
+        elif col == '감정_분류':
+            converted[col] = pd.Categorical(df[col], categories=POLARITY_CATEGORIES)
+    return df.assign(**converted) if converted else df
+
+
+def _arrow_table(df, metadata=None, schema=None):
+    """데이터프레임을 분석 정보가 포함된 Arrow 테이블로 변환"""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(to_columnar(df), preserve_index=False)
+    if schema is not None:
+        # 이어 쓰는 조각은 첫 조각의 스키마에 맞춤 (모두 비어 있는 컬럼 등)
+        return table.cast(schema)
+
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata[RESULT_METADATA_KEY] = json.dumps(metadata or {}, ensure_ascii=False, default=str).encode("utf-8")
+    return table.replace_schema_metadata(schema_metadata)
+
+
+def write_result_file(df, file_path, metadata=None):
+    """결과 데이터프레임 저장 (확장자에 따라 CSV 또는 Parquet)
+
+    Args:
+        df (pd.DataFrame): 저장할 결과 데이터프레임
+        file_path (str): 저장 경로 (.csv 또는 .parquet)
+        metadata (dict, optional): 파일에 함께 기록할 분석 정보 (Parquet만 해당)
+
+    Returns:
+        str: 저장된 파일 경로
+    """
+    if file_path.lower().endswith(RESULT_FORMATS["parquet"]):
+        import pyarrow.parquet as pq
+        pq.write_table(_arrow_table(df, metadata), file_path, compression="zstd")
+    else:
+        df.to_csv(file_path, index=False, encoding='utf-8-sig')
+    return file_path
+
+
+def _stringify_input_columns(df):
+    """결과 컬럼이 아닌 원본 입력 컬럼을 nullable 문자열 컬럼으로 변환 (결측값은 유지)"""
+    converted = {
+        col: df[col].astype("string")
+        for col in df.columns
+        if col not in RESULT_COLUMNS and not pd.api.types.is_string_dtype(df[col].dtype)
+    }
+    return df.assign(**converted) if converted else df
+
+
+def _pin_input_schema(schema):
+    """원본 입력 컬럼의 Arrow 타입을 large_string으로 고정한 스키마"""
+    import pyarrow as pa
+
+    fields = [
+        field if field.name in RESULT_COLUMNS else pa.field(field.name, pa.large_string(), nullable=True)
+        for field in schema
+    ]
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+class ParquetResultWriter:
+    """조각 단위 분석 결과를 하나의 Parquet 파일에 행 그룹으로 이어 쓰는 클래스"""
+
+    def __init__(self, file_path, metadata=None):
+        """Parquet 결과 파일 쓰기 준비
+
+        Args:
+            file_path (str): 저장 경로
+            metadata (dict, optional): 파일에 함께 기록할 분석 정보
+        """
+        self.file_path = file_path
+        self.metadata = metadata
+        self._writer = None
+        self._schema = None
+
+    def write(self, df):
+        """결과 조각 하나를 행 그룹으로 추가"""
+        import pyarrow.parquet as pq
+
+        # 원본 입력 컬럼은 조각마다 추론 타입이 달라질 수 있으므로 (첫 조각에서 모두 비어 있던
+        # 컬럼에 이후 텍스트가 오는 경우 등) 항상 nullable 문자열로 고정
+        df = _stringify_input_columns(df)
+        if self._writer is None:
+            table = _arrow_table(df, self.metadata)
+            self._schema = _pin_input_schema(table.schema)
+            self._writer = pq.ParquetWriter(self.file_path, self._schema, compression="zstd")
+            table = table.cast(self._schema)
+        else:
+            table = _arrow_table(df, schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        """파일 닫기 (메타데이터는 첫 조각 기록 시 스키마에 포함)"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def read_result_file(file_path):
+    """감정 분석 결과 파일 읽기 (CSV, Excel, Parquet)
+
+    분석 정보와 파일 경로는 df.attrs에 담겨 반환됩니다.
+
+    Args:
+        file_path (str): 결과 파일 경로
+
+    Returns:
+        pd.DataFrame: 결과 데이터프레임
+    """
+    _, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+
+    if ext == RESULT_FORMATS["parquet"]:
+        import pyarrow.parquet as pq
+        table = pq.read_table(file_path)
+        df = table.to_pandas()
+        raw = (table.schema.metadata or {}).get(RESULT_METADATA_KEY)
+        df.attrs.update(json.loads(raw.decode("utf-8")) if raw else {})
+        
+        # 통계 모듈과의 호환을 위해 범주형 컬럼은 일반 문자열 컬럼으로 복원
+        for col in ('주요_감정', '감정_분류'):
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(object)
+    elif ext == '.csv':
+        df = pd.read_csv(file_path, encoding='utf-8-sig')
+    elif ext in ['.xlsx', '.xls']:
+        df = pd.read_excel(file_path)
+    else:
+        raise ValueError(f"지원되지 않는 파일 형식입니다: {ext}")
+
+    df.attrs['analysis_file_path'] = file_path
+    return df
@@ -103,4 +103,7 @@ def main():
     original_stdout.write(f"프로그램 종료: 총 실행 시간 {total_time:.2f}초\n")
 
 if __name__ == "__main__":
+    # 다중 프로세스 추론용 (PyInstaller 실행 파일에서 작업 프로세스 시작 지원)
+    import multiprocessing
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
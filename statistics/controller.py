@@ -11,6 +11,8 @@ import logging
 from .model import StatisticsModel
 from .view import StatisticsView
 from .utils import format_file_name, ensure_output_dir
+from .cube import AggregateCube
+from .result_cache import StatisticsResultCache, data_fingerprint, has_error_results
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,12 @@ class StatisticsController:
         # 결과 데이터
         self.results = {}
         
+        # 그룹 컬럼 조합별 사전 집계 큐브 (그룹 컬럼을 바꿔도 원본 행을 다시 집계하지 않도록 유지)
+        self.cube = None
+        
+        # 데이터 지문과 분석 설정별 결과 캐시 (같은 설정으로 다시 실행하면 재사용)
+        self.result_cache = StatisticsResultCache()
+        
         # 분석에 필요한 컬럼 정보 (감정_분류, 주요_감정, 감정_강도)
         self.required_columns = ['감정_분류', '주요_감정', '감정_강도']
         
@@ -94,6 +102,10 @@ class StatisticsController:
             # 데이터 설정
             self.df = df
             self.filename = filename or "[데이터프레임]"
+            self.cube = None
+            
+            # 표본 지문으로 구분되지 않는 데이터 교체에 대비해 이전 결과 제거
+            self.result_cache.clear()
             
             # 파일 정보 업데이트
             self.view.update_file_info(
@@ -147,6 +159,31 @@ class StatisticsController:
         else:
             self.view.info_message("제거할 그룹 컬럼을 선택하세요.")
     
+    def get_cube(self, group_columns):
+        """그룹 컬럼을 포함하는 사전 집계 큐브 반환
+        
+        현재 큐브의 차원에 포함된 그룹 컬럼 조합(부분집합, 순서 변경)은 큐브를 재사용하고,
+        그렇지 않으면 선택한 그룹 컬럼만으로 다시 집계합니다. (이전 선택의 차원을 계속
+        누적하면 고유값이 많은 컬럼 하나 때문에 큐브가 원본 행 수준으로 커질 수 있음)
+        
+        Args:
+            group_columns (list): 그룹 컬럼 목록
+            
+        Returns:
+            AggregateCube: 사전 집계 큐브 또는 생성할 수 없으면 None
+        """
+        if not group_columns:
+            return None
+        if self.cube is not None and self.cube.covers(group_columns):
+            return self.cube
+        
+        try:
+            self.cube = AggregateCube(self.df, list(dict.fromkeys(group_columns)))
+        except Exception as e:
+            logger.error(f"사전 집계 큐브 생성 중 오류 발생: {str(e)}")
+            self.cube = None
+        return self.cube
+    
     def run_analysis(self):
         """통계 분석 실행"""
         if self.df is None or self.df.empty:
@@ -166,120 +203,34 @@ class StatisticsController:
             elif '감정_강도' in self.df.columns:
                 target_column = '감정_강도'
                 
+        # 분석 옵션 가져오기
+        options = self.view.get_analysis_options()
+        
+        # 그룹 컬럼이 선택되지 않았을 경우
+        if not group_columns:
+            self.view.show_error("분석 오류", "그룹 컬럼을 하나 이상 선택하세요.")
+            return
+        
+        # 같은 데이터와 분석 설정의 결과가 캐시에 있으면 다시 계산하지 않고 표시
+        cache_key = self.result_cache.make_key(data_fingerprint(self.df), group_columns, target_column, options)
+        cached_results = self.result_cache.get(cache_key)
+        if cached_results is not None:
+            self.results = cached_results
+            self.view.display_results(cached_results)
+            self.view.update_progress(100)
+            self.view.info_message("같은 설정의 이전 분석 결과를 표시했습니다.")
+            return
+        
         # 분석 시작 전 프로그레스바 초기화
         self.view.update_progress(0)
         
+        # 그룹 컬럼 조합별 사전 집계 (이미 집계된 차원이면 재사용)
+        cube = self.get_cube(group_columns)
+        
         try:
             # 데이터 검증
-            valid, message = self.model.validate_data(self.df)
-            if not valid:
-                self.view.show_warning("데이터 검증 실패", message)
-                return
-                
-            # 결과를 저장할 딕셔너리
-            results = {}
-            
-            # 1. 기본 통계량 분석
-            self.view.update_progress(10)
-            try:
-                results['overall_stats'] = self.model.analyze_overall_statistics(self.df)
-            except Exception as e:
-                logger.error(f"기본 통계량 분석 중 오류 발생: {str(e)}")
-                results['overall_stats'] = pd.DataFrame({'오류': [f"기본 통계량 분석 실패: {str(e)}"]})
-                
-            # 2. 감정 분포 분석
-            self.view.update_progress(30)
-            try:
-                emotion_counts, emotion_percents = self.model.analyze_emotion_distribution(self.df)
-                results['emotion_counts'] = emotion_counts
-                results['emotion_percents'] = emotion_percents
-                
-                # 히트맵 데이터 생성
-                heatmap_data = self.model.create_emotion_heatmap_data(self.df, group_columns)
-                results['heatmap_data'] = heatmap_data
-            except Exception as e:
-                logger.error(f"감정 분포 분석 중 오류 발생: {str(e)}")
-                results['emotion_counts'] = pd.DataFrame({'오류': [f"감정 분포 분석 실패: {str(e)}"]})
-                results['emotion_percents'] = pd.DataFrame({'오류': [f"감정 분포 분석 실패: {str(e)}"]})
-                results['heatmap_data'] = {'error': f"히트맵 생성 실패: {str(e)}"}
-                
-            # 3. 감정 강도 분포 분석
-            self.view.update_progress(50)
-            try:
-                if '감정_강도' in self.df.columns:
-                    intensity_stats = self.model.analyze_intensity_distribution(self.df)
-                    results['intensity_stats'] = intensity_stats
-            except Exception as e:
-                logger.error(f"감정 강도 분포 분석 중 오류 발생: {str(e)}")
-                results['intensity_stats'] = pd.DataFrame({'오류': [f"감정 강도 분포 분석 실패: {str(e)}"]})
-                
-            # 4. 그룹별 통계 분석 (그룹 컬럼이 지정된 경우)
-            self.view.update_progress(70)
-            if group_columns:
-                try:
-                    # 대상 컬럼이 문자열인지 숫자인지 확인
-                    if target_column in self.df.columns:
-                        is_numeric = pd.api.types.is_numeric_dtype(self.df[target_column])
-                        
-                        if not is_numeric:
-                            # 문자열 컬럼인 경우 빈도 분석만 수행
-                            self.view.show_warning("문자열 컬럼", 
-                                                f"'{target_column}'은 문자열 컬럼이므로 빈도 분석만 수행합니다.")
-                        
-                        # 그룹별 통계 분석 (숫자 컬럼인 경우에만 통계값 계산)
-                        grouped_stats = self.model.analyze_grouped_statistics(
-                            self.df, group_columns, target_column, numeric_only=is_numeric
-                        )
-                        results['grouped_stats'] = grouped_stats
-                    else:
-                        self.view.show_warning("컬럼 없음", f"대상 컬럼 '{target_column}'이 데이터에 존재하지 않습니다.")
-                except Exception as e:
-                    logger.error(f"그룹별 통계 분석 중 오류 발생: {str(e)}")
-                    results['grouped_stats'] = pd.DataFrame({'오류': [f"그룹별 통계 분석 실패: {str(e)}"]})
-                    
-            # 5. 다단계 빈도표 분석 (그룹 컬럼이 지정된 경우)
-            self.view.update_progress(90)
-            if group_columns:
-                try:
-                    # 감정 분류 다단계 빈도표
-                    if '감정_분류' in self.df.columns:
-                        crosstab_emotion = self.model.create_multi_level_crosstab(
-                            self.df, group_columns, '감정_분류'
-                        )
-                        results['crosstab_emotion'] = crosstab_emotion
-                        
-                        # 정규화된 빈도표 (퍼센트)
-                        crosstab_emotion_pct = self.model.create_multi_level_crosstab(
-                            self.df, group_columns, '감정_분류', normalize=True
-                        )
-                        results['crosstab_emotion_pct'] = crosstab_emotion_pct
-                        
-                    # 주요 감정 다단계 빈도표
-                    if '주요_감정' in self.df.columns:
-                        crosstab_main = self.model.create_multi_level_crosstab(
-                            self.df, group_columns, '주요_감정'
-                        )
-                        results['crosstab_main'] = crosstab_main
-                        
-                        # 정규화된 빈도표 (퍼센트)
-                        crosstab_main_pct = self.model.create_multi_level_crosstab(
-                            self.df, group_columns, '주요_감정', normalize=True
-                        )
-                        results['crosstab_main_pct'] = crosstab_main_pct
-                except Exception as e:
-                    logger.error(f"다단계 빈도표 생성 중 오류 발생: {str(e)}")
-                    results['crosstab_emotion'] = pd.DataFrame({'오류': [f"다단계 빈도표 생성 실패: {str(e)}"]})
-                    results['crosstab_main'] = pd.DataFrame({'오류': [f"다단계 빈도표 생성 실패: {str(e)}"]})
-                    
-            # 분석 대상 컬럼 가져오기 (기본값: 감정_강도)
-            target_column = self.view.get_target_column()
-            
-            # 분석 옵션 가져오기
-            options = self.view.get_analysis_options()
-            
-            # 그룹 컬럼이 선택되지 않았을 경우
-            if not group_columns:
-                self.view.show_error("분석 오류", "그룹 컬럼을 하나 이상 선택하세요.")
+            if not self.model.validate_data(self.df):
+                self.view.show_warning("데이터 검증 실패", "데이터에 필요한 열(감정_분류, 감정_강도)이 없습니다.")
                 return
             
             # 타깃 컬럼의 데이터 타입 확인
@@ -330,7 +281,7 @@ class StatisticsController:
                     results['emotion_percents'] = emotion_percents
                     
                     # 감정 히트맵 데이터 생성
-                    heatmap_data = self.model.create_emotion_heatmap_data(self.df, group_columns)
+                    heatmap_data = self.model.create_emotion_heatmap_data(self.df, group_columns, cube=cube)
                     results['heatmap_data'] = heatmap_data
                     
                 except Exception as e:
@@ -355,11 +306,16 @@ class StatisticsController:
                 self.view.update_progress(80)
                 
                 try:
-                    grouped_stats = self.model.analyze_grouped_statistics(self.df, group_columns, target_column)
+                    grouped_stats = self.model.analyze_grouped_statistics(
+                        self.df, group_columns, target_column, cube=cube
+                    )
                     results['grouped_stats'] = grouped_stats
                 except Exception as e:
                     print(f"그룹별 통계 분석 중 오류 발생: {str(e)}")
                     results['grouped_stats'] = pd.DataFrame({'오류': [f'그룹별 통계 분석 실패: {str(e)}']})
+                
+                # 감정 강도와 감정 점수 전체의 그룹별 통계 (한 번의 정렬 기반 집계)
+                results['grouped_score_stats'] = self.model.analyze_grouped_score_statistics(self.df, group_columns)
             
             # 5. 다단계 빈도표 분석
             if options.get('multi_level_crosstab', True):
@@ -368,12 +324,12 @@ class StatisticsController:
                 
                 try:
                     # 감정_분류와 주요_감정 모두에 대한 다단계 빈도표 생성
-                    crosstab_emotion = self.model.create_multi_level_crosstab(self.df, group_columns, '감정_분류')
+                    crosstab_emotion = self.model.create_multi_level_crosstab(self.df, group_columns, '감정_분류', cube=cube)
                     results['crosstab_emotion'] = crosstab_emotion
                     
                     # 주요_감정에 대한 다단계 빈도표 생성
                     if '주요_감정' in self.df.columns:
-                        crosstab_main = self.model.create_multi_level_crosstab(self.df, group_columns, '주요_감정')
+                        crosstab_main = self.model.create_multi_level_crosstab(self.df, group_columns, '주요_감정', cube=cube)
                         results['crosstab_main'] = crosstab_main
                         
                 except Exception as e:
@@ -381,8 +337,10 @@ class StatisticsController:
                     print(traceback.format_exc())
                     results['crosstab_emotion'] = pd.DataFrame({'오류': [f'다단계 빈도표 분석 실패: {str(e)}']})
             
-            # 결과 저장 및 표시
+            # 결과 저장 및 표시 (같은 설정으로 다시 실행하면 캐시된 결과 사용, 실패한 단계가 있으면 캐시하지 않음)
             self.results = results
+            if not has_error_results(results):
+                self.result_cache.put(cache_key, results)
             self.view.display_results(results)
             self.view.update_progress(100)
             self.view.info_message("그룹 분석이 완료되었습니다.")
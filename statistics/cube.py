@@ -0,0 +1,149 @@
+"""
+그룹별 통계를 위한 사전 집계 큐브 모듈
+
+선택한 그룹 컬럼(차원) 조합마다 감정_분류/주요_감정 빈도와 감정_강도의 개수, 합,
+제곱합, 최소값, 최대값을 한 번만 집계해 두고, 차원의 부분집합이나 순서를 바꾼
+그룹 분석은 원본 행이 아닌 큐브를 다시 묶어(roll-up) 계산합니다.
+"""
+import numpy as np
+import pandas as pd
+
+# 빈도를 미리 집계하는 범주형 컬럼
+CUBE_CATEGORY_COLUMNS = ('감정_분류', '주요_감정')
+
+# 개수/합/제곱합을 미리 집계하는 값 컬럼
+CUBE_VALUE_COLUMN = '감정_강도'
+
+
+class AggregateCube:
+    """그룹 컬럼 조합별 사전 집계 큐브 클래스"""
+
+    def __init__(self, df, dimensions, value_column=CUBE_VALUE_COLUMN, category_columns=CUBE_CATEGORY_COLUMNS):
+        """원본 데이터를 차원 조합별로 한 번 집계
+
+        Args:
+            df (pd.DataFrame): 감정 분석 결과 데이터프레임
+            dimensions (list): 큐브 차원 (그룹 컬럼 목록)
+            value_column (str): 수치 통계를 집계할 값 컬럼
+            category_columns (tuple): 빈도를 집계할 범주형 컬럼
+        """
+        self.dimensions = list(dimensions)
+        if not self.dimensions:
+            raise ValueError("큐브 차원(그룹 컬럼)이 하나 이상 필요합니다.")
+
+        # 행 수 (차원 값이 결측인 행도 집계하고, 묶을 때 선택한 그룹 키가 결측인 행만 제외)
+        self.row_counts = df.groupby(self.dimensions, observed=True, sort=True, dropna=False).size()
+
+        # 범주형 컬럼 빈도 (차원 + 범주 값)
+        self.category_counts = {}
+        for column in category_columns:
+            if column in df.columns and column not in self.dimensions:
+                self.category_counts[column] = df.groupby(
+                    self.dimensions + [column], observed=True, sort=True, dropna=False
+                ).size()
+
+        # 값 컬럼의 개수, 합, 제곱합, 최소값, 최대값 (결측값 제외)
+        self.value_column = None
+        self.value_stats = None
+        if value_column in df.columns and pd.api.types.is_numeric_dtype(df[value_column]):
+            values = df[value_column].astype(np.float64)
+            keys = [df[col] for col in self.dimensions]
+            grouped = pd.DataFrame({
+                'count': values.notna().astype(np.int64),
+                'sum': values.fillna(0.0),
+                'sumsq': values.fillna(0.0) ** 2,
+                'min': values,
+                'max': values
+            }).groupby(keys, observed=True, sort=True, dropna=False)
+            self.value_stats = grouped.agg({'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'})
+            self.value_column = value_column
+
+    @staticmethod
+    def _rollup(table, levels, agg):
+        """선택한 인덱스 레벨로 다시 묶기 (pd.crosstab/groupby와 같이 결측 키는 제외)"""
+        grouped = table.groupby(level=levels, sort=True)
+        return grouped.sum() if agg == 'sum' else grouped.agg(agg)
+
+    def covers(self, group_columns):
+        """그룹 컬럼이 모두 큐브 차원에 포함되는지 여부"""
+        return bool(group_columns) and set(group_columns) <= set(self.dimensions)
+
+    def rollup_counts(self, group_columns, column):
+        """그룹 컬럼 + 범주 값별 빈도
+
+        Args:
+            group_columns (list): 그룹 컬럼 목록 (큐브 차원의 부분집합, 순서 무관)
+            column (str): 범주형 컬럼 ('감정_분류' 또는 '주요_감정')
+
+        Returns:
+            pd.Series: (그룹 컬럼..., 범주 값) 다단계 인덱스의 빈도 또는 큐브로 계산할 수 없으면 None
+        """
+        counts = self.category_counts.get(column)
+        if counts is None or not self.covers(group_columns):
+            return None
+        return self._rollup(counts, list(group_columns) + [column], 'sum')
+
+    def crosstab(self, group_columns, column, normalize=False, margins_name="합계"):
+        """pd.crosstab(margins=True)와 같은 형식의 다단계 빈도표
+
+        Args:
+            group_columns (list): 그룹 컬럼 목록
+            column (str): 범주형 컬럼
+            normalize (bool): 행 기준 백분율(소수점 1자리) 여부
+            margins_name (str): 합계 행/열 이름
+
+        Returns:
+            pd.DataFrame: 빈도표 또는 큐브로 계산할 수 없으면 None
+        """
+        counts = self.rollup_counts(group_columns, column)
+        if counts is None:
+            return None
+
+        table = counts.unstack(column, fill_value=0).astype(np.int64)
+        table = table.reindex(columns=sorted(table.columns, key=str))
+        table[margins_name] = table.sum(axis=1)
+
+        # 합계 행 (다단계 인덱스는 첫 레벨에 합계, 나머지 레벨은 빈 문자열)
+        total = table.sum(axis=0).to_frame().T
+        if isinstance(table.index, pd.MultiIndex):
+            total.index = pd.MultiIndex.from_tuples(
+                [(margins_name,) + ('',) * (table.index.nlevels - 1)], names=table.index.names
+            )
+        else:
+            total.index = pd.Index([margins_name], name=table.index.name)
+        table = pd.concat([table, total])
+        table.columns.name = column
+
+        if normalize:
+            table = (table.div(table[margins_name], axis=0) * 100).round(1)
+            table.loc[:, margins_name] = 100.0
+        return table
+
+    def group_statistics(self, group_columns):
+        """그룹별 개수, 평균, 표준편차, 최소값, 최대값
+
+        Args:
+            group_columns (list): 그룹 컬럼 목록
+
+        Returns:
+            pd.DataFrame: 그룹 키를 인덱스로 하는 통계 데이터프레임 또는 큐브로 계산할 수 없으면 None
+        """
+        if self.value_stats is None or not self.covers(group_columns):
+            return None
+
+        rolled = self._rollup(self.value_stats, list(group_columns),
+                              {'count': 'sum', 'sum': 'sum', 'sumsq': 'sum', 'min': 'min', 'max': 'max'})
+        count = rolled['count'].to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = rolled['sum'].to_numpy() / count
+            # 표본 분산 (ddof=1), 부동소수점 오차로 생기는 음수는 0으로
+            var = (rolled['sumsq'].to_numpy() - rolled['sum'].to_numpy() * mean) / (count - 1)
+        var = np.where(count > 1, np.maximum(var, 0.0), np.nan)
+
+        return pd.DataFrame({
+            'count': rolled['count'].astype(np.int64),
+            'mean': np.where(count > 0, mean, np.nan),
+            'std': np.sqrt(var),
+            'min': rolled['min'],
+            'max': rolled['max']
+        }, index=rolled.index)
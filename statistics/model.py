@@ -8,7 +8,8 @@ from datetime import datetime
 import traceback
 import logging
 
-from .utils import get_group_statistics, create_intensity_bins, crosstab_with_default_columns
+from configure import LABELS
+from .utils import get_group_statistics, grouped_aggregate, create_intensity_bins, crosstab_with_default_columns
 
 logger = logging.getLogger(__name__)
 
@@ -58,23 +59,57 @@ class StatisticsModel:
         required_columns = ['감정_분류', '감정_강도']
         return all(col in df.columns for col in required_columns)
     
-    def analyze_overall_statistics(self, df, value_column='감정_강도'):
+    def analyze_overall_statistics(self, df, value_column='감정_강도', sketch=None):
         """전체 통계 분석
         
         Args:
             df (pd.DataFrame): 분석할 데이터프레임
             value_column (str): 값 열 이름
+            sketch (KLLSketch, optional): 값 컬럼의 분위수 스케치 (지정 시 원본 컬럼 대신 사용,
+                분위수/중앙값은 근사값이며 최빈값은 계산하지 않음)
             
         Returns:
             pd.DataFrame: 통계 요약 데이터프레임
         """
-        # 기본 통계량 계산
-        stats = df[value_column].describe()
-        
-        # 중앙값, 분산, 최빈값 추가
-        stats['median'] = df[value_column].median()
-        stats['var'] = df[value_column].var()
-        stats['mode'] = df[value_column].mode()[0] if not df[value_column].mode().empty else np.nan
+        if sketch is not None:
+            # 스케치의 정확한 개수/평균/분산/최소/최대값과 근사 분위수 사용
+            q25, median, q75 = sketch.quantiles([0.25, 0.5, 0.75])
+            stats = {
+                'count': float(sketch.count),
+                'mean': sketch.mean if sketch.count else np.nan,
+                'std': sketch.std,
+                'min': sketch.min,
+                '25%': q25,
+                'median': median,
+                '75%': q75,
+                'max': sketch.max,
+                'var': sketch.variance,
+                'mode': np.nan
+            }
+        else:
+            # 한 번 정렬한 값으로 기본 통계량, 분위수, 분산, 최빈값을 모두 계산
+            values = np.sort(pd.to_numeric(df[value_column], errors='raise').dropna().to_numpy(dtype=np.float64))
+            stats = {'count': float(len(values))}
+            if len(values):
+                q25, median, q75 = np.quantile(values, [0.25, 0.5, 0.75])
+                
+                # 최빈값 (같은 값이 연속된 구간 중 가장 긴 구간, 동률이면 작은 값)
+                starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+                runs = np.diff(np.r_[starts, len(values)])
+                
+                stats.update({
+                    'mean': values.mean(),
+                    'std': values.std(ddof=1) if len(values) > 1 else np.nan,
+                    'min': values[0],
+                    '25%': q25,
+                    'median': median,
+                    '75%': q75,
+                    'max': values[-1],
+                    'var': values.var(ddof=1) if len(values) > 1 else np.nan,
+                    'mode': values[starts[runs.argmax()]]
+                })
+            else:
+                stats.update(dict.fromkeys(['mean', 'std', 'min', '25%', 'median', '75%', 'max', 'var', 'mode'], np.nan))
         
         # 통계량 순서 조정 및 반올림
         stats = pd.DataFrame({
@@ -179,13 +214,16 @@ class StatisticsModel:
         
         return result
     
-    def analyze_grouped_statistics(self, df, group_columns, value_column='감정_강도'):
+    def analyze_grouped_statistics(self, df, group_columns, value_column='감정_강도', cube=None, sketch=None):
         """그룹별 통계 분석
         
         Args:
             df (pd.DataFrame): 분석할 데이터프레임
             group_columns (list): 그룹핑 열 이름 목록
             value_column (str): 값 열 이름
+            cube (AggregateCube, optional): 사전 집계 큐브 (그룹 컬럼과 값 컬럼을 포함하면 큐브에서 계산)
+            sketch (GroupedQuantileSketch, optional): 같은 그룹 컬럼의 값 컬럼 분위수 스케치
+                (지정 시 중앙값은 원본 컬럼 대신 스케치의 근사값 사용)
             
         Returns:
             pd.DataFrame: 그룹별 통계 데이터프레임
@@ -196,8 +234,16 @@ class StatisticsModel:
                 print(f"경고: 분석 대상 컬럼 '{value_column}'이 데이터프레임에 존재하지 않습니다. 기본 컬럼으로 대체합니다.")
                 value_column = '감정_강도'  # 기본값으로 대체
             
-            # 그룹별 통계 계산
-            result = get_group_statistics(df, group_columns, value_column)
+            # 그룹별 통계 계산 (큐브가 있으면 사전 집계값을 다시 묶어 계산)
+            if sketch is not None and not sketch.covers(group_columns):
+                sketch = None
+            result = None
+            if cube is not None and cube.value_column == value_column:
+                result = self._grouped_statistics_from_cube(df, cube, group_columns, value_column, sketch)
+            if result is None and sketch is not None:
+                result = self._round_group_statistics(sketch.summary(qs=(0.5,)).rename(columns={'50%': 'median'}))
+            if result is None:
+                result = get_group_statistics(df, group_columns, value_column)
             
             # 컬럼명 변경 (가독성 향상)
             col_rename = {'count': '개수'}
@@ -224,7 +270,67 @@ class StatisticsModel:
             empty_result = pd.DataFrame(columns=group_columns + ['개수'])
             return empty_result
     
-    def create_multi_level_crosstab(self, df, group_cols, value_col, normalize=False):
+    def _grouped_statistics_from_cube(self, df, cube, group_columns, value_column, sketch=None):
+        """큐브에서 그룹별 통계 계산 (get_group_statistics와 같은 형식)
+        
+        중앙값은 부분 집계로 합칠 수 없으므로 분위수 스케치가 있으면 스케치의 근사값,
+        없으면 원본 값 컬럼에서 벡터화된 groupby로 계산합니다.
+        
+        Returns:
+            pd.DataFrame: 그룹별 통계 데이터프레임 또는 큐브로 계산할 수 없으면 None
+        """
+        stats = cube.group_statistics(group_columns)
+        if stats is None:
+            return None
+        
+        if sketch is not None:
+            stats['median'] = sketch.medians()
+        else:
+            stats['median'] = df.groupby(group_columns, observed=True, sort=True)[value_column].median()
+        return self._round_group_statistics(stats)
+    
+    def _round_group_statistics(self, stats):
+        """그룹 키 인덱스의 통계 데이터프레임을 get_group_statistics 형식으로 정리"""
+        stats = stats[['count', 'mean', 'std', 'min', 'max', 'median']].reset_index().fillna(0)
+        for col in ('mean', 'std', 'min', 'max', 'median'):
+            stats[col] = stats[col].round(2)
+        return stats
+    
+    def analyze_grouped_score_statistics(self, df, group_columns, value_columns=None):
+        """그룹별 감정 강도와 감정 점수 통계를 하나의 넓은 표로 계산
+        
+        Args:
+            df (pd.DataFrame): 분석할 데이터프레임
+            group_columns (list): 그룹핑 열 이름 목록
+            value_columns (list, optional): 값 열 목록 (기본값: 감정_강도 + 감정 점수 컬럼 중 존재하는 숫자형 컬럼)
+            
+        Returns:
+            pd.DataFrame: 그룹 키를 인덱스로 하고 (값 컬럼, 통계량) 다단계 열을 갖는 통계 데이터프레임
+        """
+        try:
+            if value_columns is None:
+                value_columns = [col for col in ['감정_강도'] + LABELS if col in df.columns]
+            value_columns = [col for col in value_columns
+                             if col in df.columns and pd.api.types.is_numeric_dtype(df[col])]
+            if not group_columns or not value_columns:
+                return pd.DataFrame()
+            
+            result = grouped_aggregate(df, group_columns, value_columns).round(2)
+            return result.rename(columns={
+                'count': '개수',
+                'mean': '평균',
+                'std': '표준편차',
+                'min': '최소값',
+                'max': '최대값',
+                'median': '중앙값'
+            }, level=1)
+            
+        except Exception as e:
+            print(f"그룹별 감정 점수 통계 분석 중 오류 발생: {str(e)}")
+            print(traceback.format_exc())
+            return pd.DataFrame()
+    
+    def create_multi_level_crosstab(self, df, group_cols, value_col, normalize=False, cube=None):
         """다단계 크로스탭 생성
         
         Args:
@@ -232,6 +338,7 @@ class StatisticsModel:
             group_cols (list): 그룹 컬럼 목록
             value_col (str): 값 컬럼
             normalize (bool, optional): 정규화 여부. Defaults to False.
+            cube (AggregateCube, optional): 사전 집계 큐브 (그룹 컬럼을 포함하면 큐브에서 계산)
             
         Returns:
             pd.DataFrame: 다단계 크로스탭
@@ -245,6 +352,12 @@ class StatisticsModel:
             return pd.DataFrame()
             
         try:
+            # 큐브에 집계된 그룹 컬럼 조합이면 원본 행 대신 큐브 사용
+            if cube is not None:
+                crosstab = cube.crosstab(group_cols, value_col, normalize=normalize)
+                if crosstab is not None:
+                    return crosstab
+            
             # 그룹 컬럼이 하나인 경우
             if len(group_cols) == 1:
                 # 크로스탭 생성
@@ -294,19 +407,24 @@ class StatisticsModel:
             logger.error(f"다단계 크로스탭 생성 중 오류 발생: {str(e)}")
             return pd.DataFrame()
             
-    def create_emotion_heatmap_data(self, df, group_cols=None):
+    def create_emotion_heatmap_data(self, df, group_cols=None, cube=None):
         """감정 분류별 히트맵 데이터 생성
         
+        원본 행은 그룹 컬럼과 감정 컬럼 조합별 빈도를 구하는 groupby 한 번으로만 읽고,
+        전체/그룹 컬럼별/그룹 컬럼 조합별 결과는 이 빈도를 다시 묶어 계산합니다.
+        
         Args:
             df (pd.DataFrame): 데이터프레임
             group_cols (list, optional): 그룹 컬럼 목록. Defaults to None.
+            cube (AggregateCube, optional): 사전 집계 큐브 (그룹 컬럼을 포함하면 원본 행 대신 사용)
             
         Returns:
             dict: 히트맵 데이터
+                - 'overall': 전체 데이터의 건수, 감정별/주요 감정별 빈도, 극성별 빈도와 비율
+                - 'groups': 그룹('전체', '컬럼: 값', '컬럼: 값 / 컬럼: 값')별 같은 항목을 담은 표
+                  (열은 ('전체', '건수'), ('극성_건수', 극성), ('극성_비율', 극성), (감정 컬럼, 값) 형식)
         """
         try:
-            result = {}
-            
             # 감정 분류 컬럼 확인
             emotion_col = '감정_분류'
             if emotion_col not in df.columns:
@@ -314,101 +432,125 @@ class StatisticsModel:
                 if emotion_col not in df.columns:
                     return {'error': '감정 분류 컬럼이 존재하지 않습니다.'}
             
-            # 전체 데이터에 대한 히트맵 데이터 생성
-            result['overall'] = self._create_emotion_heatmap_for_group(df, emotion_col)
-            
-            # 그룹별 히트맵 데이터 생성 (그룹 컬럼이 지정된 경우)
-            if group_cols and len(group_cols) > 0:
-                # 그룹별 데이터 처리
-                for col in group_cols:
-                    if col not in df.columns:
-                        continue
-                        
-                    # 고유값 목록 가져오기
-                    unique_values = df[col].unique()
-                    
-                    # 각 고유값에 대한 히트맵 데이터 생성
-                    for value in unique_values:
-                        # 해당 값을 가진 데이터 필터링
-                        filtered_df = df[df[col] == value]
-                        
-                        # 히트맵 데이터 생성
-                        group_key = f"{col}: {value}"
-                        result[group_key] = self._create_emotion_heatmap_for_group(filtered_df, emotion_col)
-                        
-                # 다단계 그룹핑 처리 (그룹 컬럼이 2개 이상인 경우)
-                if len(group_cols) >= 2:
-                    # 그룹별 데이터 프레임 생성
-                    grouped = df.groupby(group_cols)
-                    
-                    # 각 그룹에 대한 히트맵 데이터 생성
-                    for name, group_df in grouped:
-                        # 그룹 이름 생성 (튜플인 경우 문자열로 변환)
-                        if isinstance(name, tuple):
-                            group_key = " / ".join([f"{col}: {val}" for col, val in zip(group_cols, name)])
-                        else:
-                            group_key = f"{group_cols[0]}: {name}"
-                            
-                        # 히트맵 데이터 생성
-                        result[group_key] = self._create_emotion_heatmap_for_group(group_df, emotion_col)
-            
-            return result
+            count_cols = [emotion_col]
+            if '주요_감정' in df.columns and emotion_col != '주요_감정':
+                count_cols.append('주요_감정')
+            group_cols = [col for col in (group_cols or []) if col in df.columns and col not in count_cols]
+            
+            # 그룹 컬럼별 행 수와 감정 컬럼별 빈도 (결측 그룹 값도 유지하고 묶을 때 제외)
+            row_counts, value_counts = self._heatmap_base_counts(df, group_cols, count_cols, cube)
+            
+            # 전체, 그룹 컬럼별, 그룹 컬럼 조합별(2개 이상) 결과 표
+            tables = [self._heatmap_table(row_counts, value_counts, [], emotion_col)]
+            levels = [[col] for col in group_cols]
+            if len(group_cols) >= 2:
+                levels.append(group_cols)
+            for level in levels:
+                tables.append(self._heatmap_table(row_counts, value_counts, level, emotion_col))
+            
+            groups = pd.concat(tables).fillna(0)
+            count_columns = [col for col in groups.columns if col[0] != '극성_비율']
+            groups[count_columns] = groups[count_columns].astype(np.int64)
+            
+            return {
+                'emotion_col': emotion_col,
+                'overall': self._heatmap_summary(groups.loc['전체'], count_cols),
+                'groups': groups
+            }
         except Exception as e:
             logger.error(f"감정 히트맵 데이터 생성 중 오류 발생: {str(e)}")
             return {'error': f'감정 히트맵 데이터 생성 중 오류 발생: {str(e)}'}
-            
-    def _create_emotion_heatmap_for_group(self, df, emotion_col):
-        """특정 그룹에 대한 감정 히트맵 데이터 생성
+    
+    def _heatmap_base_counts(self, df, group_cols, count_cols, cube=None):
+        """히트맵 계산의 기준 빈도 (원본 행은 groupby 한 번만 읽음)
         
-        Args:
-            df (pd.DataFrame): 데이터프레임
-            emotion_col (str): 감정 분류 컬럼
-            
         Returns:
-            dict: 히트맵 데이터
+            tuple: (그룹 컬럼별 행 수 Series 또는 그룹 컬럼이 없으면 전체 행 수,
+                    감정 컬럼 -> 그룹 컬럼 + 감정 컬럼 다단계 인덱스 빈도 Series 딕셔너리)
         """
-        # 결과 딕셔너리 초기화
-        result = {
-            'total_count': len(df),
-            'emotion_counts': {},
-            'main_emotion_counts': {},
-            'polarity_counts': {
-                '긍정': 0,
-                '중립': 0,
-                '부정': 0
-            },
-            'polarity_percentages': {
-                '긍정': 0.0,
-                '중립': 0.0,
-                '부정': 0.0
-            }
-        }
+        # 큐브에 같은 그룹 컬럼과 감정 컬럼이 집계되어 있으면 원본 행을 읽지 않음
+        if cube is not None and cube.covers(group_cols) and all(col in cube.category_counts for col in count_cols):
+            return cube.row_counts, {col: cube.category_counts[col] for col in count_cols}
         
-        if result['total_count'] == 0:
-            return result
-            
-        # 감정 분류별 카운트
-        emotion_counts = df[emotion_col].value_counts().to_dict()
-        result['emotion_counts'] = emotion_counts
+        joint = df.groupby(group_cols + count_cols, observed=True, sort=False, dropna=False).size()
+        if group_cols:
+            row_counts = joint.groupby(level=group_cols, observed=True, dropna=False).sum()
+        else:
+            row_counts = len(df)
+        return row_counts, {col: joint for col in count_cols}
+    
+    def _heatmap_table(self, row_counts, value_counts, level, emotion_col):
+        """그룹 기준 하나(level이 비어 있으면 전체)에 대한 히트맵 결과 표
+        
+        Returns:
+            pd.DataFrame: 그룹 이름을 인덱스로 하는 건수/극성/감정별 빈도 표
+        """
+        polarities = ['긍정', '중립', '부정']
+        
+        if level:
+            totals = row_counts.groupby(level=level, sort=True).sum()
+        else:
+            totals = pd.Series([int(row_counts.sum()) if isinstance(row_counts, pd.Series) else row_counts])
+        
+        parts = {('전체', '건수'): totals}
+        count_tables = {}
+        for col, counts in value_counts.items():
+            table = counts.groupby(level=level + [col], sort=True).sum()
+            if level:
+                table = table.unstack(col, fill_value=0)
+            else:
+                table = table.to_frame().T.set_axis(totals.index)
+            count_tables[col] = table.reindex(totals.index, fill_value=0)
         
-        # 주요 감정 컬럼이 있는 경우
-        if '주요_감정' in df.columns and emotion_col != '주요_감정':
-            main_emotion_counts = df['주요_감정'].value_counts().to_dict()
-            result['main_emotion_counts'] = main_emotion_counts
+        # 감정 값별 극성 (감정_분류 값이 이미 극성이면 그대로 사용)
+        emotions = count_tables[emotion_col]
+        polarity_of = [EMOTION_POLARITY.get(value, value if value in polarities else '중립') for value in emotions.columns]
+        polarity_counts = emotions.T.groupby(polarity_of).sum().T.reindex(columns=polarities, fill_value=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            polarity_pct = (polarity_counts.div(totals, axis=0) * 100).round(1)
         
-        # 극성별 카운트 계산
-        for emotion, count in emotion_counts.items():
-            polarity = EMOTION_POLARITY.get(emotion, '중립')
-            result['polarity_counts'][polarity] += count
+        for polarity in polarities:
+            parts[('극성_건수', polarity)] = polarity_counts[polarity]
+        for polarity in polarities:
+            parts[('극성_비율', polarity)] = polarity_pct[polarity]
+        for col, table in count_tables.items():
+            for value in table.columns:
+                parts[(col, value)] = table[value]
         
-        # 극성별 비율 계산
-        for polarity in result['polarity_counts'].keys():
-            count = result['polarity_counts'][polarity]
-            percentage = (count / result['total_count']) * 100 if result['total_count'] > 0 else 0.0
-            result['polarity_percentages'][polarity] = round(percentage, 1)
+        result = pd.DataFrame(parts)
+        result.columns = pd.MultiIndex.from_tuples(result.columns)
         
+        # 그룹 이름 ('전체', '컬럼: 값' 또는 '컬럼: 값 / 컬럼: 값')
+        if not level:
+            names = ['전체']
+        elif len(level) == 1:
+            names = [f"{level[0]}: {value}" for value in totals.index]
+        else:
+            names = [" / ".join(f"{col}: {val}" for col, val in zip(level, key)) for key in totals.index]
+        result.index = pd.Index(names, name='그룹')
         return result
     
+    def _heatmap_summary(self, row, count_cols):
+        """히트맵 결과 표의 한 행을 그룹 하나의 히트맵 데이터 딕셔너리로 변환
+        
+        Returns:
+            dict: 건수, 감정별/주요 감정별 빈도(많은 순), 극성별 빈도와 비율
+        """
+        def nonzero_counts(col):
+            if col not in row.index.get_level_values(0):
+                return {}
+            counts = row[col]
+            counts = counts[counts > 0].sort_values(ascending=False, kind='mergesort')
+            return {key: int(value) for key, value in counts.items()}
+        
+        return {
+            'total_count': int(row[('전체', '건수')]),
+            'emotion_counts': nonzero_counts(count_cols[0]),
+            'main_emotion_counts': nonzero_counts('주요_감정') if len(count_cols) > 1 else {},
+            'polarity_counts': {key: int(value) for key, value in row['극성_건수'].items()},
+            'polarity_percentages': {key: float(value) for key, value in row['극성_비율'].items()}
+        }
+    
     def save_results_to_excel(self, results, output_path, group_columns=None, target_column='감정_강도'):
         """분석 결과를 Excel 파일로 저장
         
@@ -452,6 +594,10 @@ class StatisticsModel:
                 # 그룹별 통계 시트로 저장
                 results['group_stats'].to_excel(writer, sheet_name=sheet_name)
             
+            # 그룹별 감정 점수 통계 시트 (값 컬럼 x 통계량 넓은 표)
+            if 'grouped_score_stats' in results and not results['grouped_score_stats'].empty:
+                results['grouped_score_stats'].to_excel(writer, sheet_name='그룹별_감정점수_통계')
+            
             # 다단계 빈도표 시트
             if 'multi_crosstab' in results:
                 results['multi_crosstab'].to_excel(writer, sheet_name='다단계_빈도표')
@@ -0,0 +1,99 @@
+"""
+통계 분석 결과 캐시 모듈
+
+불러온 데이터프레임의 간단한 지문(행/열 구성과 표본 행의 해시)과 그룹 컬럼, 대상 컬럼,
+분석 옵션으로 키를 만들어 분석 결과를 메모리 LRU에 보관합니다.
+같은 설정으로 다시 실행하거나 이전 설정으로 돌아가면 다시 계산하지 않고 결과를 재사용합니다.
+분석 단계 중 하나라도 실패한 결과는 다시 실행하면 다시 계산하도록 보관하지 않습니다.
+"""
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# 메모리 LRU에 보관할 최대 분석 결과 수
+DEFAULT_RESULT_ENTRIES = 16
+
+# 지문 계산에 사용할 표본 행 수 (처음과 끝 행 포함, 전체 구간에서 고르게 선택)
+FINGERPRINT_SAMPLE_ROWS = 4096
+
+
+def data_fingerprint(df, sample_rows=FINGERPRINT_SAMPLE_ROWS):
+    """데이터프레임 지문 계산 (전체 행을 해시하지 않는 가벼운 지문)
+
+    Args:
+        df (pd.DataFrame): 데이터프레임
+        sample_rows (int): 내용 해시에 사용할 최대 표본 행 수
+
+    Returns:
+        str: 행 수, 열 이름/타입, 표본 행 내용의 해시 문자열
+    """
+    digest = hashlib.sha1(f"{len(df)}\0{len(df.columns)}".encode("utf-8"))
+    for col, dtype in df.dtypes.items():
+        digest.update(f"{col}\0{dtype}\0".encode("utf-8"))
+
+    if len(df) > 0:
+        positions = np.unique(np.linspace(0, len(df) - 1, min(len(df), sample_rows)).astype(np.int64))
+        sample = df.iloc[positions]
+        try:
+            digest.update(pd.util.hash_pandas_object(sample, index=True).to_numpy().tobytes())
+        except TypeError:
+            # 해시할 수 없는 값(리스트 등)이 있으면 문자열로 변환해 해시
+            digest.update(pd.util.hash_pandas_object(sample.astype(str), index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def has_error_results(results):
+    """분석 실패 자리표시 결과('오류' 열의 데이터프레임 또는 'error' 키의 사전) 포함 여부"""
+    for value in results.values():
+        if isinstance(value, pd.DataFrame) and '오류' in value.columns:
+            return True
+        if isinstance(value, dict) and 'error' in value:
+            return True
+    return False
+
+
+class StatisticsResultCache:
+    """데이터 지문과 분석 설정별 통계 결과 LRU 캐시 클래스"""
+
+    def __init__(self, max_entries=DEFAULT_RESULT_ENTRIES):
+        """캐시 초기화
+
+        Args:
+            max_entries (int): 보관할 최대 분석 결과 수
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(fingerprint, group_columns, target_column, options=None):
+        """데이터 지문과 분석 설정으로 캐시 키 생성 (그룹 컬럼 순서는 결과에 영향을 주므로 유지)"""
+        options = tuple(sorted((options or {}).items()))
+        return (fingerprint, tuple(group_columns or ()), target_column, options)
+
+    def get(self, key):
+        """캐시된 결과 조회 (없으면 None)"""
+        results = self._entries.get(key)
+        if results is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return results
+
+    def put(self, key, results):
+        """결과 저장 (최대 개수를 넘으면 가장 오래 사용하지 않은 결과 제거)"""
+        self._entries[key] = results
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """모든 결과 제거"""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
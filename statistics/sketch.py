@@ -0,0 +1,380 @@
+"""
+감정 강도 분위수 근사를 위한 KLL 분위수 스케치 모듈
+
+KLL 스케치는 값을 한 번만 훑으면서 레벨별로 정렬 후 절반만 남기는(compaction) 방식으로
+메모리를 O(k log(n/k))로 제한하고, 순위 오차가 약 1.7/k 이내인 분위수를 제공합니다.
+스케치끼리 병합할 수 있으므로 조각(청크)이나 여러 결과 파일로 나뉜 부분 결과도
+원본 컬럼을 메모리에 올리지 않고 합쳐서 분위수와 중앙값을 계산할 수 있습니다.
+개수, 평균, 분산, 최소값, 최대값은 스케치와 함께 정확히 누적합니다.
+
+스트리밍 분석은 조각마다 감정 강도를 스케치에 누적해 결과 파일 옆에 JSON으로 저장하고,
+결과 파일 요약은 저장된 스케치를 복원하거나 없으면 파일을 조각 단위로 읽어 만듭니다.
+값 컬럼이 메모리에 있는 데이터프레임은 근사 없이 정확한 통계를 계산합니다.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# 기본 정확도 파라미터 (클수록 정확, 메모리는 대략 3k개 값)
+DEFAULT_SKETCH_K = 400
+
+# 레벨이 하나 내려갈 때마다 줄어드는 용량 비율
+SKETCH_CAPACITY_RATIO = 2.0 / 3.0
+
+# 결과 파일을 스케치로 읽을 때 한 번에 읽는 행 수
+SKETCH_CHUNK_ROWS = 500000
+
+# 결과 파일 옆에 저장하는 스케치 파일 접미사
+SKETCH_FILE_SUFFIX = ".sketch.json"
+
+
+class KLLSketch:
+    """병합 가능한 KLL 분위수 스케치 클래스"""
+
+    def __init__(self, k=DEFAULT_SKETCH_K, seed=None):
+        """빈 스케치 생성
+
+        Args:
+            k (int): 정확도 파라미터 (최상위 레벨 용량)
+            seed (int, optional): 압축 시 홀/짝 선택에 사용할 난수 시드
+        """
+        self.k = int(k)
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def from_values(cls, values, k=DEFAULT_SKETCH_K, seed=None):
+        """값 배열로 스케치 생성"""
+        sketch = cls(k, seed)
+        sketch.update(values)
+        return sketch
+
+    def update(self, values):
+        """값 배열 누적 (결측값 제외)"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        self._merge_moments(len(values), values.mean(), float(((values - values.mean()) ** 2).sum()),
+                            values.min(), values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """다른 스케치 병합 (조각/파일별 부분 결과 합치기)"""
+        if other.count == 0:
+            return self
+        self._merge_moments(other.count, other.mean, other.m2, other.min, other.max)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for height, items in enumerate(other.levels):
+            self.levels[height] = np.concatenate([self.levels[height], items])
+        self._compress()
+        return self
+
+    def _merge_moments(self, count, mean, m2, minimum, maximum):
+        """개수, 평균, 편차 제곱합(Chan 병합), 최소/최대값 누적"""
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = minimum if np.isnan(self.min) else min(self.min, minimum)
+        self.max = maximum if np.isnan(self.max) else max(self.max, maximum)
+
+    def _capacity(self, height):
+        """레벨별 최대 보관 개수 (최상위 레벨이 k, 아래로 갈수록 2/3씩 감소)"""
+        depth = len(self.levels) - height - 1
+        return max(2, int(np.ceil(self.k * SKETCH_CAPACITY_RATIO ** depth)))
+
+    def _compress(self):
+        """용량을 넘은 가장 낮은 레벨부터 정렬 후 절반을 다음 레벨로 올리기"""
+        while sum(len(items) for items in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            for height, items in enumerate(self.levels):
+                if len(items) >= self._capacity(height):
+                    break
+            else:
+                return
+
+            if height + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+
+            items = np.sort(items)
+            # 홀수 개면 하나는 현재 레벨에 남기고 나머지 짝수 개 중 홀/짝 위치 하나만 올림
+            keep = items[:len(items) % 2]
+            paired = items[len(items) % 2:]
+            promoted = paired[self._rng.integers(2)::2]
+            self.levels[height] = keep
+            self.levels[height + 1] = np.concatenate([self.levels[height + 1], promoted])
+
+    @property
+    def variance(self):
+        """표본 분산 (ddof=1)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        """표본 표준편차"""
+        return float(np.sqrt(self.variance))
+
+    def _weighted_items(self):
+        """보관 중인 값과 가중치(2^레벨)를 값 순서로 정렬"""
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=np.float64) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='mergesort')
+        return items[order], weights[order]
+
+    def quantiles(self, qs):
+        """분위수 근사값 목록
+
+        Args:
+            qs (list): 0~1 사이 분위 목록
+
+        Returns:
+            np.ndarray: 분위별 근사값 (0과 1은 정확한 최소/최대값, 값이 없으면 NaN)
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+
+        items, weights = self._weighted_items()
+        cumulative = np.cumsum(weights)
+        positions = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+        result = items[np.minimum(positions, len(items) - 1)]
+        result = np.where(qs <= 0, self.min, result)
+        return np.where(qs >= 1, self.max, result)
+
+    def quantile(self, q):
+        """분위수 근사값 하나"""
+        return float(self.quantiles([q])[0])
+
+    def median(self):
+        """중앙값 근사값"""
+        return self.quantile(0.5)
+
+    def to_dict(self):
+        """직렬화 가능한 사전으로 변환 (부분 결과를 파일로 저장할 때 사용)"""
+        return {
+            'k': self.k,
+            'levels': [level.tolist() for level in self.levels],
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'min': None if np.isnan(self.min) else float(self.min),
+            'max': None if np.isnan(self.max) else float(self.max)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict로 저장한 사전에서 스케치 복원"""
+        sketch = cls(data['k'])
+        sketch.levels = [np.asarray(level, dtype=np.float64) for level in data['levels']] or sketch.levels
+        sketch.count = int(data['count'])
+        sketch.mean = float(data['mean'])
+        sketch.m2 = float(data['m2'])
+        sketch.min = np.nan if data['min'] is None else data['min']
+        sketch.max = np.nan if data['max'] is None else data['max']
+        return sketch
+
+
+class GroupedQuantileSketch:
+    """그룹 값별 KLL 스케치 묶음 클래스"""
+
+    def __init__(self, group_columns, k=DEFAULT_SKETCH_K, seed=None):
+        """그룹별 스케치 생성
+
+        Args:
+            group_columns (list): 그룹 컬럼 목록
+            k (int): 그룹별 스케치 정확도 파라미터
+            seed (int, optional): 난수 시드
+        """
+        self.group_columns = list(group_columns)
+        self.k = k
+        self.sketches = {}
+        self._seed = seed
+
+    def _sketch(self, key):
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            sketch = self.sketches[key] = KLLSketch(self.k, self._seed)
+        return sketch
+
+    def update(self, df, value_column):
+        """데이터프레임(또는 조각)의 값 컬럼을 그룹별로 누적 (그룹 값이 결측인 행은 제외)"""
+        values = df[value_column].to_numpy(dtype=np.float64)
+        keys = [df[col] for col in self.group_columns]
+        for key, rows in pd.Series(values, index=df.index).groupby(keys, sort=False, observed=True).indices.items():
+            self._sketch(key).update(values[rows])
+
+    def merge(self, other):
+        """같은 그룹 컬럼의 다른 그룹별 스케치 병합"""
+        for key, sketch in other.sketches.items():
+            self._sketch(key).merge(sketch)
+        return self
+
+    def covers(self, group_columns):
+        """같은 그룹 컬럼 구성인지 여부"""
+        return list(group_columns) == self.group_columns
+
+    def summary(self, qs=(0.25, 0.5, 0.75)):
+        """그룹별 개수, 평균, 표준편차, 최소값, 분위수, 최대값
+
+        Returns:
+            pd.DataFrame: 그룹 키를 인덱스로 하는 통계 데이터프레임 (분위수 열 이름은 '25%' 형식)
+        """
+        keys = list(self.sketches)
+        try:
+            keys.sort(key=lambda key: key if isinstance(key, tuple) else (key,))
+        except TypeError:
+            # 한 그룹 컬럼에 숫자와 문자열 등 비교할 수 없는 값이 섞이면 타입 이름과 문자열로 정렬
+            keys.sort(key=lambda key: tuple((type(value).__name__, str(value))
+                                            for value in (key if isinstance(key, tuple) else (key,))))
+        rows = []
+        for key in keys:
+            sketch = self.sketches[key]
+            row = {'count': sketch.count, 'mean': sketch.mean if sketch.count else np.nan,
+                   'std': sketch.std, 'min': sketch.min}
+            row.update({f"{q * 100:g}%": value for q, value in zip(qs, sketch.quantiles(qs))})
+            row['max'] = sketch.max
+            rows.append(row)
+
+        if len(self.group_columns) > 1:
+            index = pd.MultiIndex.from_tuples(keys, names=self.group_columns)
+        else:
+            index = pd.Index([key[0] if isinstance(key, tuple) else key for key in keys], name=self.group_columns[0])
+        return pd.DataFrame(rows, index=index)
+
+    def medians(self):
+        """그룹별 중앙값 근사값 Series"""
+        return self.summary(qs=(0.5,))['50%']
+
+
+def iter_result_columns(file_path, columns, chunksize=SKETCH_CHUNK_ROWS):
+    """결과 파일에서 필요한 컬럼만 조각 단위로 읽기 (CSV, Parquet, Excel은 한 번에)"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    elif ext == '.csv':
+        yield from pd.read_csv(file_path, usecols=columns, chunksize=chunksize, encoding='utf-8-sig')
+    elif ext in ['.xlsx', '.xls']:
+        yield pd.read_excel(file_path, usecols=columns)
+    else:
+        raise ValueError(f"지원되지 않는 파일 형식입니다: {ext}")
+
+
+def sketch_result_files(file_paths, value_column='감정_강도', group_columns=None, k=DEFAULT_SKETCH_K,
+                        chunksize=SKETCH_CHUNK_ROWS):
+    """하나 이상의 결과 파일(분할 저장된 부분 결과 포함)을 조각 단위로 읽어 스케치 생성
+
+    Args:
+        file_paths (list): 결과 파일 경로 목록
+        value_column (str): 값 컬럼
+        group_columns (list, optional): 그룹 컬럼 목록
+        k (int): 스케치 정확도 파라미터
+        chunksize (int): 한 번에 읽을 행 수
+
+    Returns:
+        tuple: (전체 KLLSketch, GroupedQuantileSketch 또는 그룹 컬럼이 없으면 None)
+    """
+    group_columns = list(group_columns or [])
+    overall = KLLSketch(k)
+    grouped = GroupedQuantileSketch(group_columns, k) if group_columns else None
+    for file_path in file_paths:
+        for chunk in iter_result_columns(file_path, [value_column] + group_columns, chunksize):
+            overall.update(chunk[value_column].to_numpy(dtype=np.float64))
+            if grouped is not None:
+                grouped.update(chunk, value_column)
+    return overall, grouped
+
+
+def format_sketch_summary(sketch, qs=(0.25, 0.5, 0.75, 0.9, 0.99)):
+    """스케치의 개수, 평균, 표준편차, 최소/최대값과 근사 분위수 텍스트"""
+    if sketch.count == 0:
+        return "값이 없습니다.\n"
+    summary = f"개수: {sketch.count}개\n"
+    summary += f"평균: {sketch.mean:.4f}, 표준편차: {sketch.std:.4f}\n"
+    summary += f"최소값: {sketch.min:.4f}, 최대값: {sketch.max:.4f}\n"
+    summary += "분위수(근사): " + ", ".join(
+        f"{q * 100:g}% {value:.4f}" for q, value in zip(qs, sketch.quantiles(qs))
+    ) + "\n"
+    return summary
+
+
+def result_sketch_path(result_path):
+    """결과 파일의 스케치 파일 경로"""
+    return result_path + SKETCH_FILE_SUFFIX
+
+
+def save_result_sketch(result_path, sketch, value_column='감정_강도'):
+    """결과 파일의 값 컬럼 스케치를 결과 파일 옆에 JSON으로 저장
+
+    Args:
+        result_path (str): 결과 파일 경로
+        sketch (KLLSketch): 결과 파일 전체 행의 값 컬럼 스케치
+        value_column (str): 값 컬럼
+
+    Returns:
+        str: 저장된 스케치 파일 경로 또는 저장하지 못하면 None (결과 파일은 그대로 사용 가능)
+    """
+    sketch_path = result_sketch_path(result_path)
+    try:
+        with open(sketch_path, 'w', encoding='utf-8') as f:
+            json.dump({'value_column': value_column, 'sketch': sketch.to_dict()}, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"스케치 파일을 저장할 수 없습니다: {sketch_path} ({e})")
+        return None
+    return sketch_path
+
+
+def load_result_sketch(result_path, value_column='감정_강도'):
+    """결과 파일 옆에 저장된 스케치 복원
+
+    Returns:
+        KLLSketch: 저장된 스케치 또는 없거나 결과 파일보다 오래되었거나 값 컬럼이 다르면 None
+    """
+    sketch_path = result_sketch_path(result_path)
+    if not os.path.exists(sketch_path) or os.path.getmtime(sketch_path) < os.path.getmtime(result_path):
+        return None
+    try:
+        with open(sketch_path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('value_column') != value_column:
+            return None
+        return KLLSketch.from_dict(data['sketch'])
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"스케치 파일을 읽을 수 없습니다: {sketch_path} ({e})")
+        return None
+
+
+def summarize_result_files(file_paths, value_column='감정_강도', k=DEFAULT_SKETCH_K):
+    """여러 결과 파일의 값 컬럼 스케치를 병합 (원본 컬럼을 메모리에 올리지 않음)
+
+    파일마다 저장된 스케치가 있으면 복원하고, 없으면 파일을 조각 단위로 읽어 만든 뒤
+    다음 요약에서 다시 읽지 않도록 저장합니다.
+
+    Args:
+        file_paths (list): 결과 파일 경로 목록
+        value_column (str): 값 컬럼
+        k (int): 새로 만드는 스케치의 정확도 파라미터
+
+    Returns:
+        KLLSketch: 모든 파일을 합친 스케치
+    """
+    merged = KLLSketch(k)
+    for file_path in file_paths:
+        sketch = load_result_sketch(file_path, value_column)
+        if sketch is None:
+            sketch, _ = sketch_result_files([file_path], value_column, k=k)
+            save_result_sketch(file_path, sketch, value_column)
+        merged.merge(sketch)
+    return merged
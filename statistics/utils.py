@@ -53,6 +53,156 @@ def ensure_output_dir(base_dir=None):
     
     return output_dir
 
+# 정렬 기반 집계 엔진을 사용하는 최대 그룹 수 (초과하면 그룹 구간별 중앙값 정렬이 느려지므로 pandas 내장 집계 사용)
+GROUPED_ENGINE_MAX_GROUPS = 2000
+
+# 그룹별 집계 엔진이 지원하는 통계량
+GROUP_STATISTICS = ('count', 'mean', 'std', 'min', 'max', 'median')
+
+def _group_codes(df, group_columns):
+    """그룹 컬럼 값 조합별 정수 코드 (정렬 순서, 결측값이 있는 행은 -1)
+    
+    Returns:
+        tuple: (행별 그룹 코드 배열, 그룹 키 인덱스)
+    """
+    codes = np.zeros(len(df), dtype=np.int64)
+    levels = []
+    level_codes = []
+    missing = np.zeros(len(df), dtype=bool)
+    for col in group_columns:
+        col_codes, uniques = pd.factorize(df[col], sort=True)
+        missing |= col_codes < 0
+        size = max(len(uniques), 1)
+        
+        # 컬럼마다 실제로 나타난 조합만 남기고 다시 번호 매기기 (코드가 행 수 미만이므로 곱해도 int64 범위 유지)
+        used, codes = np.unique(codes * size + np.maximum(col_codes, 0), return_inverse=True)
+        level_codes = [prev[used // size] for prev in level_codes] + [used % size]
+        levels.append(uniques)
+    
+    # 그룹 값이 결측인 행을 제외하고 0부터 다시 번호 매기기
+    used, codes_valid = np.unique(codes[~missing], return_inverse=True)
+    codes[~missing] = codes_valid
+    codes[missing] = -1
+    
+    # 그룹 코드 -> 컬럼별 값
+    keys = [np.asarray(uniques)[positions[used]] for uniques, positions in zip(levels, level_codes)]
+    
+    if len(group_columns) == 1:
+        index = pd.Index(keys[0], name=group_columns[0])
+    else:
+        index = pd.MultiIndex.from_arrays(keys, names=group_columns)
+    return codes, index
+
+def grouped_aggregate(df, group_columns, value_columns, stats=GROUP_STATISTICS):
+    """정렬 기반 그룹별 집계 (여러 값 컬럼의 통계량을 한 번에 계산)
+    
+    행을 그룹 코드로 한 번 정렬한 뒤 NumPy reduceat으로 모든 값 컬럼의 개수, 합, 최소/최대값을
+    동시에 계산하고, 표준편차는 그룹 평균을 뺀 두 번째 통과로, 중앙값은 그룹 구간별 정렬로 계산합니다.
+    그룹이 GROUPED_ENGINE_MAX_GROUPS개보다 많으면 그룹 코드로 pandas 내장 집계를 사용합니다.
+    결측값은 컬럼별로 제외하고, 그룹 값이 결측인 행은 제외합니다.
+    
+    Args:
+        df (pd.DataFrame): 데이터프레임
+        group_columns (list): 그룹핑 열 이름 목록
+        value_columns (list): 숫자형 값 열 이름 목록
+        stats (tuple): 계산할 통계량 ('count', 'mean', 'std', 'min', 'max', 'median' 중 선택)
+        
+    Returns:
+        pd.DataFrame: 그룹 키를 인덱스, (값 컬럼, 통계량)을 열로 하는 넓은 형식의 통계 데이터프레임
+    """
+    unknown = [stat for stat in stats if stat not in GROUP_STATISTICS]
+    if unknown:
+        raise ValueError(f"지원되지 않는 통계량입니다: {', '.join(unknown)}")
+    
+    codes, index = _group_codes(df, group_columns)
+    if len(index) > GROUPED_ENGINE_MAX_GROUPS:
+        return _pandas_grouped_aggregate(df, codes, index, value_columns, stats)
+    
+    valid = np.flatnonzero(codes >= 0)
+    order = valid[np.argsort(codes[valid], kind='stable')]
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if len(order) else np.empty(0, dtype=np.int64)
+    sizes = np.diff(np.r_[starts, len(order)])
+    
+    # 값 컬럼별로 연속된 (컬럼 수, 행 수) 배열 (그룹 순서로 정렬)
+    values = np.empty((len(value_columns), len(order)), dtype=np.float64)
+    for i, col in enumerate(value_columns):
+        values[i] = df[col].to_numpy(dtype=np.float64)[order]
+    
+    num_groups = len(starts)
+    missing = np.isnan(values)
+    has_missing = bool(missing.any())
+    if num_groups == 0:
+        result = {stat: np.zeros((len(value_columns), 0)) for stat in stats}
+        return _wide_group_frame(result, index, value_columns, stats)
+    
+    # 결측값을 제외한 개수와 합
+    counts = np.broadcast_to(sizes, (len(value_columns), num_groups)).astype(np.int64)
+    filled = values
+    if has_missing:
+        counts = counts - np.add.reduceat(missing, starts, axis=1, dtype=np.int64)
+        filled = np.where(missing, 0.0, values)
+    sums = np.add.reduceat(filled, starts, axis=1)
+    
+    result = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan)
+        
+        if 'count' in stats:
+            result['count'] = counts
+        if 'mean' in stats:
+            result['mean'] = means
+        if 'std' in stats:
+            # 그룹 평균을 뺀 제곱합 (두 번째 통과, 표본 표준편차 ddof=1)
+            deviations = filled - np.repeat(np.nan_to_num(means), sizes, axis=1)
+            if has_missing:
+                deviations[missing] = 0.0
+            squares = np.add.reduceat(deviations * deviations, starts, axis=1)
+            result['std'] = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.nan)
+        if 'min' in stats:
+            minimum = np.minimum.reduceat(np.where(missing, np.inf, values) if has_missing else values, starts, axis=1)
+            result['min'] = np.where(counts > 0, minimum, np.nan)
+        if 'max' in stats:
+            maximum = np.maximum.reduceat(np.where(missing, -np.inf, values) if has_missing else values, starts, axis=1)
+            result['max'] = np.where(counts > 0, maximum, np.nan)
+    
+    if 'median' in stats:
+        result['median'] = _grouped_medians(values, starts, sizes, counts)
+    
+    return _wide_group_frame(result, index, value_columns, stats)
+
+def _grouped_medians(values, starts, sizes, counts):
+    """그룹 순서로 정렬된 (컬럼 수, 행 수) 배열의 그룹별 중앙값 (결측값 제외)"""
+    medians = np.full(counts.shape, np.nan)
+    # 그룹 구간마다 모든 값 컬럼을 한 번에 정렬 (결측값은 뒤로 정렬됨)
+    rows = np.arange(values.shape[0])
+    for group, (start, size) in enumerate(zip(starts, sizes)):
+        block = np.sort(values[:, start:start + size], axis=1)
+        count = counts[:, group]
+        lower = block[rows, np.maximum(count - 1, 0) // 2]
+        upper = block[rows, np.minimum(count // 2, size - 1)]
+        medians[:, group] = np.where(count > 0, (lower + upper) / 2, np.nan)
+    return medians
+
+def _pandas_grouped_aggregate(df, codes, index, value_columns, stats):
+    """그룹이 많을 때 그룹 코드로 pandas 내장 집계 (grouped_aggregate와 같은 형식)"""
+    valid = codes >= 0
+    values = pd.DataFrame({col: df[col].to_numpy(dtype=np.float64)[valid] for col in value_columns})
+    frame = values.groupby(codes[valid], sort=True).agg(list(stats))
+    frame.index = index
+    frame.columns = pd.MultiIndex.from_product([list(value_columns), list(stats)])
+    return frame
+
+def _wide_group_frame(result, index, value_columns, stats):
+    """통계량별 (컬럼 수, 그룹 수) 배열을 (값 컬럼, 통계량) 열의 데이터프레임으로 변환"""
+    columns = pd.MultiIndex.from_product([list(value_columns), list(stats)])
+    frame = pd.DataFrame(
+        {(col, stat): result[stat][i] for i, col in enumerate(value_columns) for stat in stats},
+        index=index,
+        columns=columns
+    )
+    return frame
+
 def get_group_statistics(df, group_columns, value_column, agg_funcs=None):
     """그룹별 통계 계산
     
@@ -60,7 +210,7 @@ def get_group_statistics(df, group_columns, value_column, agg_funcs=None):
         df (pd.DataFrame): 데이터프레임
         group_columns (list): 그룹핑 열 이름 목록
         value_column (str): 값 열 이름
-        agg_funcs (dict, optional): 집계 함수 딕셔너리, None이면 기본값 사용
+        agg_funcs (dict, optional): 결과 열 이름 -> pandas 집계 함수 딕셔너리, None이면 정렬 기반 집계 엔진 사용
         
     Returns:
         pd.DataFrame: 그룹별 통계 데이터프레임
@@ -69,41 +219,29 @@ def get_group_statistics(df, group_columns, value_column, agg_funcs=None):
     if value_column not in df.columns:
         raise ValueError(f"컬럼 '{value_column}'이 데이터프레임에 존재하지 않습니다.")
     
-    # 문자열 데이터 확인
-    data_sample = df[value_column].dropna().head(1)
-    is_numeric = True
-    
-    if len(data_sample) > 0:
-        sample_val = data_sample.iloc[0]
-        is_numeric = isinstance(sample_val, (int, float, np.number))
-        
-        # 값이 문자열인 경우, 숫자로 변환 가능한지 확인
-        if isinstance(sample_val, str):
-            try:
-                float(sample_val)
-                is_numeric = True
-            except ValueError:
-                is_numeric = False
-    
-    # 숫자형 데이터가 아닌 경우 빈도수만 계산
-    if not is_numeric:
-        print(f"경고: '{value_column}' 컬럼은 문자열 데이터를 포함하고 있어 빈도수 통계만 계산합니다.")
-        agg_funcs = {'count': 'count'}
-    else:
-        # 숫자형 데이터인 경우 기본 집계 함수 사용
-        if agg_funcs is None:
-            agg_funcs = {
-                'count': 'count',
-                'mean': 'mean',
-                'std': 'std',
-                'min': 'min',
-                'max': 'max',
-                'median': lambda x: x.median()
-            }
+    # 숫자형 여부 확인 (문자열 컬럼은 결측값을 제외한 모든 값이 숫자로 변환될 때만 숫자형으로 간주)
+    values = df[value_column]
+    is_numeric = pd.api.types.is_numeric_dtype(values)
+    if not is_numeric and (values.dtype == object or pd.api.types.is_string_dtype(values)):
+        converted = pd.to_numeric(values, errors='coerce')
+        if converted.notna().sum() == values.notna().sum() and values.notna().any():
+            values = converted
+            is_numeric = True
     
     try:
-        # 그룹별 통계 계산
-        grouped = df.groupby(group_columns)[value_column].agg(agg_funcs).reset_index()
+        if agg_funcs is not None:
+            # 사용자 지정 집계 (열 이름별 이름 있는 집계)
+            grouped = df.assign(**{value_column: values}).groupby(group_columns)[value_column].agg(**agg_funcs)
+            grouped = grouped.reset_index()
+        elif not is_numeric:
+            # 숫자형 데이터가 아닌 경우 빈도수만 계산
+            print(f"경고: '{value_column}' 컬럼은 문자열 데이터를 포함하고 있어 빈도수 통계만 계산합니다.")
+            grouped = df.groupby(group_columns)[value_column].count().rename('count').reset_index()
+        else:
+            # 그룹별 통계 계산 (정렬 기반 집계 엔진)
+            grouped = grouped_aggregate(df.assign(**{value_column: values}), group_columns, [value_column])
+            grouped.columns = grouped.columns.droplevel(0)
+            grouped = grouped.reset_index()
         
         # NaN 값 처리
         grouped = grouped.fillna(0)
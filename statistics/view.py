@@ -9,6 +9,109 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 import colorsys
 
+# 펼치기 전 자식 노드 자리에 넣는 임시 항목 텍스트
+PLACEHOLDER_TEXT = "..."
+
+
+class LazyMultiIndexTree:
+    """다단계 인덱스 데이터프레임을 트리뷰에 지연 표시하는 클래스
+    
+    인덱스의 레벨 코드를 한 번 훑어 레벨별 그룹 경계를 계산하고(행 순서는 유지하며
+    같은 상위 값의 행이 떨어져 있을 때만 안정 정렬), 처음에는 최상위 노드만 추가한 뒤
+    노드를 펼칠 때 해당 구간의 자식만 추가합니다.
+    """
+    
+    def __init__(self, tree_widget, df):
+        """트리 데이터 준비
+        
+        Args:
+            tree_widget: 트리뷰 위젯
+            df (pd.DataFrame): 다단계 인덱스를 가진 데이터프레임
+        """
+        self.tree = tree_widget
+        
+        # 레벨별 값을 처음 나타난 순서로 번호 매기기 (결측값은 -1, 기존 행 순서 유지)
+        index = df.index
+        self.level_count = index.nlevels
+        self.codes = np.empty((len(df), self.level_count), dtype=np.int64)
+        self.labels = []
+        for level in range(self.level_count):
+            codes, uniques = pd.factorize(index.get_level_values(level))
+            self.codes[:, level] = codes
+            self.labels.append(np.append(np.asarray(uniques, dtype=object).astype(str), ""))
+        
+        # 같은 상위 값을 가진 행이 떨어져 있을 때만 안정 정렬 (합계 행 등 기존 순서 유지, 결측값은 뒤로)
+        if not self._prefixes_contiguous():
+            order = np.lexsort([np.where(self.codes[:, level] < 0, len(self.labels[level]), self.codes[:, level])
+                                for level in reversed(range(self.level_count))])
+            self.codes = self.codes[order]
+            df = df.iloc[order]
+        
+        self.values = df.to_numpy(dtype=object)
+        self.empty_values = [''] * df.shape[1]
+        
+        # 레벨별 그룹 시작 위치 (해당 레벨까지의 인덱스 값이 바뀌는 행)
+        n = len(df)
+        changed = np.zeros(n, dtype=bool)
+        if n:
+            changed[0] = True
+        self.group_starts = []
+        for level in range(self.level_count):
+            changed[1:] |= self.codes[1:, level] != self.codes[:-1, level]
+            self.group_starts.append(np.flatnonzero(changed))
+        self.row_count = n
+        
+        # 펼치지 않은 노드 -> (레벨, 시작 행, 끝 행)
+        self.pending = {}
+    
+    def _prefixes_contiguous(self):
+        """모든 레벨에서 같은 상위 값 조합의 행이 연속되어 있는지 여부"""
+        prefix = np.zeros(len(self.codes), dtype=np.int64)
+        for level in range(self.level_count):
+            size = len(self.labels[level])
+            _, prefix = np.unique(prefix * size + self.codes[:, level] + 1, return_inverse=True)
+            runs = 1 + int(np.count_nonzero(prefix[1:] != prefix[:-1])) if len(prefix) else 0
+            if runs != prefix.max(initial=-1) + 1:
+                return False
+        return True
+    
+    def _label(self, level, row):
+        """행의 레벨 값 표시 문자열 (결측 코드 -1은 빈 문자열)"""
+        return self.labels[level][self.codes[row, level]]
+    
+    def _insert_groups(self, parent, level, start, stop):
+        """구간 [start, stop) 안의 level 그룹 노드 추가"""
+        starts = self.group_starts[level]
+        lo, hi = np.searchsorted(starts, [start, stop])
+        group_starts = starts[lo:hi]
+        group_stops = np.append(group_starts[1:], stop)
+        is_leaf = level == self.level_count - 1
+        
+        for group_start, group_stop in zip(group_starts.tolist(), group_stops.tolist()):
+            text = self._label(level, group_start)
+            if is_leaf:
+                self.tree.insert(parent, 'end', text=text, values=list(self.values[group_start]))
+            else:
+                item_id = self.tree.insert(parent, 'end', text=text, values=self.empty_values)
+                # 펼치기 표시용 임시 자식 항목
+                self.tree.insert(item_id, 'end', text=PLACEHOLDER_TEXT)
+                self.pending[item_id] = (level + 1, group_start, group_stop)
+    
+    def populate(self):
+        """최상위 레벨 노드 추가 및 펼치기 이벤트 연결"""
+        self._insert_groups('', 0, 0, self.row_count)
+        self.tree.bind("<<TreeviewOpen>>", self.on_open)
+    
+    def on_open(self, event=None):
+        """노드를 처음 펼칠 때 자식 노드 추가"""
+        item_id = self.tree.focus()
+        node = self.pending.pop(item_id, None)
+        if node is None:
+            return
+        self.tree.delete(*self.tree.get_children(item_id))
+        self._insert_groups(item_id, *node)
+
+
 class StatisticsView:
     """통계 분석 결과를 표시하는 뷰 클래스"""
     
@@ -401,7 +504,6 @@ class StatisticsView:
         # 컬럼 설정
         if isinstance(df.index, pd.MultiIndex):
             index_names = df.index.names
-            level_count = len(index_names)
             
             # 컬럼 헤더 설정
             columns = list(df.columns)
@@ -412,32 +514,8 @@ class StatisticsView:
                 self.multi_level_tree.heading(col, text=str(col))
                 self.multi_level_tree.column(col, width=80, anchor='center')
             
-            # 첫 번째 레벨
-            prev_items = {}
-            for idx in df.index.unique(level=0):
-                item_id = self.multi_level_tree.insert('', 'end', text=idx, values=[''] * len(columns))
-                prev_items[idx] = item_id
-            
-            # 두 번째 이상의 레벨
-            for level in range(1, level_count):
-                new_items = {}
-                for idx_tuple in df.index.unique():
-                    parent_tuple = idx_tuple[:level]
-                    parent_id = prev_items.get(parent_tuple if level > 1 else parent_tuple[0])
-                    
-                    if parent_id and idx_tuple[level] not in new_items:
-                        if level == level_count - 1:  # 마지막 레벨에서는 값을 추가
-                            values = [df.loc[idx_tuple, col] for col in columns]
-                            item_id = self.multi_level_tree.insert(parent_id, 'end', 
-                                                                text=idx_tuple[level], 
-                                                                values=values)
-                        else:
-                            item_id = self.multi_level_tree.insert(parent_id, 'end', 
-                                                                text=idx_tuple[level], 
-                                                                values=[''] * len(columns))
-                        new_items[idx_tuple[:level+1]] = item_id
-                
-                prev_items = new_items
+            # 레벨 코드 기반 지연 트리 (최상위 노드만 먼저 표시)
+            self._populate_tree_with_multiindex(df, self.multi_level_tree)
         else:
             # 다단계가 아닌 경우 일반적인 방식으로 표시
             columns = list(df.columns)
@@ -779,58 +857,8 @@ class StatisticsView:
             df (pd.DataFrame): 다단계 인덱스를 가진 데이터프레임
             tree_widget: 트리뷰 위젯
         """
-        columns = list(df.columns)
-        index_names = df.index.names
-        level_count = len(index_names)
-        
-        # 부모 항목 딕셔너리 (트리 위젯 ID 저장)
-        parents = {}
-        
-        # 최상위 레벨 처리
-        for level1_value in df.index.unique(level=0):
-            # 최상위 항목 추가
-            item_id = tree_widget.insert('', 'end', text=level1_value, values=[''] * len(columns))
-            parents[(level1_value,)] = item_id
-            
-            # 1레벨만 있는 경우 값 추가
-            if level_count == 1:
-                try:
-                    row = df.loc[level1_value]
-                    if not isinstance(row, pd.DataFrame):  # 시리즈인 경우
-                        values = [row[col] for col in columns]
-                        for i, col in enumerate(columns):
-                            tree_widget.set(item_id, column=col, value=values[i])
-                except:
-                    pass
-        
-        # 2레벨 이상 처리
-        if level_count >= 2:
-            for idx in df.index:
-                # 모든 레벨에 대해
-                for level in range(1, level_count):
-                    # 현재 레벨까지의 튜플
-                    current_path = idx[:level+1]
-                    parent_path = idx[:level]
-                    
-                    # 이미 추가된 항목인지 확인
-                    if current_path not in parents and parent_path in parents:
-                        # 부모 항목 ID 가져오기
-                        parent_id = parents[parent_path]
-                        
-                        # 현재 레벨 항목 추가
-                        current_value = idx[level]
-                        
-                        # 마지막 레벨이면 값 추가
-                        if level == level_count - 1:
-                            try:
-                                row_values = [df.loc[idx][col] for col in columns]
-                                item_id = tree_widget.insert(parent_id, 'end', text=current_value, values=row_values)
-                            except:
-                                item_id = tree_widget.insert(parent_id, 'end', text=current_value, values=[''] * len(columns))
-                        else:
-                            item_id = tree_widget.insert(parent_id, 'end', text=current_value, values=[''] * len(columns))
-                            
-                        parents[current_path] = item_id
+        # 하위 노드는 처음 펼칠 때 추가 (펼치기 이벤트에 연결된 데이터는 다음 갱신 시 교체)
+        LazyMultiIndexTree(tree_widget, df).populate()
                         
     def display_emotion_heatmap(self, heatmap_data):
         """감정 분류 히트맵 표시
@@ -851,8 +879,8 @@ class StatisticsView:
         # 전체 데이터 히트맵
         overall_data = heatmap_data.get('overall', {})
         
-        # 극성별 비율 계산
-        polarity_percentages = heatmap_data.get('polarity_percentages', {})
+        # 극성별 비율 (전체 데이터 기준, 그룹별 비율은 heatmap_data['groups'] 표에 포함)
+        polarity_percentages = overall_data.get('polarity_percentages', {})
         
         # 색상 정의 (긍정-파란색, 중립-회색, 부정-빨간색)
         colors = {
@@ -881,7 +909,7 @@ class StatisticsView:
                    ha='center', va='bottom', fontsize=8)
         
         # 축 설정
-        ax.set_title(f'감정 분포 (총 {sum(values):.0f}건)')
+        ax.set_title(f'감정 분포 (총 {overall_data.get("total_count", 0)}건)')
         ax.set_ylim(0, max(values) * 1.2 if values else 1)  # 여백 추가
         
         # 격자선 제거
@@ -26,7 +26,7 @@ class StatisticsGUI:
         self.current_stats = {}  # 현재 생성된 통계 데이터프레임
         
         # 분석 결과 파일 경로
-        self.analysis_file_path = getattr(data, '_metadata', {}).get('analysis_file_path', None)
+        self.analysis_file_path = data.attrs.get('analysis_file_path')
         
         # UI 설정
         self.setup_ui()
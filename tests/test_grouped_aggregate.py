@@ -0,0 +1,104 @@
+"""
+정렬 기반 그룹별 집계 엔진(grouped_aggregate)과 pandas groupby 집계 결과 비교 테스트
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 표준 라이브러리 statistics 대신 프로젝트의 statistics 패키지를 불러오도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from statistics import utils
+from statistics.utils import GROUP_STATISTICS, grouped_aggregate
+
+
+def make_frame(rows, cardinalities, num_values=3, missing_ratio=0.05, seed=0):
+    """그룹 컬럼(결측값 포함)과 값 컬럼(결측값 포함)이 있는 임의 데이터프레임"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i, cardinality in enumerate(cardinalities):
+        column = rng.integers(0, cardinality, rows).astype(object)
+        column[rng.random(rows) < missing_ratio] = None
+        data[f"그룹{i}"] = column
+    for i in range(num_values):
+        values = rng.normal(size=rows).round(1)
+        values[rng.random(rows) < missing_ratio] = np.nan
+        data[f"값{i}"] = values
+    return pd.DataFrame(data)
+
+
+def expected_aggregate(df, group_columns, value_columns, stats=GROUP_STATISTICS):
+    """pandas groupby로 계산한 기대 결과"""
+    return df.groupby(group_columns, observed=True, sort=True)[value_columns].agg(list(stats))
+
+
+def assert_same_aggregate(result, expected):
+    assert list(result.columns) == list(expected.columns)
+    assert result.index.equals(expected.index)
+    for column in expected.columns:
+        np.testing.assert_allclose(
+            result[column].to_numpy(dtype=np.float64),
+            expected[column].to_numpy(dtype=np.float64),
+            rtol=1e-9, atol=1e-12, equal_nan=True, err_msg=str(column)
+        )
+
+
+@pytest.mark.parametrize("cardinalities", [[7], [5, 3], [4, 6, 3]])
+def test_matches_pandas_groupby(cardinalities):
+    df = make_frame(5000, cardinalities)
+    group_columns = [f"그룹{i}" for i in range(len(cardinalities))]
+    value_columns = ["값0", "값1", "값2"]
+
+    assert_same_aggregate(
+        grouped_aggregate(df, group_columns, value_columns),
+        expected_aggregate(df, group_columns, value_columns)
+    )
+
+
+def test_high_cardinality_matches_pandas_groupby():
+    df = make_frame(20000, [utils.GROUPED_ENGINE_MAX_GROUPS * 3])
+    value_columns = ["값0", "값1", "값2"]
+
+    assert_same_aggregate(
+        grouped_aggregate(df, ["그룹0"], value_columns),
+        expected_aggregate(df, ["그룹0"], value_columns)
+    )
+
+
+def test_selected_statistics_and_string_keys():
+    df = make_frame(3000, [4, 5])
+    df["그룹0"] = df["그룹0"].map(lambda value: None if value is None else f"키{value}")
+    stats = ("median", "count", "max")
+
+    assert_same_aggregate(
+        grouped_aggregate(df, ["그룹0", "그룹1"], ["값0"], stats=stats),
+        expected_aggregate(df, ["그룹0", "그룹1"], ["값0"], stats=stats)
+    )
+
+
+def test_group_codes_do_not_overflow_with_many_columns():
+    # 컬럼별 고유값 수의 곱이 int64 범위를 넘는 그룹 컬럼 조합
+    rows = 2000
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({f"그룹{i}": rng.permutation(rows) for i in range(6)})
+    df["값0"] = rng.normal(size=rows)
+    group_columns = [f"그룹{i}" for i in range(6)]
+
+    assert_same_aggregate(
+        grouped_aggregate(df, group_columns, ["값0"]),
+        expected_aggregate(df, group_columns, ["값0"])
+    )
+
+
+def test_missing_group_values_are_excluded():
+    df = pd.DataFrame({"그룹0": ["a", None, "b", "a"], "값0": [1.0, 100.0, np.nan, 3.0]})
+
+    result = grouped_aggregate(df, ["그룹0"], ["값0"])
+
+    assert list(result.index) == ["a", "b"]
+    assert result.loc["a", ("값0", "median")] == 2.0
+    assert result.loc["b", ("값0", "count")] == 0
+    assert np.isnan(result.loc["b", ("값0", "mean")])
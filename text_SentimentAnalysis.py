@@ -6,9 +6,9 @@ import numpy as np
 import pandas as pd
 from datetime import datetime
 import traceback
-import torch
 
 from configure import LABELS, POLARITY_MAP, ensure_output_dir, log_work
+from batch_inference import run_bucketed_inference
 
 def analyze_text(text, model, source_label="", replace_none=False):
     """
@@ -43,9 +43,11 @@ def analyze_text(text, model, source_label="", replace_none=False):
         if source_label:
             result_text += f"{source_label} 감정 분석 결과:\n\n"
         
-        # 모델 추론 실행
-        with torch.no_grad():
-            output = model(text).cpu().numpy()[0]
+        # 모델 추론 실행 (캐시에 있는 텍스트는 인코더 생략)
+        scores, failed = run_bucketed_inference(model, [text])
+        if failed[0]:
+            raise RuntimeError("모델 추론에 실패했습니다.")
+        output = scores[0]
         
         # 결과를 데이터프레임으로 변환
         data = {'감정': LABELS, '확률/강도': output}
@@ -170,6 +172,7 @@ def save_analysis_result(text, preds, top_emotion, top_score, top_polarity, repl
 
 if __name__ == "__main__":
     # 테스트용 코드
+    import torch
     from KOTE_load import load_model
     
     device = torch.device("cpu")
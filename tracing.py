@@ -0,0 +1,207 @@
+"""
+분석 실행 추적(Chrome trace) 기록 모듈
+
+추적 모드를 켜면 파일 분석 작업 동안 기록되는 단계 구간(instrumentation.span)과
+배치별 모델 순전파 구간을 Chrome trace-event 형식 JSON 파일로 output/추적기록 폴더에
+저장합니다. 저장된 파일은 chrome://tracing 또는 https://ui.perfetto.dev 에서 열어
+느린 파일을 다시 실행하지 않고 오프라인으로 분석할 수 있습니다.
+
+추적 모드 (환경 변수 KOTE_TRACE가 설정 파일의 trace_mode보다 우선):
+    off   - 기록하지 않음 (기본값)
+    spans - 분석 단계 및 배치별 순전파 구간 기록
+    torch - spans에 더해 torch.profiler 연산자 단위 기록 (별도 파일, 실행 속도가 크게 느려짐)
+"""
+import os
+import json
+import time
+import threading
+import functools
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+
+from configure import ensure_output_dir, load_app_settings
+from instrumentation import current_instrumentation
+
+# 추적 모드를 지정하는 환경 변수
+TRACE_ENV_VAR = "KOTE_TRACE"
+
+TRACE_MODES = ("off", "spans", "torch")
+
+# 작업 하나에서 보관할 최대 구간 수 (초과분은 버리고 개수만 기록)
+MAX_TRACE_EVENTS = 500000
+
+# 추적 파일 저장 폴더 (output 하위)
+TRACE_DIR_NAME = "추적기록"
+
+
+def trace_mode():
+    """현재 추적 모드 ('off', 'spans', 'torch')
+
+    환경 변수 KOTE_TRACE(1/true/on은 spans로 간주)가 설정 파일의 trace_mode보다 우선합니다.
+    """
+    value = os.environ.get(TRACE_ENV_VAR)
+    if value is None:
+        value = load_app_settings().get('trace_mode', 'off')
+
+    value = str(value).strip().lower()
+    if value in ("1", "true", "on", "yes"):
+        return "spans"
+    return value if value in TRACE_MODES else "off"
+
+
+class TraceRecorder:
+    """단계 구간을 Chrome trace-event 형식으로 모으는 클래스 (측정 수집기 리스너로 등록)"""
+
+    def __init__(self, job_name, max_events=MAX_TRACE_EVENTS):
+        self.job_name = job_name
+        self.max_events = max_events
+        self.dropped = 0
+        self._origin = time.perf_counter()
+        self._events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, name, start, seconds, items=None):
+        """구간 하나 기록 (Instrumentation 리스너 호출 형식)"""
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": "pipeline",
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round(seconds * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": thread.ident
+        }
+        if items is not None:
+            event["args"] = {"items": items}
+
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            if len(self._events) < self.max_events:
+                self._events.append(event)
+            else:
+                self.dropped += 1
+
+    def trace_events(self):
+        """프로세스/스레드 이름 메타데이터를 포함한 전체 이벤트 목록"""
+        pid = os.getpid()
+        with self._lock:
+            events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"감정분석 ({self.job_name})"}}]
+            events += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                       for tid, name in self._threads.items()]
+            events += self._events
+        return events
+
+    def save(self, file_path, job_info=None):
+        """Chrome trace-event JSON 파일로 저장
+
+        Args:
+            file_path (str): 저장 경로
+            job_info (dict, optional): 함께 기록할 작업 정보
+
+        Returns:
+            str: 저장된 파일 경로
+        """
+        payload = {
+            "traceEvents": self.trace_events(),
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "작업": self.job_name,
+                "기록시각": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                "누락구간수": self.dropped,
+                **(job_info or {})
+            }
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, default=str)
+        return file_path
+
+
+def trace_file_path(job_name, suffix="trace"):
+    """추적 파일 경로 (output/추적기록/<작업>_<suffix>_<타임스탬프>.json)"""
+    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    return os.path.join(ensure_output_dir(), TRACE_DIR_NAME, f"{job_name}_{suffix}_{timestamp}.json")
+
+
+def _start_torch_profiler():
+    """torch.profiler 시작 (torch가 없거나 시작에 실패하면 None)"""
+    try:
+        import torch
+        from torch.profiler import profile, ProfilerActivity
+
+        activities = [ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(ProfilerActivity.CUDA)
+        profiler = profile(activities=activities, record_shapes=True)
+        profiler.__enter__()
+        return profiler
+    except Exception as e:
+        print(f"torch.profiler를 시작할 수 없어 단계 구간만 기록합니다: {e}")
+        return None
+
+
+def _stop_torch_profiler(profiler, job_name):
+    """torch.profiler 종료 후 연산자 단위 추적 파일 저장 및 상위 연산자 출력"""
+    try:
+        profiler.__exit__(None, None, None)
+        torch_path = trace_file_path(job_name, "torch_trace")
+        os.makedirs(os.path.dirname(torch_path), exist_ok=True)
+        profiler.export_chrome_trace(torch_path)
+        print(profiler.key_averages().table(sort_by="self_cpu_time_total", row_limit=15))
+        print(f"연산자 단위 추적 기록이 저장되었습니다: {torch_path}")
+    except Exception as e:
+        print(f"torch.profiler 기록 저장 중 오류 발생: {e}")
+        print(traceback.format_exc())
+
+
+@contextmanager
+def trace_job(job_name, job_info=None, mode=None):
+    """with 블록 동안 추적 모드에 따라 구간을 기록하고 종료 시 output/추적기록 폴더에 저장
+
+    Args:
+        job_name (str): 작업 이름 (파일명 및 최상위 구간 이름)
+        job_info (dict, optional): 함께 기록할 작업 정보
+        mode (str, optional): 추적 모드, None이면 환경 변수/설정 파일 값 사용
+
+    Yields:
+        TraceRecorder: 추적 기록기 또는 추적 모드가 꺼져 있으면 None
+    """
+    mode = mode or trace_mode()
+    if mode == "off":
+        yield None
+        return
+
+    recorder = TraceRecorder(job_name)
+    profiler = _start_torch_profiler() if mode == "torch" else None
+    # 현재 작업의 측정 수집기 구간만 기록 (작업 범위 밖의 구간은 제외)
+    instrumentation = current_instrumentation()
+    instrumentation.add_listener(recorder)
+    start = time.perf_counter()
+    try:
+        yield recorder
+    finally:
+        instrumentation.remove_listener(recorder)
+        recorder(job_name, start, time.perf_counter() - start)
+        if profiler is not None:
+            _stop_torch_profiler(profiler, job_name)
+
+        try:
+            trace_path = recorder.save(trace_file_path(job_name), job_info)
+            print(f"추적 기록이 저장되었습니다: {trace_path}")
+        except Exception as e:
+            print(f"추적 기록 저장 중 오류 발생: {e}")
+            print(traceback.format_exc())
+
+
+def traced(job_name):
+    """함수 실행 전체를 trace_job으로 감싸는 데코레이터 (추적 모드가 꺼져 있으면 그대로 실행)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_job(job_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator